@@ -6,9 +6,17 @@ import asyncio
 import signal
 import sys
 import atexit
-import time
 from datetime import datetime
 
+from core.archive import close_archive
+from core.dedup import RecentKeys
+from core.dispatch import get_dispatcher
+from core.fileio import close_fileio, get_fileio
+from core.logsink import close_logsink
+from core.prefixes import PrefixResolver
+from core.stats import get_stats
+from core.storage import close_storage
+
 # keep_alive n'est plus nécessaire car Gunicorn démarre dans le Procfile
 
 # Charger le token
@@ -54,51 +62,49 @@ atexit.register(release_lock)
 # Intents
 intents = discord.Intents.all()
 
+# Préfixes par serveur (prefixes.json chargé une fois au démarrage)
+prefixes = PrefixResolver(default="+")
+
 # Bot sans help par défaut
-bot = commands.Bot(command_prefix="+", intents=intents, help_command=None)
+bot = commands.Bot(command_prefix=prefixes, intents=intents, help_command=None)
+bot.prefixes = prefixes
 
 # Variables de contrôle
 bot._ready_fired = False
-bot._processed_commands = {}  # Track des commandes traitées
+bot._processed_commands = RecentKeys(ttl=10)  # Track des commandes traitées
 
-# Protection ULTIME anti-double
+# Point d'entrée unique : chaque message est classé une fois puis distribué aux flux
 @bot.event
 async def on_message(message):
-    # Ignorer les bots
-    if message.author.bot:
-        return
-    
-    # Ne traiter QUE les messages avec préfixe
-    if not message.content.startswith(bot.command_prefix):
-        return
-    
+    await get_dispatcher(bot).dispatch(message)
+
+# Protection ULTIME anti-double (flux "command" : humain, préfixe, non blacklisté)
+async def handle_command(message):
     # Créer une clé unique (message + auteur)
-    msg_key = f"{message.id}_{message.author.id}"
-    current_time = time.time()
-    
-    # Nettoyer les anciennes entrées (> 10 secondes)
-    bot._processed_commands = {
-        k: v for k, v in bot._processed_commands.items()
-        if current_time - v < 10
-    }
-    
-    # Vérifier si déjà traité
-    if msg_key in bot._processed_commands:
-        elapsed = current_time - bot._processed_commands[msg_key]
+    msg_key = (message.id, message.author.id)
+    
+    # Vérifier si déjà traité (sinon marqué comme traité AVANT de process)
+    elapsed = bot._processed_commands.check(msg_key)
+    if elapsed is not None:
         print(f"🚫 COMMANDE BLOQUÉE (déjà traitée il y a {elapsed:.2f}s) - ID: {message.id}")
         return
     
-    # Marquer comme traité AVANT de process
-    bot._processed_commands[msg_key] = current_time
-    
     print(f"✅ Commande traitée (ID: {message.id}) - {message.content[:50]}")
     
     # Traiter UNE SEULE fois
     await bot.process_commands(message)
 
+# Les commandes passent après les autres abonnés (cache des messages...) : une commande
+# longue (confirmation, purge) ne doit pas retarder leur traitement
+get_dispatcher(bot).subscribe("command", handle_command, name="commands", last=True)
+
 # Event ready
 @bot.event
 async def on_ready():
+    # Les totaux repartent des serveurs reçus à chaque connexion
+    stats = get_stats(bot)
+    stats.rebuild()
+    
     if bot._ready_fired:
         print("⚠️ on_ready déjà exécuté, ignoré")
         return
@@ -111,7 +117,7 @@ async def on_ready():
     print("=" * 50)
     print(f"✅ Bot connecté : {bot.user} (ID: {bot.user.id})")
     print(f"📊 Serveurs : {len(bot.guilds)}")
-    print(f"👥 Utilisateurs : {sum(g.member_count for g in bot.guilds)}")
+    print(f"👥 Utilisateurs : {stats.members}")
     print(f"🔗 Latence : {round(bot.latency * 1000)}ms")
     print(f"🆔 Process ID : {os.getpid()}")
     print(f"🌐 Environnement : {'Render' if os.getenv('RENDER') else 'Local'}")
@@ -119,9 +125,8 @@ async def on_ready():
     
     # Avatar (optionnel)
     try:
-        if os.path.exists("avatar.png"):
-            with open("avatar.png", "rb") as f:
-                avatar = f.read()
+        avatar = await get_fileio(bot).read_bytes("avatar.png")
+        if avatar:
             await bot.user.edit(avatar=avatar)
             print("🖼️ Avatar mis à jour")
     except Exception as e:
@@ -154,6 +159,8 @@ COGS = [
     "cogs.gestion",
     "cogs.error",
     "cogs.permsystem",
+    "cogs.lookup",
+    "cogs.stats",
     "cogs.logger",
     "cogs.tickets",
     "cogs.status",
@@ -206,18 +213,27 @@ signal.signal(signal.SIGINT, handle_exit)
 
 # Démarrage
 async def start_bot():
-    async with bot:
-        await load_cogs()
-        try:
-            await bot.start(TOKEN)
-        except discord.LoginFailure:
-            print("❌ Token invalide !")
-            release_lock()
-            sys.exit(1)
-        except Exception as e:
-            print(f"❌ Erreur démarrage : {e}")
-            release_lock()
-            sys.exit(1)
+    try:
+        async with bot:
+            custom = await bot.prefixes.load(get_fileio(bot))
+            print(f"🔤 {custom} préfixe(s) personnalisé(s) chargé(s)")
+            await load_cogs()
+            try:
+                await bot.start(TOKEN)
+            except discord.LoginFailure:
+                print("❌ Token invalide !")
+                release_lock()
+                sys.exit(1)
+            except Exception as e:
+                print(f"❌ Erreur démarrage : {e}")
+                release_lock()
+                sys.exit(1)
+    finally:
+        # Les cogs sont déchargés (et leurs données écrites) avant la fermeture de la base
+        await close_logsink(bot)
+        await close_archive(bot)
+        await close_storage(bot)
+        await close_fileio(bot)
 
 # Point d'entrée
 if __name__ == "__main__":
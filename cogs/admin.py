@@ -6,6 +6,9 @@ import asyncio
 import time
 from datetime import datetime
 
+from core.banindex import get_ban_index
+from core.stats import get_stats
+
 class Admin(commands.Cog):
     """Commandes d'administration réservées au propriétaire du bot"""
     
@@ -49,6 +52,7 @@ class Admin(commands.Cog):
         Exemple: +load admin"""
         try:
             await self.bot.load_extension(f"cogs.{cog.lower()}")
+            get_stats(self.bot).invalidate_commands()
             embed = discord.Embed(
                 title="✅ Cog chargé",
                 description=f"Le module `{cog}` a été chargé avec succès.",
@@ -70,6 +74,7 @@ class Admin(commands.Cog):
         Exemple: +unload admin"""
         try:
             await self.bot.unload_extension(f"cogs.{cog.lower()}")
+            get_stats(self.bot).invalidate_commands()
             embed = discord.Embed(
                 title="✅ Cog déchargé",
                 description=f"Le module `{cog}` a été déchargé avec succès.",
@@ -91,6 +96,7 @@ class Admin(commands.Cog):
         Exemple: +reload admin"""
         try:
             await self.bot.reload_extension(f"cogs.{cog.lower()}")
+            get_stats(self.bot).invalidate_commands()
             embed = discord.Embed(
                 title="✅ Cog rechargé",
                 description=f"Le module `{cog}` a été rechargé avec succès.",
@@ -120,6 +126,7 @@ class Admin(commands.Cog):
                 reloaded.append(extension.split('.')[-1])
             except Exception as e:
                 failed.append(f"{extension.split('.')[-1]}: {str(e)[:50]}")
+        get_stats(self.bot).invalidate_commands()
         
         embed = discord.Embed(
             title="🔄 Rechargement des cogs",
@@ -166,7 +173,7 @@ class Admin(commands.Cog):
         """Liste tous les serveurs où le bot est présent"""
         guilds = []
         
-        for guild in sorted(self.bot.guilds, key=lambda g: g.member_count, reverse=True):
+        for guild in get_stats(self.bot).top_guilds(10):
             owner_name = str(guild.owner) if guild.owner else "Inconnu"
             guilds.append(
                 f"**{guild.name}** (`{guild.id}`)\n"
@@ -174,8 +181,7 @@ class Admin(commands.Cog):
             )
         
         # Pagination si trop de serveurs
-        if len(guilds) > 10:
-            guilds = guilds[:10]
+        if len(self.bot.guilds) > 10:
             guilds.append(f"\n*... et {len(self.bot.guilds) - 10} autres serveurs*")
         
         embed = discord.Embed(
@@ -387,8 +393,7 @@ class Admin(commands.Cog):
         uptime_str = f"<t:{int(self.start_time)}:R>"
         
         # Statistiques Discord
-        total_members = sum(g.member_count for g in self.bot.guilds)
-        total_channels = sum(len(g.channels) for g in self.bot.guilds)
+        totals = get_stats(self.bot).totals()
         
         embed = discord.Embed(
             title="📊 Statistiques du bot",
@@ -398,7 +403,7 @@ class Admin(commands.Cog):
         
         embed.add_field(
             name="🤖 Discord",
-            value=f"```yaml\nServeurs: {len(self.bot.guilds)}\nUtilisateurs: {total_members}\nSalons: {total_channels}\nCommandes: {len(list(self.bot.walk_commands()))}```",
+            value=f"```yaml\nServeurs: {totals['guilds']}\nUtilisateurs: {totals['members']}\nSalons: {totals['channels']}\nCommandes: {totals['commands']}```",
             inline=True
         )
         
@@ -421,6 +426,15 @@ class Admin(commands.Cog):
                 inline=True
             )
         
+        dedup = getattr(self.bot, "_processed_commands", None)
+        if dedup is not None:
+            dedup_stats = dedup.stats()
+            embed.add_field(
+                name="🚫 Anti-doublon",
+                value=f"```yaml\nBloquées: {dedup_stats['blocked']}\nSuivies: {dedup_stats['tracked']}\nÉvincées: {dedup_stats['evicted']}```",
+                inline=True
+            )
+        
         embed.add_field(
             name="⏱️ Uptime",
             value=f"Démarré {uptime_str}",
@@ -468,6 +482,128 @@ class Admin(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @commands.command(name="iostats")
+    @commands.is_owner()
+    async def iostats(self, ctx):
+        """Affiche l'état du pool d'I/O fichiers"""
+        fileio = getattr(self.bot, "fileio", None)
+        if fileio is None:
+            return await ctx.send("❌ Aucun accès fichier n'a encore été effectué.")
+        
+        stats = fileio.stats()
+        embed = discord.Embed(
+            title="💾 I/O Fichiers",
+            color=discord.Color.blue(),
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(
+            name="📥 File d'attente",
+            value=f"```yaml\nEn attente: {stats['queue_depth']}\np99 écriture: {stats['p99_write_ms']:.1f}ms```",
+            inline=True
+        )
+        embed.add_field(
+            name="📝 Opérations",
+            value=(
+                f"```yaml\nÉcritures: {stats['writes']}\nFusionnées: {stats['coalesced']}\n"
+                f"Ajouts: {stats['appends']}\nLectures: {stats['reads']}```"
+            ),
+            inline=True
+        )
+        
+        logqueue = getattr(self.bot, "logqueue", None)
+        if logqueue is not None:
+            logs = logqueue.stats()
+            embed.add_field(
+                name="📨 Envoi des logs",
+                value=(
+                    f"```yaml\nEn attente: {logs['pending']}\nMessages: {logs['messages']}\n"
+                    f"Embeds: {logs['embeds']}\nDébordement: {logs['overflow']}\nPerdus: {logs['dropped']}```"
+                ),
+                inline=True
+            )
+        
+        logsink = getattr(self.bot, "logsink", None)
+        if logsink is not None:
+            sink = logsink.stats()
+            embed.add_field(
+                name="🪝 Webhooks de logs",
+                value=(
+                    f"```yaml\nActivés: {'oui' if sink['enabled'] else 'non'}\nWebhooks: {sink['webhooks']} "
+                    f"({sink['created']} créés)\nVia webhook: {sink['webhook_sends']}\nVia salon: {sink['channel_sends']}```"
+                ),
+                inline=True
+            )
+        
+        auditlog = getattr(self.bot, "auditlog", None)
+        if auditlog is not None:
+            audit = auditlog.stats()
+            embed.add_field(
+                name="📜 Journal d'audit",
+                value=(
+                    f"```yaml\nRecherches: {audit['lookups']}\nRequêtes: {audit['fetches']}\n"
+                    f"Trouvées: {audit['matched']}\nErreurs: {audit['errors']}```"
+                ),
+                inline=True
+            )
+        
+        logger = self.bot.get_cog("Logger")
+        if logger is not None:
+            cache = logger.messages.stats()
+            embed.add_field(
+                name="🗂️ Cache des messages",
+                value=(
+                    f"```yaml\nMessages: {cache['messages']} ({cache['channels']} salons)\n"
+                    f"Mémoire: {cache['size'] // 1024}/{cache['budget'] // 1024} Ko\n"
+                    f"Trouvés: {cache['hits']}\nManqués: {cache['misses']}\nÉvincés: {cache['evicted']}```"
+                ),
+                inline=True
+            )
+        
+        bans = get_ban_index(self.bot).stats()
+        embed.add_field(
+            name="🔨 Index des bans",
+            value=(
+                f"```yaml\nServeurs: {bans['guilds']}\nBans: {bans['bans']}\n"
+                f"Chargements: {bans['builds']}\nÉvénements: {bans['events']}```"
+            ),
+            inline=True
+        )
+        await ctx.send(embed=embed)
+
+    @commands.command(name="dispatchstats")
+    @commands.is_owner()
+    async def dispatchstats(self, ctx):
+        """Affiche la répartition des messages et le temps passé par abonné"""
+        dispatcher = getattr(self.bot, "dispatcher", None)
+        if dispatcher is None:
+            return await ctx.send("❌ Aucun message n'a encore été distribué.")
+        
+        stats = dispatcher.stats()
+        counts = stats["counts"]
+        embed = discord.Embed(
+            title="📨 Distribution des messages",
+            color=discord.Color.blue(),
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(
+            name="📊 Flux",
+            value="```yaml\n" + "\n".join(f"{name}: {count}" for name, count in counts.items()) + "```",
+            inline=False
+        )
+        
+        # Abonnés triés par temps total (le plus coûteux en premier)
+        subscribers = sorted(stats["subscribers"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for name, sub in subscribers[:10]:
+            embed.add_field(
+                name=f"⏱️ {name}",
+                value=(
+                    f"```yaml\nAppels: {sub['calls']}\nTotal: {sub['total_ms']:.1f}ms\n"
+                    f"Moyenne: {sub['avg_ms']:.2f}ms\np99: {sub['p99_ms']:.2f}ms\nErreurs: {sub['errors']}```"
+                ),
+                inline=True
+            )
+        await ctx.send(embed=embed)
+
     # ======================
     # COMMANDES SYSTÈME
     # ======================
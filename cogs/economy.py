@@ -1,41 +1,59 @@
 # cogs/economy.py
 import discord
 from discord.ext import commands
-import json
 import os
 from datetime import datetime, timedelta
 
-DATA_FILE = "economy.json"
-SHOP_FILE = "shop.json"
+from core.dispatch import get_dispatcher
+from core.fileio import get_fileio
+from core.persistence import WriteBehindStore
+from core.storage import get_storage
 
-def load_json(file):
-    if not os.path.exists(file):
-        with open(file, "w") as f:
-            json.dump({}, f)
-    with open(file, "r") as f:
-        return json.load(f)
+SHOP_FILE = "shop.json"
 
-def save_json(file, data):
-    with open(file, "w") as f:
-        json.dump(data, f, indent=4)
+# Écriture différée : intervalle (secondes) et nombre max d'enregistrements modifiés avant flush
+FLUSH_INTERVAL = float(os.getenv("ECONOMY_FLUSH_INTERVAL", "30"))
+FLUSH_HIGH_WATER = int(os.getenv("ECONOMY_FLUSH_HIGH_WATER", "500"))
 
 class Economy(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data = load_json(DATA_FILE)
-        self.shop = load_json(SHOP_FILE)
-
-    # --- Gestion XP et coins automatiques ---
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot:
-            return
+        self.storage = None
+        self.fileio = None
+        self.data = {}
+        self.shop = {}
+        self.store = WriteBehindStore(
+            self.data,
+            self.flush_accounts,
+            interval=FLUSH_INTERVAL,
+            high_water=FLUSH_HIGH_WATER,
+            name="economy"
+        )
+
+    async def cog_load(self):
+        self.storage = await get_storage(self.bot)
+        self.fileio = get_fileio(self.bot)
+        self.data.update(await self.storage.load_accounts())
+        self.shop = await self.fileio.read_json(SHOP_FILE, {})
+        self.store.start()
+        get_dispatcher(self.bot).subscribe("chat", self.on_chat_message, name="economy")
+
+    async def cog_unload(self):
+        get_dispatcher(self.bot).unsubscribe("economy")
+        await self.store.close()
+
+    async def flush_accounts(self, batch, data):
+        """N'écrit que les comptes modifiés depuis le dernier flush"""
+        await self.storage.upsert_accounts(batch)
+
+    # --- Gestion XP et coins automatiques (flux "chat" : humains, serveurs, hors commandes) ---
+    async def on_chat_message(self, message):
         user = str(message.author.id)
         if user not in self.data:
             self.data[user] = {"xp": 0, "coins": 0, "last_daily": None}
         self.data[user]["xp"] += 1
         self.data[user]["coins"] += 1
-        save_json(DATA_FILE, self.data)
+        self.store.mark_dirty(user)
 
     # --- Profil utilisateur ---
     @commands.command()
@@ -70,7 +88,7 @@ class Economy(commands.Cog):
         reward = 100
         self.data[user]["coins"] += reward
         self.data[user]["last_daily"] = now.isoformat()
-        save_json(DATA_FILE, self.data)
+        self.store.mark_dirty(user)
         await ctx.send(f"✅ {ctx.author.mention}, vous avez reçu **{reward} coins** !")
 
     # --- Transfert de coins ---
@@ -89,7 +107,8 @@ class Economy(commands.Cog):
 
         self.data[sender]["coins"] -= amount
         self.data[receiver]["coins"] += amount
-        save_json(DATA_FILE, self.data)
+        self.store.mark_dirty(sender)
+        self.store.mark_dirty(receiver)
         await ctx.send(f"💸 {ctx.author.mention} a donné {amount} coins à {member.mention} !")
 
     # --- Leaderboard ---
@@ -111,7 +130,7 @@ class Economy(commands.Cog):
         if user not in self.data:
             self.data[user] = {"xp": 0, "coins": 0, "last_daily": None}
         self.data[user]["coins"] += amount
-        save_json(DATA_FILE, self.data)
+        self.store.mark_dirty(user)
         await ctx.send(f"✅ {amount} coins ajoutés à {member.mention}.")
 
     @commands.command()
@@ -121,7 +140,7 @@ class Economy(commands.Cog):
         if user not in self.data:
             self.data[user] = {"xp": 0, "coins": 0, "last_daily": None}
         self.data[user]["coins"] = max(self.data[user]["coins"] - amount, 0)
-        save_json(DATA_FILE, self.data)
+        self.store.mark_dirty(user)
         await ctx.send(f"✅ {amount} coins retirés de {member.mention}.")
 
     # --- Boutique ---
@@ -147,7 +166,7 @@ class Economy(commands.Cog):
             return
         self.data[user]["coins"] -= price
         # Tu peux ajouter ici un inventaire si tu veux
-        save_json(DATA_FILE, self.data)
+        self.store.mark_dirty(user)
         await ctx.send(f"✅ {ctx.author.mention} a acheté **{item}** pour {price} coins !")
 
     # --- Admin ajouter item boutique ---
@@ -155,8 +174,33 @@ class Economy(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def addshop(self, ctx, item, price: int):
         self.shop[item] = price
-        save_json(SHOP_FILE, self.shop)
+        await self.fileio.write_json(SHOP_FILE, self.shop)
         await ctx.send(f"✅ L'item **{item}** a été ajouté à la boutique pour {price} coins.")
 
+    # --- Statistiques de persistance ---
+    @commands.command(name="ecostats")
+    @commands.is_owner()
+    async def ecostats(self, ctx):
+        """Affiche les métriques d'écriture de l'économie"""
+        stats = self.store.stats()
+        embed = discord.Embed(title="💾 Persistance Économie", color=discord.Color.blue())
+        embed.add_field(
+            name="📝 Flushs",
+            value=f"```yaml\nTotal: {stats['flushes']}\nÉchecs: {stats['failed']}\nEn attente: {stats['dirty']}```",
+            inline=True
+        )
+        embed.add_field(
+            name="⏱️ Latence",
+            value=f"```yaml\nDernier: {stats['last_ms']:.1f}ms\np99: {stats['p99_ms']:.1f}ms```",
+            inline=True
+        )
+        embed.add_field(
+            name="📦 Lots",
+            value=f"```yaml\nDernier: {stats['last_batch']}\nMoyen: {stats['avg_batch']:.1f}\nMax: {stats['max_batch']}```",
+            inline=True
+        )
+        embed.set_footer(text=f"Intervalle: {self.store.interval:g}s • Seuil: {self.store.high_water}")
+        await ctx.send(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(Economy(bot))
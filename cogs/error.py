@@ -1,6 +1,8 @@
 import discord
 from discord.ext import commands
 
+from core.errors import InsufficientLevel, PermissionsUnavailable
+
 class ErrorHandler(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -11,6 +13,22 @@ class ErrorHandler(commands.Cog):
         if isinstance(error, commands.CommandNotFound):
             return
 
+        # Niveau du bot insuffisant (check global de PermissionsSystem)
+        elif isinstance(error, InsufficientLevel):
+            embed = discord.Embed(
+                title="❌ Permission refusée",
+                description=f"Cette commande nécessite le niveau **{error.required_name}** minimum.",
+                color=discord.Color.red()
+            )
+            embed.add_field(
+                name="Votre niveau actuel",
+                value=f"**{error.level_name}**"
+            )
+            await ctx.send(embed=embed, delete_after=10)
+        
+        elif isinstance(error, PermissionsUnavailable):
+            await ctx.send(f"❌ {error}")
+        
         # Permissions manquantes
         elif isinstance(error, commands.MissingPermissions):
             await ctx.send("❌ Tu n'as pas la permission d'utiliser cette commande.")
@@ -1,55 +1,57 @@
 import discord
 from discord.ext import commands
 from datetime import datetime
+import re
+import time
+
+from core.errors import PermissionsUnavailable
+from core.jobs import MemberJob, get_member_jobs, plan_role_job
+from core.purge import MAX_SCAN, PurgeJob, build_check, run_with_status
+
+class PruneFlags(commands.FlagConverter):
+    limit: int = 100
+    user: str = None
+    bots: bool = False
+    embeds: bool = False
+    match: str = None
+    before: discord.Object = None
+    after: discord.Object = None
 
 class Gestion(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
     
+    async def cog_load(self):
+        jobs = get_member_jobs(self.bot)
+        jobs.render = self.build_job_embed
+        await jobs.resume()
+    
+    async def cog_unload(self):
+        # Les actions en masse en cours reprendront au prochain chargement
+        await get_member_jobs(self.bot).stop()
+    
     def get_perms_cog(self):
         """Récupère le cog de permissions"""
         return self.bot.get_cog("PermissionsSystem")
     
+    async def cog_check(self, ctx):
+        """Le niveau (ctx.user_level) est calculé par le check global de PermissionsSystem"""
+        if self.get_perms_cog() is None:
+            raise PermissionsUnavailable()
+        return True
+    
     async def find_member(self, ctx, user_input: str):
-        """Trouve un membre par mention, ID, pseudo ou nom"""
-        # Par mention
-        if user_input.startswith('<@') and user_input.endswith('>'):
-            user_id = user_input.strip('<@!>')
-            try:
-                return await ctx.guild.fetch_member(int(user_id))
-            except:
-                return None
-        
-        # Par ID
-        if user_input.isdigit():
-            try:
-                return await ctx.guild.fetch_member(int(user_input))
-            except:
-                return None
-        
-        # Par pseudo ou nom
-        user_input_lower = user_input.lower()
-        for member in ctx.guild.members:
-            if (member.name.lower() == user_input_lower or 
-                member.display_name.lower() == user_input_lower or
-                user_input_lower in member.name.lower() or
-                user_input_lower in member.display_name.lower()):
-                return member
-        
-        return None
+        """Trouve un membre par mention, ID, pseudo ou nom (index de MemberLookup)"""
+        lookup = self.bot.get_cog("MemberLookup")
+        if lookup:
+            return await lookup.resolve(ctx.guild, user_input)
+        return ctx.guild.get_member_named(user_input)
     
     # ==================== GESTION DES SALONS (GS - Niveau 3) ====================
     
     @commands.command(name="createchannel", aliases=["createchan"])
     async def create_channel(self, ctx, channel_type: str, *, name: str):
         """Crée un salon (text/voice) - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         channel_type = channel_type.lower()
         
         try:
@@ -86,13 +88,6 @@ class Gestion(commands.Cog):
     @commands.command(name="deletechannel", aliases=["delchan"])
     async def delete_channel(self, ctx, channel: discord.TextChannel = None):
         """Supprime un salon - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         channel = channel or ctx.channel
         
         try:
@@ -115,13 +110,6 @@ class Gestion(commands.Cog):
     @commands.command(name="renamechannel", aliases=["renamechan"])
     async def rename_channel(self, ctx, channel: discord.TextChannel = None, *, new_name: str = None):
         """Renomme un salon - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         if not new_name:
             return await ctx.send("❌ Vous devez spécifier un nouveau nom.")
         
@@ -148,13 +136,6 @@ class Gestion(commands.Cog):
     @commands.command(name="createrole")
     async def create_role(self, ctx, *, name: str):
         """Crée un rôle - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         try:
             role = await ctx.guild.create_role(
                 name=name,
@@ -176,13 +157,6 @@ class Gestion(commands.Cog):
     @commands.command(name="deleterole")
     async def delete_role(self, ctx, role: discord.Role):
         """Supprime un rôle - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         if role >= ctx.guild.me.top_role:
             return await ctx.send("❌ Ce rôle est trop haut dans la hiérarchie.")
         
@@ -207,13 +181,6 @@ class Gestion(commands.Cog):
         """Modifie un rôle (name/color) - Nécessite niveau GS (3)
         Exemple: !editrole @Role name Nouveau Nom
                  !editrole @Role color #FF5733"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         if role >= ctx.guild.me.top_role:
             return await ctx.send("❌ Ce rôle est trop haut dans la hiérarchie.")
         
@@ -250,79 +217,87 @@ class Gestion(commands.Cog):
     # ==================== GESTION MASS ACTIONS (GS - Niveau 3) ====================
     
     @commands.command(name="massrole")
-    async def mass_role(self, ctx, action: str, role: discord.Role, *, target: str = None):
+    async def mass_role(self, ctx, action: str, role: discord.Role = None, *, target: str = None):
         """Ajoute/retire un rôle en masse - Nécessite niveau GS (3)
         Exemples: !massrole add @Role all
                   !massrole remove @Role bots
-                  !massrole add @Role humans"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
+                  !massrole add @Role humans
+                  !massrole cancel"""
+        jobs = get_member_jobs(self.bot)
+        action = action.lower()
         
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
+        if action in ["cancel", "stop", "annuler"]:
+            job = jobs.cancel(ctx.guild.id)
+            if job is None:
+                return await ctx.send("❌ Aucune action en masse en cours.")
+            return await ctx.send("🛑 Annulation demandée, les requêtes en cours se terminent...")
         
+        if action not in ["add", "remove", "give", "take"]:
+            return await ctx.send("❌ Action invalide. Utilisez `add`, `remove` ou `cancel`.")
+        if role is None:
+            return await ctx.send("❌ Précisez le rôle.")
         if role >= ctx.guild.me.top_role:
             return await ctx.send("❌ Ce rôle est trop haut dans la hiérarchie.")
         
-        action = action.lower()
-        if action not in ["add", "remove", "give", "take"]:
-            return await ctx.send("❌ Action invalide. Utilisez `add` ou `remove`.")
+        running = jobs.jobs.get(ctx.guild.id)
+        if running is not None and not running.finished:
+            return await ctx.send("❌ Une action en masse est déjà en cours (`massrole cancel` pour l'arrêter).")
         
         # Détermine les cibles
         target = (target or "all").lower()
         if target in ["all", "tous", "everyone"]:
-            members = ctx.guild.members
+            target = "all"
         elif target in ["bots", "bot"]:
-            members = [m for m in ctx.guild.members if m.bot]
+            target = "bots"
         elif target in ["humans", "humains", "users"]:
-            members = [m for m in ctx.guild.members if not m.bot]
+            target = "humans"
         else:
             return await ctx.send("❌ Cible invalide. Utilisez `all`, `bots` ou `humans`.")
         
-        msg = await ctx.send(f"⏳ Traitement en cours...")
+        action = "add" if action in ["add", "give"] else "remove"
+        # Seuls les membres à modifier sont mis en file
+        member_ids = plan_role_job(ctx.guild, role, action, target)
+        if not member_ids:
+            return await ctx.send(f"✅ Rien à faire : tous les membres ciblés {'ont' if action == 'add' else 'sont déjà sans'} le rôle.")
         
-        success = 0
-        failed = 0
+        msg = await ctx.send(f"⏳ Traitement en cours... (`{len(member_ids)}` membre(s))")
+        job = MemberJob(
+            ctx.guild.id, ctx.channel.id, msg.id, ctx.author.id, action, role.id, target,
+            reason=f"Mass role par {ctx.author}"
+        )
+        jobs.start(job, member_ids)
+    
+    def build_job_embed(self, job, guild, role):
+        """Message de suivi d'une action en masse (mis à jour toutes les 5 secondes)"""
+        processed = job.done + job.failed + job.skipped
+        ratio = processed / job.total if job.total else 1
+        bar = "█" * int(ratio * 20) + "░" * (20 - int(ratio * 20))
+        
+        if job.finished:
+            title, color = ("🛑 Action en masse annulée", discord.Color.orange()) if job.cancelled else ("✅ Action en masse terminée", discord.Color.green())
+        else:
+            title, color = "⏳ Action en masse en cours", discord.Color.blue()
         
-        try:
-            for member in members:
-                try:
-                    if action in ["add", "give"]:
-                        if role not in member.roles:
-                            await member.add_roles(role, reason=f"Mass role par {ctx.author}")
-                            success += 1
-                    else:
-                        if role in member.roles:
-                            await member.remove_roles(role, reason=f"Mass role par {ctx.author}")
-                            success += 1
-                except:
-                    failed += 1
-            
-            embed = discord.Embed(
-                title="✅ Action en masse terminée",
-                description=f"Rôle: {role.mention}",
-                color=discord.Color.green()
-            )
-            embed.add_field(name="✅ Réussis", value=str(success), inline=True)
-            embed.add_field(name="❌ Échoués", value=str(failed), inline=True)
-            await msg.edit(content=None, embed=embed)
-            
-        except Exception as e:
-            await msg.edit(content=f"❌ Erreur : {e}")
+        embed = discord.Embed(
+            title=title,
+            description=f"Rôle: {role.mention} • {'Ajout' if job.action == 'add' else 'Retrait'}\n`{bar}` {ratio:.0%}",
+            color=color
+        )
+        embed.add_field(name="✅ Réussis", value=str(job.done), inline=True)
+        embed.add_field(name="❌ Échoués", value=str(job.failed), inline=True)
+        embed.add_field(name="⏳ Restants", value=str(job.remaining), inline=True)
+        
+        elapsed = time.time() - job.started
+        if not job.finished and processed:
+            eta = int(elapsed / processed * job.remaining)
+            embed.set_footer(text=f"Fin estimée dans ~{eta // 60}m{eta % 60:02d}s • massrole cancel pour arrêter")
+        return embed
     
     # ==================== INFORMATIONS SERVEUR (GS - Niveau 3) ====================
     
     @commands.command(name="servinfo", aliases=["sinfo"])
     async def server_info(self, ctx):
         """Affiche les infos du serveur - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         guild = ctx.guild
         
         embed = discord.Embed(
@@ -353,13 +328,6 @@ class Gestion(commands.Cog):
     @commands.command(name="roleinfo", aliases=["ri"])
     async def role_info(self, ctx, role: discord.Role):
         """Affiche les infos d'un rôle - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         embed = discord.Embed(
             title=f"🎭 Informations sur {role.name}",
             color=role.color
@@ -382,82 +350,47 @@ class Gestion(commands.Cog):
     @commands.command(name="purgebots")
     async def purge_bots(self, ctx, limit: int = 100):
         """Supprime les messages des bots - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
-        if limit < 1 or limit > 100:
-            return await ctx.send("❌ La limite doit être entre 1 et 100.")
-        
-        try:
-            deleted = await ctx.channel.purge(
-                limit=limit,
-                check=lambda m: m.author.bot
-            )
-            
-            msg = await ctx.send(f"✅ {len(deleted)} message(s) de bots supprimé(s).")
-            await msg.delete(delay=5)
-            
-        except discord.Forbidden:
-            await ctx.send("❌ Le bot n'a pas la permission de supprimer des messages.")
-        except Exception as e:
-            await ctx.send(f"❌ Erreur : {e}")
+        await self.run_purge(ctx, limit, build_check(bots=True), "message(s) de bots")
     
     @commands.command(name="purgeuser")
     async def purge_user(self, ctx, user: str, limit: int = 100):
         """Supprime les messages d'un utilisateur - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         member = await self.find_member(ctx, user)
         if not member:
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
         
-        if limit < 1 or limit > 100:
-            return await ctx.send("❌ La limite doit être entre 1 et 100.")
-        
-        try:
-            deleted = await ctx.channel.purge(
-                limit=limit,
-                check=lambda m: m.author == member
-            )
-            
-            msg = await ctx.send(f"✅ {len(deleted)} message(s) de {member.mention} supprimé(s).")
-            await msg.delete(delay=5)
-            
-        except discord.Forbidden:
-            await ctx.send("❌ Le bot n'a pas la permission de supprimer des messages.")
-        except Exception as e:
-            await ctx.send(f"❌ Erreur : {e}")
+        await self.run_purge(ctx, limit, build_check(author=member), f"message(s) de {member.mention}")
     
     @commands.command(name="purgeembeds")
     async def purge_embeds(self, ctx, limit: int = 100):
         """Supprime les messages avec embeds - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
+        await self.run_purge(ctx, limit, build_check(embeds=True), "message(s) avec embeds")
+    
+    @commands.command(name="prune")
+    async def prune(self, ctx, *, flags: PruneFlags):
+        """Suppression filtrée - Nécessite niveau GS (3)
+        Exemple: !prune limit: 5000 user: @Membre match: discord\\.gg bots: true embeds: true before: <id> after: <id>"""
+        member = None
+        if flags.user:
+            member = await self.find_member(ctx, flags.user)
+            if not member:
+                return await ctx.send(f"❌ Membre `{flags.user}` introuvable.")
         
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
+        try:
+            check = build_check(author=member, bots=flags.bots, embeds=flags.embeds, pattern=flags.match)
+        except re.error as e:
+            return await ctx.send(f"❌ Expression régulière invalide : {e}")
         
-        if limit < 1 or limit > 100:
-            return await ctx.send("❌ La limite doit être entre 1 et 100.")
+        await self.run_purge(ctx, flags.limit, check, "message(s)", before=flags.before, after=flags.after)
+    
+    async def run_purge(self, ctx, limit, check, label, before=None, after=None):
+        """Parcourt les `limit` derniers messages du salon et supprime ceux qui passent le filtre"""
+        if limit < 1 or limit > MAX_SCAN:
+            return await ctx.send(f"❌ La limite doit être entre 1 et {MAX_SCAN}.")
         
         try:
-            deleted = await ctx.channel.purge(
-                limit=limit,
-                check=lambda m: len(m.embeds) > 0
-            )
-            
-            msg = await ctx.send(f"✅ {len(deleted)} message(s) avec embeds supprimé(s).")
-            await msg.delete(delay=5)
+            job = PurgeJob(ctx.channel, limit, check, before=before, after=after, reason=f"Purge par {ctx.author}")
+            await run_with_status(ctx, job, label)
             
         except discord.Forbidden:
             await ctx.send("❌ Le bot n'a pas la permission de supprimer des messages.")
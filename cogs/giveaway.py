@@ -1,47 +1,347 @@
-# cogs/fun.py
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
+import heapq
 import random
+import time
+from typing import Optional
+
+from core.converters import Duration
+from core.storage import get_storage
+
+EMOJI = "🎉"
+MAX_WINNERS = 20
+MAX_DURATION = 60 * 86400
+ENTRY_MODES = {"reaction": "reaction", "réaction": "reaction", "bouton": "button", "button": "button"}
+
+
+class Reservoir:
+    """Échantillon uniforme de `size` éléments sur un flux de taille inconnue (algorithme R)"""
+
+    def __init__(self, size):
+        self.size = size
+        self.items = []
+        self.seen = 0
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            index = random.randrange(self.seen)
+            if index < self.size:
+                self.items[index] = item
+
+
+class Winners(commands.Converter):
+    """Nombre de gagnants : `3w`"""
+
+    async def convert(self, ctx, argument):
+        value = argument.lower()
+        if not value.endswith("w") or not value[:-1].isdigit():
+            raise commands.BadArgument(f"Nombre de gagnants invalide : `{argument}` (ex : `3w`)")
+        winners = int(value[:-1])
+        if not 1 <= winners <= MAX_WINNERS:
+            raise commands.BadArgument(f"Le nombre de gagnants doit être compris entre 1 et {MAX_WINNERS}.")
+        return winners
+
+
+class EntryMode(commands.Converter):
+    """Mode de participation : `reaction` (par défaut) ou `bouton`"""
+
+    async def convert(self, ctx, argument):
+        mode = ENTRY_MODES.get(argument.lower())
+        if mode is None:
+            raise commands.BadArgument(f"Mode invalide : `{argument}` (`reaction` ou `bouton`)")
+        return mode
+
+
+class EntryView(discord.ui.View):
+    """Bouton de participation, partagé par tous les giveaways (vue persistante)"""
+
+    def __init__(self, cog):
+        super().__init__(timeout=None)
+        self.cog = cog
+
+    @discord.ui.button(label="Participer", emoji=EMOJI, style=discord.ButtonStyle.primary, custom_id="giveaway:enter")
+    async def enter(self, interaction, button):
+        await self.cog.toggle_entry(interaction)
+
 
 class Giveaway(commands.Cog):
+    """Giveaways persistants : une seule tâche réveillée par le prochain giveaway à terminer"""
+
     def __init__(self, bot):
         self.bot = bot
+        self.storage = None
+        self.giveaways = {}   # message_id -> giveaway (en cours et terminés)
+        self._heap = []       # (ends_at, message_id) des giveaways en cours
+        self._wakeup = None
+        self._timer = None
+        self._endings = set()
+        self.entries = {}     # message_id -> {user_id} (giveaways en cours, mode bouton)
+        self.view = None
 
-    @commands.command()
-    @commands.has_permissions(administrator=True)
-    async def giveaway(self, ctx, seconds: int, *, prize: str):
-        """Lance un giveaway. Usage: !giveaway <secondes> <prix>"""
-        embed = discord.Embed(
-            title="🎁 Giveaway !",
-            description=f"**Prix :** {prize}\nRéagissez avec 🎉 pour participer !\nDurée : {seconds} secondes",
-            color=discord.Color.purple()
+    async def cog_load(self):
+        self.storage = await get_storage(self.bot)
+        self.giveaways = await self.storage.load_giveaways()
+        self._heap = [(g["ends_at"], g["message_id"]) for g in self.giveaways.values() if not g["ended"]]
+        heapq.heapify(self._heap)
+        self.entries = await self.storage.load_giveaway_entries(
+            g["message_id"] for g in self.giveaways.values() if not g["ended"] and g["mode"] == "button"
         )
-        embed.set_footer(text=f"Lancé par {ctx.author}", icon_url=ctx.author.avatar.url if ctx.author.avatar else None)
-        message = await ctx.send(embed=embed)
-        await message.add_reaction("🎉")
+        self.view = EntryView(self)
+        self.bot.add_view(self.view)
+        self._wakeup = asyncio.Event()
+        self._timer = asyncio.create_task(self._run_timer())
+        if self._heap:
+            print(f"🎉 {len(self._heap)} giveaway(s) en cours repris")
+
+    async def cog_unload(self):
+        self.view.stop()
+        self._timer.cancel()
+        for task in self._endings:
+            task.cancel()
+
+    # ==================== PLANIFICATION ====================
+
+    def schedule(self, giveaway):
+        heapq.heappush(self._heap, (giveaway["ends_at"], giveaway["message_id"]))
+        self._wakeup.set()
+
+    async def _run_timer(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            delay = self._heap[0][0] - time.time() if self._heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            ends_at, message_id = heapq.heappop(self._heap)
+            giveaway = self.giveaways.get(message_id)
+            # Entrée périmée (giveaway terminé à la main ou supprimé)
+            if giveaway is None or giveaway["ended"] or giveaway["ends_at"] != ends_at:
+                continue
+            task = asyncio.create_task(self.end_giveaway(giveaway))
+            self._endings.add(task)
+            task.add_done_callback(self._endings.discard)
+
+    # ==================== TIRAGE ====================
+
+    async def toggle_entry(self, interaction):
+        message_id = interaction.message.id
+        giveaway = self.giveaways.get(message_id)
+        if giveaway is None or giveaway["ended"] or message_id not in self.entries:
+            return await interaction.response.send_message("❌ Ce giveaway est terminé.", ephemeral=True)
+
+        entrants = self.entries[message_id]
+        user_id = interaction.user.id
+        entered = user_id not in entrants
+        if entered:
+            entrants.add(user_id)
+        else:
+            entrants.discard(user_id)
+        await self.storage.set_giveaway_entry(message_id, user_id, entered)
+
+        if entered:
+            await interaction.response.send_message(f"{EMOJI} Participation enregistrée ! (cliquez à nouveau pour vous retirer)", ephemeral=True)
+        else:
+            await interaction.response.send_message("👋 Participation retirée.", ephemeral=True)
 
-        await asyncio.sleep(seconds)
+    async def draw(self, giveaway, count, exclude=()):
+        """Tire `count` gagnants sans garder la liste des participants en mémoire.
+        
+        Retourne (gagnants, nombre de participants), ou None si les participants
+        sont inaccessibles.
+        """
+        reservoir = Reservoir(count)
+        if giveaway["mode"] == "button":
+            entrants = self.entries.get(giveaway["message_id"])
+            if entrants is None:
+                entrants = (await self.storage.load_giveaway_entries([giveaway["message_id"]]))[giveaway["message_id"]]
+            for user_id in entrants:
+                if user_id not in exclude:
+                    reservoir.add(user_id)
+            return reservoir.items, reservoir.seen
 
-        # Récupérer le message mis à jour
+        channel = self.bot.get_channel(giveaway["channel_id"])
+        if channel is None:
+            return None
         try:
-            message = await ctx.channel.fetch_message(message.id)
-            reaction = discord.utils.get(message.reactions, emoji="🎉")
-            users = [user async for user in reaction.users() if not user.bot]
-        except Exception:
-            await ctx.send("❌ Impossible de récupérer les participants.")
-            return
+            message = await channel.fetch_message(giveaway["message_id"])
+            reaction = discord.utils.get(message.reactions, emoji=EMOJI)
+            if reaction is not None:
+                # Les pages de 100 réactions sont lues au fil de l'eau
+                async for user in reaction.users(limit=None):
+                    if not user.bot and user.id not in exclude:
+                        reservoir.add(user.id)
+        except discord.HTTPException:
+            return None
+        return reservoir.items, reservoir.seen
 
-        if users:
-            winner = random.choice(users)
-            win_embed = discord.Embed(
-                title="🏆 Giveaway terminé !",
-                description=f"Félicitations {winner.mention} ! Vous avez gagné **{prize}** !",
-                color=discord.Color.gold()
+    def build_embed(self, giveaway, host=None):
+        if giveaway["ended"]:
+            winners = ", ".join(f"<@{user_id}>" for user_id in giveaway["winner_ids"]) or "Aucun participant"
+            description = (
+                f"**Prix :** {giveaway['prize']}\n"
+                f"**Gagnant(s) :** {winners}\n"
+                f"**Participants :** {giveaway.get('entrants', 0)}\n"
+                f"Terminé <t:{int(giveaway['ends_at'])}:R>"
+            )
+            color = discord.Color.dark_grey()
+        else:
+            how = "Cliquez sur le bouton" if giveaway["mode"] == "button" else f"Réagissez avec {EMOJI}"
+            description = (
+                f"**Prix :** {giveaway['prize']}\n"
+                f"{how} pour participer !\n"
+                f"**Gagnant(s) :** {giveaway['winners']}\n"
+                f"Fin <t:{int(giveaway['ends_at'])}:R>"
             )
-            await ctx.send(embed=win_embed)
+            color = discord.Color.purple()
+        embed = discord.Embed(title="🎁 Giveaway !", description=description, color=color)
+        if host is not None:
+            embed.set_footer(text=f"Lancé par {host}", icon_url=host.avatar.url if host.avatar else None)
         else:
-            await ctx.send("Aucun participant n'a réagi au giveaway 😢")
+            embed.set_footer(text=f"ID : {giveaway['message_id']}")
+        return embed
+
+    async def end_giveaway(self, giveaway):
+        """Tire les gagnants, met à jour le message et annonce le résultat"""
+        # Marqué tout de suite : `gend` et le minuteur ne peuvent pas le terminer deux fois
+        giveaway["ended"] = True
+        result = await self.draw(giveaway, giveaway["winners"])
+        self.entries.pop(giveaway["message_id"], None)
+
+        giveaway["ends_at"] = min(giveaway["ends_at"], time.time())
+        giveaway["winner_ids"], giveaway["entrants"] = result or ([], 0)
+        await self.storage.save_giveaway(giveaway)
+
+        channel = self.bot.get_channel(giveaway["channel_id"])
+        if channel is None:
+            return
+        if result is None:
+            await channel.send("❌ Impossible de récupérer les participants.")
+            return
+
+        try:
+            # Le bouton est retiré une fois le giveaway terminé
+            await channel.get_partial_message(giveaway["message_id"]).edit(embed=self.build_embed(giveaway), view=None)
+        except discord.HTTPException:
+            pass
+        await self.announce(channel, giveaway, giveaway["winner_ids"])
+
+    async def announce(self, channel, giveaway, winner_ids, reroll=False):
+        if not winner_ids:
+            await channel.send("Aucun participant n'a réagi au giveaway 😢")
+            return
+        mentions = ", ".join(f"<@{user_id}>" for user_id in winner_ids)
+        win_embed = discord.Embed(
+            title="🔁 Nouveau tirage !" if reroll else "🏆 Giveaway terminé !",
+            description=f"Félicitations {mentions} ! Vous avez gagné **{giveaway['prize']}** !",
+            color=discord.Color.gold()
+        )
+        await channel.send(embed=win_embed)
+
+    def get_giveaway(self, ctx, message_id):
+        giveaway = self.giveaways.get(message_id)
+        if giveaway is None or giveaway["guild_id"] != str(ctx.guild.id):
+            return None
+        return giveaway
+
+    # ==================== COMMANDES ====================
+
+    @commands.command()
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def giveaway(self, ctx, duration: Duration(maximum=MAX_DURATION), winners: Optional[Winners] = 1, mode: Optional[EntryMode] = "reaction", *, prize: str):
+        """Lance un giveaway. Usage: +giveaway <durée> [gagnants]w [bouton] <prix> (ex : +giveaway 2h 3w bouton Nitro)"""
+        giveaway = {
+            "message_id": None,
+            "guild_id": str(ctx.guild.id),
+            "channel_id": ctx.channel.id,
+            "host_id": ctx.author.id,
+            "prize": prize,
+            "winners": winners,
+            "ends_at": time.time() + duration,
+            "ended": False,
+            "winner_ids": [],
+            "mode": mode,
+        }
+        if mode == "button":
+            message = await ctx.send(embed=self.build_embed(giveaway, host=ctx.author), view=self.view)
+            self.entries[message.id] = set()
+        else:
+            message = await ctx.send(embed=self.build_embed(giveaway, host=ctx.author))
+            await message.add_reaction(EMOJI)
+        giveaway["message_id"] = message.id
+
+        self.giveaways[message.id] = giveaway
+        await self.storage.save_giveaway(giveaway)
+        self.schedule(giveaway)
+
+    @commands.command(name="gend")
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def giveaway_end(self, ctx, message_id: int):
+        """Termine un giveaway immédiatement. Usage: +gend <ID du message>"""
+        giveaway = self.get_giveaway(ctx, message_id)
+        if giveaway is None:
+            return await ctx.send("❌ Giveaway introuvable.")
+        if giveaway["ended"]:
+            return await ctx.send("❌ Ce giveaway est déjà terminé.")
+        await self.end_giveaway(giveaway)
+
+    @commands.command(name="greroll")
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def giveaway_reroll(self, ctx, message_id: int, winners: int = 1):
+        """Tire de nouveaux gagnants. Usage: +greroll <ID du message> [nombre]"""
+        giveaway = self.get_giveaway(ctx, message_id)
+        if giveaway is None:
+            return await ctx.send("❌ Giveaway introuvable.")
+        if not giveaway["ended"]:
+            return await ctx.send("❌ Ce giveaway n'est pas encore terminé.")
+        if not 1 <= winners <= MAX_WINNERS:
+            return await ctx.send(f"❌ Le nombre de gagnants doit être compris entre 1 et {MAX_WINNERS}.")
+
+        # Les gagnants précédents ne peuvent pas regagner
+        result = await self.draw(giveaway, winners, exclude=set(giveaway["winner_ids"]))
+        if result is None:
+            return await ctx.send("❌ Impossible de récupérer les participants.")
+        winner_ids = result[0]
+        if not winner_ids:
+            return await ctx.send("❌ Aucun autre participant à tirer au sort.")
+        giveaway["winner_ids"] = giveaway["winner_ids"] + winner_ids
+        await self.storage.save_giveaway(giveaway)
+        await self.announce(ctx.channel, giveaway, winner_ids, reroll=True)
+
+    @commands.command(name="glist")
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def giveaway_list(self, ctx):
+        """Liste les giveaways en cours du serveur"""
+        running = sorted(
+            (g for g in self.giveaways.values() if not g["ended"] and g["guild_id"] == str(ctx.guild.id)),
+            key=lambda g: g["ends_at"]
+        )
+        embed = discord.Embed(title="🎁 Giveaways en cours", color=discord.Color.purple())
+        if not running:
+            embed.description = "Aucun giveaway en cours."
+        else:
+            lines = [
+                f"**{g['prize'][:60]}** • {g['winners']} gagnant(s) • fin <t:{int(g['ends_at'])}:R>\n"
+                f"└ <#{g['channel_id']}> • ID : `{g['message_id']}`"
+                for g in running[:15]
+            ]
+            if len(running) > 15:
+                lines.append(f"*... et {len(running) - 15} autres*")
+            embed.description = "\n".join(lines)
+        await ctx.send(embed=embed)
+
 
 async def setup(bot):
     await bot.add_cog(Giveaway(bot))
@@ -3,6 +3,14 @@ from discord.ext import commands
 from datetime import datetime
 import asyncio
 
+from core.auditlog import get_auditlog
+from core.banindex import get_ban_index
+from core.logqueue import get_logqueue
+from core.stats import get_stats
+
+REST_TIMEOUT = 5         # secondes max par appel REST du recensement
+BAN_COUNT_LIMIT = 1000   # au-delà, le nombre de bannissements est affiché "1000+"
+
 class ServerLogger(commands.Cog):
     """Log ultra-détaillé des serveurs rejoints et quittés"""
     
@@ -12,7 +20,31 @@ class ServerLogger(commands.Cog):
         self.log_channel_id = 1431718741007142952  # Logs serveurs rejoints/quittés
         self.mod_log_channel_id = 1431785521163800739  # Logs actions de modération (à configurer)
 
-    async def get_server_info(self, guild):
+    async def _count(self, coro, timeout=REST_TIMEOUT):
+        """Nombre d'éléments renvoyés par un appel REST (0 si refusé ou trop lent)"""
+        try:
+            return len(await asyncio.wait_for(coro, timeout))
+        except Exception:
+            return 0
+    
+    async def _count_bans(self, guild, limit=BAN_COUNT_LIMIT, timeout=REST_TIMEOUT):
+        indexed = get_ban_index(self.bot).count(guild.id)
+        if indexed is not None:
+            return indexed
+        
+        async def count():
+            total = 0
+            async for _ in guild.bans(limit=limit):
+                total += 1
+            return total
+        
+        try:
+            total = await asyncio.wait_for(count(), timeout)
+        except Exception:
+            return 0
+        return f"{limit}+" if total >= limit else total
+    
+    async def get_server_info(self, guild, count_bans=True):
         """Récupère toutes les infos détaillées du serveur"""
         info = {
             "name": guild.name,
@@ -36,51 +68,26 @@ class ServerLogger(commands.Cog):
             "stickers_count": len(guild.stickers),
         }
         
-        # Compte les membres
-        try:
-            bots = sum(1 for m in guild.members if m.bot)
-            humans = info["member_count"] - bots
-            info["bots"] = bots
-            info["humans"] = humans
-            
-            # Statuts des membres
-            online = sum(1 for m in guild.members if m.status == discord.Status.online)
-            idle = sum(1 for m in guild.members if m.status == discord.Status.idle)
-            dnd = sum(1 for m in guild.members if m.status == discord.Status.dnd)
-            offline = sum(1 for m in guild.members if m.status == discord.Status.offline)
-            
-            info["online"] = online
-            info["idle"] = idle
-            info["dnd"] = dnd
-            info["offline"] = offline
-        except:
-            info["bots"] = 0
-            info["humans"] = info["member_count"]
-            info["online"] = 0
-            info["idle"] = 0
-            info["dnd"] = 0
-            info["offline"] = 0
-        
-        # Invitations
-        try:
-            invites = await guild.invites()
-            info["invite_count"] = len(invites)
-        except:
-            info["invite_count"] = 0
-        
-        # Webhooks
-        try:
-            webhooks = await guild.webhooks()
-            info["webhook_count"] = len(webhooks)
-        except:
-            info["webhook_count"] = 0
-        
-        # Bannissements
-        try:
-            bans = [ban async for ban in guild.bans()]
-            info["ban_count"] = len(bans)
-        except:
-            info["ban_count"] = 0
+        # Compte les membres (un seul passage)
+        bots = 0
+        statuses = dict.fromkeys(("online", "idle", "dnd", "offline"), 0)
+        for member in guild.members:
+            if member.bot:
+                bots += 1
+            status = str(member.status)
+            if status in statuses:
+                statuses[status] += 1
+        info["bots"] = bots
+        info["humans"] = info["member_count"] - bots
+        info.update(statuses)
+        
+        # Invitations, webhooks et bannissements en parallèle (chaque appel est borné)
+        lookups = [self._count(guild.invites()), self._count(guild.webhooks())]
+        if count_bans:
+            lookups.append(self._count_bans(guild))
+        results = await asyncio.gather(*lookups)
+        info["invite_count"], info["webhook_count"] = results[:2]
+        info["ban_count"] = results[2] if count_bans else "N/A"
         
         return info
 
@@ -246,7 +253,7 @@ class ServerLogger(commands.Cog):
         
         # Footer avec statistiques globales
         embed.set_footer(
-            text=f"Total serveurs : {len(self.bot.guilds)} • Total utilisateurs : {sum(g.member_count for g in self.bot.guilds)}",
+            text=f"Total serveurs : {len(self.bot.guilds)} • Total utilisateurs : {get_stats(self.bot).totals()['members']}",
             icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None
         )
         
@@ -335,7 +342,7 @@ class ServerLogger(commands.Cog):
         )
         
         embed.set_footer(
-            text=f"Total serveurs : {len(self.bot.guilds)} • Total utilisateurs : {sum(g.member_count for g in self.bot.guilds)}",
+            text=f"Total serveurs : {len(self.bot.guilds)} • Total utilisateurs : {get_stats(self.bot).totals()['members']}",
             icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None
         )
         
@@ -357,230 +364,220 @@ class ServerLogger(commands.Cog):
         if not mod_log_channel:
             return
         
-        try:
-            await mod_log_channel.send(embed=embed)
-        except Exception as e:
-            print(f"❌ Erreur log modération: {e}")
+        if not get_logqueue(self.bot).enqueue(mod_log_channel, embed):
+            print(f"⚠️ File de logs modération pleine ({action_type})")
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
         """Log quand un membre est banni"""
-        await asyncio.sleep(1)
-        
         try:
-            async for entry in guild.audit_logs(limit=5, action=discord.AuditLogAction.ban):
-                if entry.target.id == user.id:
-                    moderator = entry.user
-                    reason = entry.reason or "Aucune raison fournie"
-                    
-                    embed = discord.Embed(
-                        title="🔨 Membre Banni",
-                        description=f"**{user}** a été banni du serveur **{guild.name}**",
-                        color=discord.Color.from_rgb(220, 53, 69),
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    if user.avatar:
-                        embed.set_thumbnail(url=user.display_avatar.url)
-                    
-                    embed.add_field(
-                        name="👤 Utilisateur Banni",
-                        value=(
-                            f"**Nom :** `{user}`\n"
-                            f"**ID :** `{user.id}`\n"
-                            f"**Mention :** {user.mention}"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="👮 Modérateur",
-                        value=(
-                            f"**Nom :** `{moderator}`\n"
-                            f"**ID :** `{moderator.id}`\n"
-                            f"**Mention :** {moderator.mention}"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="🏛️ Serveur",
-                        value=(
-                            f"**Nom :** `{guild.name}`\n"
-                            f"**ID :** `{guild.id}`\n"
-                            f"**Propriétaire :** {guild.owner.mention if guild.owner else 'Inconnu'}"
-                        ),
-                        inline=False
-                    )
-                    
-                    embed.add_field(
-                        name="📋 Raison",
-                        value=f"```{reason[:1000]}```",
-                        inline=False
-                    )
-                    
-                    embed.add_field(
-                        name="📅 Date & Heure",
-                        value=(
-                            f"**Date complète :** <t:{int(entry.created_at.timestamp())}:F>\n"
-                            f"**Heure :** <t:{int(entry.created_at.timestamp())}:T>\n"
-                            f"**Il y a :** <t:{int(entry.created_at.timestamp())}:R>"
-                        ),
-                        inline=False
-                    )
-                    
-                    embed.set_footer(
-                        text=f"Action ID: {entry.id} • Serveur: {guild.name}",
-                        icon_url=guild.icon.url if guild.icon else None
-                    )
-                    
-                    await self.log_mod_action(guild, "ban", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(guild, discord.AuditLogAction.ban, user.id)
+            if entry:
+                moderator = entry.user
+                reason = entry.reason or "Aucune raison fournie"
+                
+                embed = discord.Embed(
+                    title="🔨 Membre Banni",
+                    description=f"**{user}** a été banni du serveur **{guild.name}**",
+                    color=discord.Color.from_rgb(220, 53, 69),
+                    timestamp=datetime.utcnow()
+                )
+                
+                if user.avatar:
+                    embed.set_thumbnail(url=user.display_avatar.url)
+                
+                embed.add_field(
+                    name="👤 Utilisateur Banni",
+                    value=(
+                        f"**Nom :** `{user}`\n"
+                        f"**ID :** `{user.id}`\n"
+                        f"**Mention :** {user.mention}"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="👮 Modérateur",
+                    value=(
+                        f"**Nom :** `{moderator}`\n"
+                        f"**ID :** `{moderator.id}`\n"
+                        f"**Mention :** {moderator.mention}"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="🏛️ Serveur",
+                    value=(
+                        f"**Nom :** `{guild.name}`\n"
+                        f"**ID :** `{guild.id}`\n"
+                        f"**Propriétaire :** {guild.owner.mention if guild.owner else 'Inconnu'}"
+                    ),
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="📋 Raison",
+                    value=f"```{reason[:1000]}```",
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="📅 Date & Heure",
+                    value=(
+                        f"**Date complète :** <t:{int(entry.created_at.timestamp())}:F>\n"
+                        f"**Heure :** <t:{int(entry.created_at.timestamp())}:T>\n"
+                        f"**Il y a :** <t:{int(entry.created_at.timestamp())}:R>"
+                    ),
+                    inline=False
+                )
+                
+                embed.set_footer(
+                    text=f"Action ID: {entry.id} • Serveur: {guild.name}",
+                    icon_url=guild.icon.url if guild.icon else None
+                )
+                
+                await self.log_mod_action(guild, "ban", embed)
         except Exception as e:
             print(f"❌ Erreur log ban: {e}")
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild, user):
         """Log quand un membre est débanni"""
-        await asyncio.sleep(1)
-        
         try:
-            async for entry in guild.audit_logs(limit=5, action=discord.AuditLogAction.unban):
-                if entry.target.id == user.id:
-                    moderator = entry.user
-                    
-                    embed = discord.Embed(
-                        title="✅ Membre Débanni",
-                        description=f"**{user}** a été débanni du serveur **{guild.name}**",
-                        color=discord.Color.from_rgb(40, 167, 69),
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    embed.add_field(
-                        name="👤 Utilisateur Débanni",
-                        value=(
-                            f"**Nom :** `{user}`\n"
-                            f"**ID :** `{user.id}`\n"
-                            f"**Mention :** {user.mention}"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="👮 Modérateur",
-                        value=(
-                            f"**Nom :** `{moderator}`\n"
-                            f"**ID :** `{moderator.id}`\n"
-                            f"**Mention :** {moderator.mention}"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="🏛️ Serveur",
-                        value=(
-                            f"**Nom :** `{guild.name}`\n"
-                            f"**ID :** `{guild.id}`"
-                        ),
-                        inline=False
-                    )
-                    
-                    embed.add_field(
-                        name="📅 Date & Heure",
-                        value=(
-                            f"**Date :** <t:{int(entry.created_at.timestamp())}:F>\n"
-                            f"**Il y a :** <t:{int(entry.created_at.timestamp())}:R>"
-                        ),
-                        inline=False
-                    )
-                    
-                    embed.set_footer(text=f"Serveur: {guild.name}")
-                    
-                    await self.log_mod_action(guild, "unban", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(guild, discord.AuditLogAction.unban, user.id)
+            if entry:
+                moderator = entry.user
+                
+                embed = discord.Embed(
+                    title="✅ Membre Débanni",
+                    description=f"**{user}** a été débanni du serveur **{guild.name}**",
+                    color=discord.Color.from_rgb(40, 167, 69),
+                    timestamp=datetime.utcnow()
+                )
+                
+                embed.add_field(
+                    name="👤 Utilisateur Débanni",
+                    value=(
+                        f"**Nom :** `{user}`\n"
+                        f"**ID :** `{user.id}`\n"
+                        f"**Mention :** {user.mention}"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="👮 Modérateur",
+                    value=(
+                        f"**Nom :** `{moderator}`\n"
+                        f"**ID :** `{moderator.id}`\n"
+                        f"**Mention :** {moderator.mention}"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="🏛️ Serveur",
+                    value=(
+                        f"**Nom :** `{guild.name}`\n"
+                        f"**ID :** `{guild.id}`"
+                    ),
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="📅 Date & Heure",
+                    value=(
+                        f"**Date :** <t:{int(entry.created_at.timestamp())}:F>\n"
+                        f"**Il y a :** <t:{int(entry.created_at.timestamp())}:R>"
+                    ),
+                    inline=False
+                )
+                
+                embed.set_footer(text=f"Serveur: {guild.name}")
+                
+                await self.log_mod_action(guild, "unban", embed)
         except Exception as e:
             print(f"❌ Erreur log unban: {e}")
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
         """Log quand un membre est kick (différent du départ normal)"""
-        await asyncio.sleep(1)
-        
         try:
-            async for entry in member.guild.audit_logs(limit=5, action=discord.AuditLogAction.kick):
-                if entry.target.id == member.id and (datetime.utcnow() - entry.created_at).seconds < 5:
-                    moderator = entry.user
-                    reason = entry.reason or "Aucune raison fournie"
-                    
-                    embed = discord.Embed(
-                        title="👢 Membre Expulsé (Kick)",
-                        description=f"**{member}** a été expulsé du serveur **{member.guild.name}**",
-                        color=discord.Color.from_rgb(255, 193, 7),
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    if member.avatar:
-                        embed.set_thumbnail(url=member.display_avatar.url)
-                    
-                    embed.add_field(
-                        name="👤 Utilisateur Expulsé",
-                        value=(
-                            f"**Nom :** `{member}`\n"
-                            f"**ID :** `{member.id}`\n"
-                            f"**Mention :** {member.mention}\n"
-                            f"**A rejoint le :** <t:{int(member.joined_at.timestamp()) if member.joined_at else 0}:R>"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="👮 Modérateur",
-                        value=(
-                            f"**Nom :** `{moderator}`\n"
-                            f"**ID :** `{moderator.id}`\n"
-                            f"**Mention :** {moderator.mention}"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="🏛️ Serveur",
-                        value=(
-                            f"**Nom :** `{member.guild.name}`\n"
-                            f"**ID :** `{member.guild.id}`\n"
-                            f"**Propriétaire :** {member.guild.owner.mention if member.guild.owner else 'Inconnu'}"
-                        ),
-                        inline=False
-                    )
-                    
-                    embed.add_field(
-                        name="📋 Raison",
-                        value=f"```{reason[:1000]}```",
-                        inline=False
-                    )
-                    
+            entry = await get_auditlog(self.bot).find(member.guild, discord.AuditLogAction.kick, member.id, max_age=5)
+            if entry:
+                moderator = entry.user
+                reason = entry.reason or "Aucune raison fournie"
+                
+                embed = discord.Embed(
+                    title="👢 Membre Expulsé (Kick)",
+                    description=f"**{member}** a été expulsé du serveur **{member.guild.name}**",
+                    color=discord.Color.from_rgb(255, 193, 7),
+                    timestamp=datetime.utcnow()
+                )
+                
+                if member.avatar:
+                    embed.set_thumbnail(url=member.display_avatar.url)
+                
+                embed.add_field(
+                    name="👤 Utilisateur Expulsé",
+                    value=(
+                        f"**Nom :** `{member}`\n"
+                        f"**ID :** `{member.id}`\n"
+                        f"**Mention :** {member.mention}\n"
+                        f"**A rejoint le :** <t:{int(member.joined_at.timestamp()) if member.joined_at else 0}:R>"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="👮 Modérateur",
+                    value=(
+                        f"**Nom :** `{moderator}`\n"
+                        f"**ID :** `{moderator.id}`\n"
+                        f"**Mention :** {moderator.mention}"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="🏛️ Serveur",
+                    value=(
+                        f"**Nom :** `{member.guild.name}`\n"
+                        f"**ID :** `{member.guild.id}`\n"
+                        f"**Propriétaire :** {member.guild.owner.mention if member.guild.owner else 'Inconnu'}"
+                    ),
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="📋 Raison",
+                    value=f"```{reason[:1000]}```",
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="📅 Date & Heure",
+                    value=(
+                        f"**Date :** <t:{int(entry.created_at.timestamp())}:F>\n"
+                        f"**Il y a :** <t:{int(entry.created_at.timestamp())}:R>"
+                    ),
+                    inline=False
+                )
+                
+                # Rôles du membre
+                if len(member.roles) > 1:
+                    roles = ", ".join([r.mention for r in member.roles[1:][:10]])
                     embed.add_field(
-                        name="📅 Date & Heure",
-                        value=(
-                            f"**Date :** <t:{int(entry.created_at.timestamp())}:F>\n"
-                            f"**Il y a :** <t:{int(entry.created_at.timestamp())}:R>"
-                        ),
+                        name="🎭 Rôles du Membre",
+                        value=roles,
                         inline=False
                     )
-                    
-                    # Rôles du membre
-                    if len(member.roles) > 1:
-                        roles = ", ".join([r.mention for r in member.roles[1:][:10]])
-                        embed.add_field(
-                            name="🎭 Rôles du Membre",
-                            value=roles,
-                            inline=False
-                        )
-                    
-                    embed.set_footer(text=f"Serveur: {member.guild.name}")
-                    
-                    await self.log_mod_action(member.guild, "kick", embed)
-                    return
+                
+                embed.set_footer(text=f"Serveur: {member.guild.name}")
+                
+                await self.log_mod_action(member.guild, "kick", embed)
+                return
         except Exception as e:
             print(f"❌ Erreur log kick: {e}")
 
@@ -589,195 +586,185 @@ class ServerLogger(commands.Cog):
         """Log les timeouts (mises en sourdine)"""
         # Détecte les timeouts
         if before.timed_out_until != after.timed_out_until:
-            await asyncio.sleep(1)
-            
             try:
-                async for entry in after.guild.audit_logs(limit=3, action=discord.AuditLogAction.member_update):
-                    if entry.target.id == after.id:
-                        moderator = entry.user
+                entry = await get_auditlog(self.bot).find(after.guild, discord.AuditLogAction.member_update, after.id)
+                if entry:
+                    moderator = entry.user
+                    
+                    # Timeout ajouté
+                    if after.timed_out_until and not before.timed_out_until:
+                        embed = discord.Embed(
+                            title="⏱️ Membre Mis en Timeout",
+                            description=f"**{after}** a été mis en timeout dans **{after.guild.name}**",
+                            color=discord.Color.from_rgb(255, 193, 7),
+                            timestamp=datetime.utcnow()
+                        )
                         
-                        # Timeout ajouté
-                        if after.timed_out_until and not before.timed_out_until:
-                            embed = discord.Embed(
-                                title="⏱️ Membre Mis en Timeout",
-                                description=f"**{after}** a été mis en timeout dans **{after.guild.name}**",
-                                color=discord.Color.from_rgb(255, 193, 7),
-                                timestamp=datetime.utcnow()
-                            )
-                            
-                            embed.add_field(
-                                name="👤 Utilisateur",
-                                value=(
-                                    f"**Nom :** `{after}`\n"
-                                    f"**ID :** `{after.id}`\n"
-                                    f"**Mention :** {after.mention}"
-                                ),
-                                inline=True
-                            )
-                            
-                            embed.add_field(
-                                name="👮 Modérateur",
-                                value=(
-                                    f"**Nom :** `{moderator}`\n"
-                                    f"**ID :** `{moderator.id}`\n"
-                                    f"**Mention :** {moderator.mention}"
-                                ),
-                                inline=True
-                            )
-                            
-                            embed.add_field(
-                                name="🏛️ Serveur",
-                                value=f"**Nom :** `{after.guild.name}`\n**ID :** `{after.guild.id}`",
-                                inline=False
-                            )
-                            
+                        embed.add_field(
+                            name="👤 Utilisateur",
+                            value=(
+                                f"**Nom :** `{after}`\n"
+                                f"**ID :** `{after.id}`\n"
+                                f"**Mention :** {after.mention}"
+                            ),
+                            inline=True
+                        )
+                        
+                        embed.add_field(
+                            name="👮 Modérateur",
+                            value=(
+                                f"**Nom :** `{moderator}`\n"
+                                f"**ID :** `{moderator.id}`\n"
+                                f"**Mention :** {moderator.mention}"
+                            ),
+                            inline=True
+                        )
+                        
+                        embed.add_field(
+                            name="🏛️ Serveur",
+                            value=f"**Nom :** `{after.guild.name}`\n**ID :** `{after.guild.id}`",
+                            inline=False
+                        )
+                        
+                        embed.add_field(
+                            name="⏰ Durée du Timeout",
+                            value=(
+                                f"**Jusqu'au :** <t:{int(after.timed_out_until.timestamp())}:F>\n"
+                                f"**Expire :** <t:{int(after.timed_out_until.timestamp())}:R>"
+                            ),
+                            inline=False
+                        )
+                        
+                        if entry.reason:
                             embed.add_field(
-                                name="⏰ Durée du Timeout",
-                                value=(
-                                    f"**Jusqu'au :** <t:{int(after.timed_out_until.timestamp())}:F>\n"
-                                    f"**Expire :** <t:{int(after.timed_out_until.timestamp())}:R>"
-                                ),
+                                name="📋 Raison",
+                                value=f"```{entry.reason[:1000]}```",
                                 inline=False
                             )
-                            
-                            if entry.reason:
-                                embed.add_field(
-                                    name="📋 Raison",
-                                    value=f"```{entry.reason[:1000]}```",
-                                    inline=False
-                                )
-                            
-                            embed.set_footer(text=f"Serveur: {after.guild.name}")
-                            await self.log_mod_action(after.guild, "timeout", embed)
                         
-                        # Timeout retiré
-                        elif before.timed_out_until and not after.timed_out_until:
-                            embed = discord.Embed(
-                                title="✅ Timeout Retiré",
-                                description=f"Le timeout de **{after}** a été retiré dans **{after.guild.name}**",
-                                color=discord.Color.from_rgb(40, 167, 69),
-                                timestamp=datetime.utcnow()
-                            )
-                            
-                            embed.add_field(
-                                name="👤 Utilisateur",
-                                value=f"**Nom :** `{after}`\n**ID :** `{after.id}`",
-                                inline=True
-                            )
-                            
-                            embed.add_field(
-                                name="👮 Modérateur",
-                                value=f"**Nom :** `{moderator}`\n**ID :** `{moderator.id}`",
-                                inline=True
-                            )
-                            
-                            embed.set_footer(text=f"Serveur: {after.guild.name}")
-                            await self.log_mod_action(after.guild, "timeout_remove", embed)
+                        embed.set_footer(text=f"Serveur: {after.guild.name}")
+                        await self.log_mod_action(after.guild, "timeout", embed)
+                    
+                    # Timeout retiré
+                    elif before.timed_out_until and not after.timed_out_until:
+                        embed = discord.Embed(
+                            title="✅ Timeout Retiré",
+                            description=f"Le timeout de **{after}** a été retiré dans **{after.guild.name}**",
+                            color=discord.Color.from_rgb(40, 167, 69),
+                            timestamp=datetime.utcnow()
+                        )
+                        
+                        embed.add_field(
+                            name="👤 Utilisateur",
+                            value=f"**Nom :** `{after}`\n**ID :** `{after.id}`",
+                            inline=True
+                        )
+                        
+                        embed.add_field(
+                            name="👮 Modérateur",
+                            value=f"**Nom :** `{moderator}`\n**ID :** `{moderator.id}`",
+                            inline=True
+                        )
                         
-                        break
+                        embed.set_footer(text=f"Serveur: {after.guild.name}")
+                        await self.log_mod_action(after.guild, "timeout_remove", embed)
             except Exception as e:
                 print(f"❌ Erreur log timeout: {e}")
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
         """Log suppression de salons"""
-        await asyncio.sleep(1)
-        
         try:
-            async for entry in channel.guild.audit_logs(limit=3, action=discord.AuditLogAction.channel_delete):
-                if entry.target.id == channel.id:
-                    moderator = entry.user
-                    
-                    embed = discord.Embed(
-                        title="🗑️ Salon Supprimé",
-                        description=f"Un salon a été supprimé dans **{channel.guild.name}**",
-                        color=discord.Color.from_rgb(220, 53, 69),
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    embed.add_field(
-                        name="📝 Salon",
-                        value=(
-                            f"**Nom :** `{channel.name}`\n"
-                            f"**Type :** `{channel.type}`\n"
-                            f"**ID :** `{channel.id}`"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="👮 Modérateur",
-                        value=(
-                            f"**Nom :** `{moderator}`\n"
-                            f"**ID :** `{moderator.id}`\n"
-                            f"**Mention :** {moderator.mention}"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="🏛️ Serveur",
-                        value=f"**Nom :** `{channel.guild.name}`\n**ID :** `{channel.guild.id}`",
-                        inline=False
-                    )
-                    
-                    embed.add_field(
-                        name="📅 Date",
-                        value=f"<t:{int(entry.created_at.timestamp())}:F>",
-                        inline=False
-                    )
-                    
-                    embed.set_footer(text=f"Serveur: {channel.guild.name}")
-                    await self.log_mod_action(channel.guild, "channel_delete", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(channel.guild, discord.AuditLogAction.channel_delete, channel.id)
+            if entry:
+                moderator = entry.user
+                
+                embed = discord.Embed(
+                    title="🗑️ Salon Supprimé",
+                    description=f"Un salon a été supprimé dans **{channel.guild.name}**",
+                    color=discord.Color.from_rgb(220, 53, 69),
+                    timestamp=datetime.utcnow()
+                )
+                
+                embed.add_field(
+                    name="📝 Salon",
+                    value=(
+                        f"**Nom :** `{channel.name}`\n"
+                        f"**Type :** `{channel.type}`\n"
+                        f"**ID :** `{channel.id}`"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="👮 Modérateur",
+                    value=(
+                        f"**Nom :** `{moderator}`\n"
+                        f"**ID :** `{moderator.id}`\n"
+                        f"**Mention :** {moderator.mention}"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="🏛️ Serveur",
+                    value=f"**Nom :** `{channel.guild.name}`\n**ID :** `{channel.guild.id}`",
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="📅 Date",
+                    value=f"<t:{int(entry.created_at.timestamp())}:F>",
+                    inline=False
+                )
+                
+                embed.set_footer(text=f"Serveur: {channel.guild.name}")
+                await self.log_mod_action(channel.guild, "channel_delete", embed)
         except Exception as e:
             print(f"❌ Erreur log suppression salon: {e}")
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role):
         """Log suppression de rôles"""
-        await asyncio.sleep(1)
-        
         try:
-            async for entry in role.guild.audit_logs(limit=3, action=discord.AuditLogAction.role_delete):
-                if entry.target.id == role.id:
-                    moderator = entry.user
-                    
-                    embed = discord.Embed(
-                        title="🎭 Rôle Supprimé",
-                        description=f"Un rôle a été supprimé dans **{role.guild.name}**",
-                        color=discord.Color.from_rgb(220, 53, 69),
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    embed.add_field(
-                        name="🎭 Rôle",
-                        value=(
-                            f"**Nom :** `{role.name}`\n"
-                            f"**ID :** `{role.id}`\n"
-                            f"**Couleur :** `{role.color}`"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="👮 Modérateur",
-                        value=(
-                            f"**Nom :** `{moderator}`\n"
-                            f"**ID :** `{moderator.id}`"
-                        ),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="📅 Date",
-                        value=f"<t:{int(entry.created_at.timestamp())}:F>",
-                        inline=False
-                    )
-                    
-                    embed.set_footer(text=f"Serveur: {role.guild.name}")
-                    await self.log_mod_action(role.guild, "role_delete", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(role.guild, discord.AuditLogAction.role_delete, role.id)
+            if entry:
+                moderator = entry.user
+                
+                embed = discord.Embed(
+                    title="🎭 Rôle Supprimé",
+                    description=f"Un rôle a été supprimé dans **{role.guild.name}**",
+                    color=discord.Color.from_rgb(220, 53, 69),
+                    timestamp=datetime.utcnow()
+                )
+                
+                embed.add_field(
+                    name="🎭 Rôle",
+                    value=(
+                        f"**Nom :** `{role.name}`\n"
+                        f"**ID :** `{role.id}`\n"
+                        f"**Couleur :** `{role.color}`"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="👮 Modérateur",
+                    value=(
+                        f"**Nom :** `{moderator}`\n"
+                        f"**ID :** `{moderator.id}`"
+                    ),
+                    inline=True
+                )
+                
+                embed.add_field(
+                    name="📅 Date",
+                    value=f"<t:{int(entry.created_at.timestamp())}:F>",
+                    inline=False
+                )
+                
+                embed.set_footer(text=f"Serveur: {role.guild.name}")
+                await self.log_mod_action(role.guild, "role_delete", embed)
         except Exception as e:
             print(f"❌ Erreur log suppression rôle: {e}")
 
@@ -790,10 +777,9 @@ class ServerLogger(commands.Cog):
         guild = messages[0].guild
         channel = messages[0].channel
         
-        await asyncio.sleep(1)
-        
         try:
-            async for entry in guild.audit_logs(limit=3, action=discord.AuditLogAction.message_bulk_delete):
+            entry = await get_auditlog(self.bot).find(guild, discord.AuditLogAction.message_bulk_delete)
+            if entry:
                 moderator = entry.user
                 
                 embed = discord.Embed(
@@ -831,7 +817,6 @@ class ServerLogger(commands.Cog):
                 
                 embed.set_footer(text=f"Serveur: {guild.name}")
                 await self.log_mod_action(guild, "bulk_delete", embed)
-                break
         except Exception as e:
             print(f"❌ Erreur log bulk delete: {e}")
 
@@ -1161,9 +1146,11 @@ class ServerLogger(commands.Cog):
     async def server_stats(self, ctx):
         """Affiche les statistiques globales de tous les serveurs"""
         
-        total_guilds = len(self.bot.guilds)
-        total_members = sum(g.member_count for g in self.bot.guilds)
-        total_channels = sum(len(g.channels) for g in self.bot.guilds)
+        stats = get_stats(self.bot)
+        totals = stats.totals()
+        total_guilds = totals["guilds"]
+        total_members = totals["members"]
+        total_channels = totals["channels"]
         
         embed = discord.Embed(
             title="📊 Statistiques Globales",
@@ -1191,7 +1178,7 @@ class ServerLogger(commands.Cog):
         )
         
         # Top 5 serveurs
-        top_guilds = sorted(self.bot.guilds, key=lambda g: g.member_count, reverse=True)[:5]
+        top_guilds = stats.top_guilds(5)
         top_text = "\n".join([f"`{i+1}.` **{g.name}** - `{g.member_count}` membres" for i, g in enumerate(top_guilds)])
         
         embed.add_field(
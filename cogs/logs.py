@@ -1,57 +1,165 @@
 import discord
 from discord.ext import commands
 from datetime import datetime
-import json
-import os
 import asyncio
+import re
+import time
+from collections import Counter
+from types import MappingProxyType
+
+from core.archive import get_archive
+from core.auditlog import get_auditlog
+from core.converters import Duration, parse_duration
+from core.dispatch import get_dispatcher
+from core.logqueue import get_logqueue
+from core.msgcache import CachedMessage, MessageContentCache
+from core.storage import get_storage
+
+LOG_TYPES = (
+    "moderation",
+    "messages",
+    "members",
+    "voice",
+    "server",
+    "roles",
+    "invites",
+    "giveaways",
+    "boosts",
+    "reactions"
+)
+
+# Configuration par défaut (lecture seule) des serveurs sans salons de logs
+DEFAULT_CONFIG = MappingProxyType(dict.fromkeys(LOG_TYPES))
+
+# Réactions : un log par réaction ("detail") ou un résumé par message ("resume")
+REACTION_MODES = ("detail", "resume")
+SUMMARY_WINDOW = 60  # secondes de regroupement par message
+
+# Bans en masse : les logs individuels (ban, départ) sont remplacés par un résumé
+SUPPRESS_SECONDS = 300
+
+# Recherche dans l'archive : période ("30m", "12h", "7j"...) et nombre de résultats
+SEARCH_PERIOD = Duration(maximum=365 * 86400)
+SEARCH_LIMIT = 15
+
+
+def summarize(embed):
+    """Résumé texte d'un embed de log pour l'archive (sans mise en forme)"""
+    text = f"{embed.title}\n{embed.description or ''}"
+    text = re.sub(r"\[Aller au message\]\([^)]*\)|[*`]", "", text)
+    return " • ".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+class ReactionBurst:
+    """Réactions reçues sur un message pendant la fenêtre de résumé"""
+    __slots__ = ("guild", "channel", "message_id", "added", "removed", "emojis", "reactors")
+
+    def __init__(self, guild, channel, message_id):
+        self.guild = guild
+        self.channel = channel
+        self.message_id = message_id
+        self.added = 0
+        self.removed = 0
+        self.emojis = Counter()    # emoji -> ajouts
+        self.reactors = Counter()  # user_id -> ajouts
 
 class Logger(commands.Cog):
     """Système de logs complet et automatique"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.config_file = "logs_config.json"
-        self.config = self.load_config()
+        self.storage = None
+        self.logqueue = None
+        self.archive = None
+        self.config = {}
+        self.options = {}          # guild_id -> {option: valeur} (valeurs par défaut absentes)
+        self.messages = MessageContentCache()
+        self.reaction_bursts = {}  # message_id -> ReactionBurst
+        self._summary_tasks = {}   # message_id -> tâche de résumé différé
+        self.suppressed = {}       # (guild_id, user_id) -> expiration des logs ignorés
     
-    def load_config(self):
-        if os.path.exists(self.config_file):
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        return {}
+    async def cog_load(self):
+        self.storage = await get_storage(self.bot)
+        self.logqueue = get_logqueue(self.bot)
+        self.archive = await get_archive(self.bot)
+        for guild_id, channels in (await self.storage.load_log_channels()).items():
+            config = dict.fromkeys(LOG_TYPES)
+            config.update(channels)
+            self.config[guild_id] = config
+        self.options = await self.storage.load_log_options()
+        for stream in ("chat", "command"):
+            get_dispatcher(self.bot).subscribe(stream, self.cache_message, name="logs")
     
-    def save_config(self):
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+    async def cog_unload(self):
+        get_dispatcher(self.bot).unsubscribe("logs")
+        # Résumés de réactions en cours, puis logs en attente (ordre conservé)
+        for task in self._summary_tasks.values():
+            task.cancel()
+        self._summary_tasks.clear()
+        for message_id in list(self.reaction_bursts):
+            await self.send_reaction_summary(message_id)
+        await self.logqueue.flush()
+    
+    async def save_config(self, guild_id, log_types=None):
+        """Enregistre les salons d'un serveur (tous, ou seulement `log_types`)"""
+        config = self.get_config(guild_id)
+        keys = log_types or config.keys()
+        await self.storage.set_log_channels(guild_id, {key: config[key] for key in keys})
+        
+        # Un serveur sans aucun salon reprend la configuration par défaut
+        if not any(config.values()):
+            self.config.pop(str(guild_id), None)
     
     def get_config(self, guild_id):
+        """Configuration du serveur en lecture (défaut partagé si non configuré)"""
+        return self.config.get(str(guild_id), DEFAULT_CONFIG)
+    
+    def get_option(self, guild_id, option, default=None):
+        return self.options.get(str(guild_id), {}).get(option, default)
+    
+    async def set_option(self, guild_id, option, value):
+        """Modifie une option du serveur (None = valeur par défaut)"""
+        guild_id = str(guild_id)
+        if value is None:
+            options = self.options.get(guild_id, {})
+            options.pop(option, None)
+            if not options:
+                self.options.pop(guild_id, None)
+        else:
+            self.options.setdefault(guild_id, {})[option] = value
+        await self.storage.set_log_option(guild_id, option, value)
+    
+    def suppress(self, guild_id, user_ids, duration=SUPPRESS_SECONDS):
+        """Ignore les logs de ban / départ de ces utilisateurs (action déjà résumée en un seul log)"""
+        now = time.monotonic()
+        self.suppressed = {key: expiry for key, expiry in self.suppressed.items() if expiry > now}
+        for user_id in user_ids:
+            self.suppressed[(guild_id, user_id)] = now + duration
+    
+    def is_suppressed(self, guild_id, user_id):
+        expiry = self.suppressed.get((guild_id, user_id))
+        return expiry is not None and expiry > time.monotonic()
+    
+    def ensure_config(self, guild_id):
+        """Configuration modifiable du serveur (créée au premier changement)"""
         guild_id = str(guild_id)
         if guild_id not in self.config:
-            self.config[guild_id] = {
-                "moderation": None,
-                "messages": None,
-                "members": None,
-                "voice": None,
-                "server": None,
-                "roles": None,
-                "invites": None,
-                "giveaways": None,
-                "boosts": None,
-                "reactions": None
-            }
-            self.save_config()
+            self.config[guild_id] = dict.fromkeys(LOG_TYPES)
         return self.config[guild_id]
     
-    async def log(self, guild, log_type, embed):
+    async def log(self, guild, log_type, embed, actor=None, target=None, channel=None):
+        """Met le log en file (envoi par lots) et l'ajoute à l'archive locale.
+        
+        `actor`, `target` et `channel` (IDs) alimentent l'index de `logs search`.
+        """
         config = self.get_config(guild.id)
         channel_id = config.get(log_type)
         
         if channel_id:
-            channel = guild.get_channel(int(channel_id))
-            if channel:
-                try:
-                    await channel.send(embed=embed)
-                except:
-                    pass
+            log_channel = guild.get_channel(int(channel_id))
+            if log_channel:
+                self.logqueue.enqueue(log_channel, embed)
+            self.archive.append(log_type, guild.id, summarize(embed), actor=actor, target=target, channel=channel)
     
     def create_embed(self, title, description, color):
         embed = discord.Embed(
@@ -67,60 +175,59 @@ class Logger(commands.Cog):
     
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
-        await asyncio.sleep(1)
+        if self.is_suppressed(guild.id, user.id):
+            return
         try:
-            async for entry in guild.audit_logs(limit=3, action=discord.AuditLogAction.ban):
-                if entry.target.id == user.id:
-                    embed = self.create_embed(
-                        "🔨 Membre Banni",
-                        f"**Utilisateur :** {user.mention} `{user}`\n"
-                        f"**ID :** `{user.id}`\n"
-                        f"**Modérateur :** {entry.user.mention}\n"
-                        f"**Raison :** ```{entry.reason or 'Aucune raison'}```",
-                        discord.Color.from_rgb(220, 53, 69)
-                    )
-                    if user.avatar:
-                        embed.set_thumbnail(url=user.display_avatar.url)
-                    await self.log(guild, "moderation", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(guild, discord.AuditLogAction.ban, user.id)
+            if entry:
+                embed = self.create_embed(
+                    "🔨 Membre Banni",
+                    f"**Utilisateur :** {user.mention} `{user}`\n"
+                    f"**ID :** `{user.id}`\n"
+                    f"**Modérateur :** {entry.user.mention}\n"
+                    f"**Raison :** ```{entry.reason or 'Aucune raison'}```",
+                    discord.Color.from_rgb(220, 53, 69)
+                )
+                if user.avatar:
+                    embed.set_thumbnail(url=user.display_avatar.url)
+                await self.log(guild, "moderation", embed, actor=entry.user.id, target=user.id)
         except:
             pass
     
     @commands.Cog.listener()
     async def on_member_unban(self, guild, user):
-        await asyncio.sleep(1)
         try:
-            async for entry in guild.audit_logs(limit=3, action=discord.AuditLogAction.unban):
-                if entry.target.id == user.id:
-                    embed = self.create_embed(
-                        "✅ Membre Débanni",
-                        f"**Utilisateur :** {user.mention} `{user}`\n"
-                        f"**Modérateur :** {entry.user.mention}",
-                        discord.Color.from_rgb(40, 167, 69)
-                    )
-                    await self.log(guild, "moderation", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(guild, discord.AuditLogAction.unban, user.id)
+            if entry:
+                embed = self.create_embed(
+                    "✅ Membre Débanni",
+                    f"**Utilisateur :** {user.mention} `{user}`\n"
+                    f"**Modérateur :** {entry.user.mention}",
+                    discord.Color.from_rgb(40, 167, 69)
+                )
+                await self.log(guild, "moderation", embed, actor=entry.user.id, target=user.id)
         except:
             pass
     
     @commands.Cog.listener()
     async def on_member_remove(self, member):
-        await asyncio.sleep(1)
+        if self.is_suppressed(member.guild.id, member.id):
+            return
         
         # Vérifie si kick
         try:
-            async for entry in member.guild.audit_logs(limit=3, action=discord.AuditLogAction.kick):
-                if entry.target.id == member.id and (datetime.utcnow() - entry.created_at).seconds < 5:
-                    embed = self.create_embed(
-                        "👢 Membre Expulsé",
-                        f"**Utilisateur :** {member.mention} `{member}`\n"
-                        f"**ID :** `{member.id}`\n"
-                        f"**Modérateur :** {entry.user.mention}\n"
-                        f"**Raison :** ```{entry.reason or 'Aucune raison'}```",
-                        discord.Color.from_rgb(255, 193, 7)
-                    )
-                    await self.log(member.guild, "moderation", embed)
-                    return
+            entry = await get_auditlog(self.bot).find(member.guild, discord.AuditLogAction.kick, member.id, max_age=5)
+            if entry:
+                embed = self.create_embed(
+                    "👢 Membre Expulsé",
+                    f"**Utilisateur :** {member.mention} `{member}`\n"
+                    f"**ID :** `{member.id}`\n"
+                    f"**Modérateur :** {entry.user.mention}\n"
+                    f"**Raison :** ```{entry.reason or 'Aucune raison'}```",
+                    discord.Color.from_rgb(255, 193, 7)
+                )
+                await self.log(member.guild, "moderation", embed, actor=entry.user.id, target=member.id)
+                return
         except:
             pass
         
@@ -140,7 +247,7 @@ class Logger(commands.Cog):
         if member.avatar:
             embed.set_thumbnail(url=member.display_avatar.url)
         
-        await self.log(member.guild, "members", embed)
+        await self.log(member.guild, "members", embed, target=member.id)
     
     @commands.Cog.listener()
     async def on_member_join(self, member):
@@ -169,69 +276,116 @@ class Logger(commands.Cog):
         if member.avatar:
             embed.set_thumbnail(url=member.display_avatar.url)
         
-        await self.log(member.guild, "members", embed)
+        await self.log(member.guild, "members", embed, target=member.id)
     
     # ==================== MESSAGES ====================
     
+    async def cache_message(self, message):
+        """Abonné du distributeur : garde le contenu des messages des serveurs qui les loggent"""
+        if message.guild and self.get_config(message.guild.id)["messages"]:
+            self.messages.add(message)
+    
     @commands.Cog.listener()
-    async def on_message_delete(self, message):
-        if message.author.bot or not message.guild:
+    async def on_raw_message_delete(self, payload):
+        entry = self.messages.pop(payload.channel_id, payload.message_id)
+        if not payload.guild_id:
             return
         
-        content = message.content[:800] if message.content else "*[Vide ou média]*"
+        if entry is None:
+            message = payload.cached_message
+            if message is None or message.author.bot:
+                return
+            entry = CachedMessage(
+                message.author.id,
+                message.content[:800],
+                tuple(a.filename for a in message.attachments[:5]),
+                len(message.embeds)
+            )
+        
+        guild = self.bot.get_guild(payload.guild_id)
+        channel = guild.get_channel_or_thread(payload.channel_id) if guild else None
+        if not channel:
+            return
+        
+        author = guild.get_member(entry.author_id) or self.bot.get_user(entry.author_id)
+        content = entry.content or "*[Vide ou média]*"
         
         desc = (
-            f"**Auteur :** {message.author.mention} `{message.author}`\n"
-            f"**Salon :** {message.channel.mention}\n"
-            f"**ID Message :** `{message.id}`\n"
+            f"**Auteur :** <@{entry.author_id}> `{author or entry.author_id}`\n"
+            f"**Salon :** {channel.mention}\n"
+            f"**ID Message :** `{payload.message_id}`\n"
             f"**Contenu :** ```{content}```"
         )
         
-        if message.attachments:
-            files = ", ".join([a.filename for a in message.attachments[:5]])
+        if entry.attachments:
+            files = ", ".join(entry.attachments)
             desc += f"\n**📎 Fichiers :** `{files}`"
         
-        if message.embeds:
-            desc += f"\n**📊 Embeds :** `{len(message.embeds)}`"
+        if entry.embeds:
+            desc += f"\n**📊 Embeds :** `{entry.embeds}`"
         
         embed = self.create_embed("🗑️ Message Supprimé", desc, discord.Color.from_rgb(220, 53, 69))
         
-        await self.log(message.guild, "messages", embed)
+        await self.log(guild, "messages", embed, actor=entry.author_id, channel=payload.channel_id)
     
     @commands.Cog.listener()
-    async def on_bulk_message_delete(self, messages):
-        if not messages or not messages[0].guild:
+    async def on_raw_bulk_message_delete(self, payload):
+        authors = set()
+        for message_id in payload.message_ids:
+            entry = self.messages.pop(payload.channel_id, message_id)
+            if entry is not None:
+                authors.add(entry.author_id)
+        authors.update(m.author.id for m in payload.cached_messages)
+        
+        guild = self.bot.get_guild(payload.guild_id) if payload.guild_id else None
+        channel = guild.get_channel_or_thread(payload.channel_id) if guild else None
+        if not channel:
             return
         
-        guild = messages[0].guild
-        channel = messages[0].channel
-        
         embed = self.create_embed(
             "🗑️ Suppression en Masse",
             f"**Salon :** {channel.mention}\n"
-            f"**Messages supprimés :** `{len(messages)}`\n"
-            f"**Auteurs concernés :** `{len(set(m.author for m in messages))}`",
+            f"**Messages supprimés :** `{len(payload.message_ids)}`\n"
+            f"**Auteurs concernés :** `{len(authors)}`",
             discord.Color.from_rgb(220, 53, 69)
         )
         
-        await self.log(guild, "messages", embed)
+        await self.log(guild, "messages", embed, channel=payload.channel_id)
     
     @commands.Cog.listener()
-    async def on_message_edit(self, before, after):
-        if before.author.bot or not before.guild or before.content == after.content:
+    async def on_raw_message_edit(self, payload):
+        # Les mises à jour sans "content" (aperçus de liens, épinglage...) sont ignorées
+        if not payload.guild_id or "content" not in payload.data:
+            return
+        
+        after_content = payload.data["content"]
+        entry = self.messages.edit(payload.channel_id, payload.message_id, after_content)
+        if entry is not None:
+            author_id, before_content = entry.author_id, entry.content
+        elif payload.cached_message is not None and not payload.cached_message.author.bot:
+            author_id, before_content = payload.cached_message.author.id, payload.cached_message.content
+        else:
+            return
+        
+        if before_content == after_content[:800]:
+            return
+        
+        guild = self.bot.get_guild(payload.guild_id)
+        channel = guild.get_channel_or_thread(payload.channel_id) if guild else None
+        if not channel:
             return
         
         embed = self.create_embed(
             "✏️ Message Modifié",
-            f"**Auteur :** {before.author.mention}\n"
-            f"**Salon :** {before.channel.mention}\n\n"
-            f"**Avant :** ```{before.content[:300]}```\n"
-            f"**Après :** ```{after.content[:300]}```\n"
-            f"[Aller au message]({after.jump_url})",
+            f"**Auteur :** <@{author_id}>\n"
+            f"**Salon :** {channel.mention}\n\n"
+            f"**Avant :** ```{before_content[:300]}```\n"
+            f"**Après :** ```{after_content[:300]}```\n"
+            f"[Aller au message]({channel.get_partial_message(payload.message_id).jump_url})",
             discord.Color.from_rgb(255, 193, 7)
         )
         
-        await self.log(before.guild, "messages", embed)
+        await self.log(guild, "messages", embed, actor=author_id, channel=payload.channel_id)
     
     # ==================== RÔLES ====================
     
@@ -252,7 +406,7 @@ class Logger(commands.Cog):
                 f"**Total rôles :** `{len(after.roles) - 1}`",
                 discord.Color.from_rgb(40, 167, 69)
             )
-            await self.log(after.guild, "roles", embed)
+            await self.log(after.guild, "roles", embed, target=after.id)
         
         if removed:
             roles_list = ", ".join([r.mention for r in removed])
@@ -263,41 +417,37 @@ class Logger(commands.Cog):
                 f"**Total rôles :** `{len(after.roles) - 1}`",
                 discord.Color.from_rgb(220, 53, 69)
             )
-            await self.log(after.guild, "roles", embed)
+            await self.log(after.guild, "roles", embed, target=after.id)
     
     @commands.Cog.listener()
     async def on_guild_role_create(self, role):
-        await asyncio.sleep(1)
         try:
-            async for entry in role.guild.audit_logs(limit=3, action=discord.AuditLogAction.role_create):
-                if entry.target.id == role.id:
-                    embed = self.create_embed(
-                        "🎭 Rôle Créé",
-                        f"**Rôle :** {role.mention}\n"
-                        f"**Nom :** `{role.name}`\n"
-                        f"**Couleur :** `{role.color}`\n"
-                        f"**Créé par :** {entry.user.mention}",
-                        discord.Color.from_rgb(40, 167, 69)
-                    )
-                    await self.log(role.guild, "roles", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(role.guild, discord.AuditLogAction.role_create, role.id)
+            if entry:
+                embed = self.create_embed(
+                    "🎭 Rôle Créé",
+                    f"**Rôle :** {role.mention}\n"
+                    f"**Nom :** `{role.name}`\n"
+                    f"**Couleur :** `{role.color}`\n"
+                    f"**Créé par :** {entry.user.mention}",
+                    discord.Color.from_rgb(40, 167, 69)
+                )
+                await self.log(role.guild, "roles", embed, actor=entry.user.id)
         except:
             pass
     
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role):
-        await asyncio.sleep(1)
         try:
-            async for entry in role.guild.audit_logs(limit=3, action=discord.AuditLogAction.role_delete):
-                if entry.target.id == role.id:
-                    embed = self.create_embed(
-                        "🎭 Rôle Supprimé",
-                        f"**Nom :** `{role.name}`\n"
-                        f"**Supprimé par :** {entry.user.mention}",
-                        discord.Color.from_rgb(220, 53, 69)
-                    )
-                    await self.log(role.guild, "roles", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(role.guild, discord.AuditLogAction.role_delete, role.id)
+            if entry:
+                embed = self.create_embed(
+                    "🎭 Rôle Supprimé",
+                    f"**Nom :** `{role.name}`\n"
+                    f"**Supprimé par :** {entry.user.mention}",
+                    discord.Color.from_rgb(220, 53, 69)
+                )
+                await self.log(role.guild, "roles", embed, actor=entry.user.id)
         except:
             pass
     
@@ -335,7 +485,7 @@ class Logger(commands.Cog):
                 f"**Membres dans le salon :** `{len(after.channel.members)}`",
                 discord.Color.from_rgb(40, 167, 69)
             )
-            await self.log(member.guild, "voice", embed)
+            await self.log(member.guild, "voice", embed, target=member.id, channel=after.channel.id)
         
         # Déconnexion
         elif before.channel and after.channel is None:
@@ -345,7 +495,7 @@ class Logger(commands.Cog):
                 f"**Salon :** {before.channel.mention}",
                 discord.Color.from_rgb(220, 53, 69)
             )
-            await self.log(member.guild, "voice", embed)
+            await self.log(member.guild, "voice", embed, target=member.id, channel=before.channel.id)
         
         # Déplacement
         elif before.channel != after.channel and before.channel and after.channel:
@@ -355,43 +505,40 @@ class Logger(commands.Cog):
                 f"{before.channel.mention} → {after.channel.mention}",
                 discord.Color.from_rgb(0, 123, 255)
             )
-            await self.log(member.guild, "voice", embed)
+            await self.log(member.guild, "voice", embed, target=member.id, channel=after.channel.id)
     
     # ==================== SERVEUR ====================
     
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
-        await asyncio.sleep(1)
         try:
-            async for entry in channel.guild.audit_logs(limit=3, action=discord.AuditLogAction.channel_create):
-                if entry.target.id == channel.id:
-                    embed = self.create_embed(
-                        "➕ Salon Créé",
-                        f"**Nom :** {channel.mention}\n"
-                        f"**Type :** `{channel.type}`\n"
-                        f"**Créé par :** {entry.user.mention}",
-                        discord.Color.from_rgb(40, 167, 69)
-                    )
-                    await self.log(channel.guild, "server", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(channel.guild, discord.AuditLogAction.channel_create, channel.id)
+            if entry:
+                embed = self.create_embed(
+                    "➕ Salon Créé",
+                    f"**Nom :** {channel.mention}\n"
+                    f"**Type :** `{channel.type}`\n"
+                    f"**Créé par :** {entry.user.mention}",
+                    discord.Color.from_rgb(40, 167, 69)
+                )
+                await self.log(channel.guild, "server", embed, actor=entry.user.id, channel=channel.id)
         except:
             pass
     
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
-        await asyncio.sleep(1)
+        self.messages.drop_channel(channel.id)
         try:
-            async for entry in channel.guild.audit_logs(limit=3, action=discord.AuditLogAction.channel_delete):
-                if entry.target.id == channel.id:
-                    embed = self.create_embed(
-                        "➖ Salon Supprimé",
-                        f"**Nom :** `{channel.name}`\n"
-                        f"**Type :** `{channel.type}`\n"
-                        f"**Supprimé par :** {entry.user.mention}",
-                        discord.Color.from_rgb(220, 53, 69)
-                    )
-                    await self.log(channel.guild, "server", embed)
-                    break
+            entry = await get_auditlog(self.bot).find(channel.guild, discord.AuditLogAction.channel_delete, channel.id)
+            if entry:
+                embed = self.create_embed(
+                    "➖ Salon Supprimé",
+                    f"**Nom :** `{channel.name}`\n"
+                    f"**Type :** `{channel.type}`\n"
+                    f"**Supprimé par :** {entry.user.mention}",
+                    discord.Color.from_rgb(220, 53, 69)
+                )
+                await self.log(channel.guild, "server", embed, actor=entry.user.id, channel=channel.id)
         except:
             pass
     
@@ -429,7 +576,7 @@ class Logger(commands.Cog):
                 f"**Boosts totaux :** `{after.guild.premium_subscription_count}`",
                 discord.Color.from_rgb(255, 115, 250)
             )
-            await self.log(after.guild, "boosts", embed)
+            await self.log(after.guild, "boosts", embed, target=after.id)
         
         # Perte de boost
         elif before.premium_since is not None and after.premium_since is None:
@@ -440,65 +587,111 @@ class Logger(commands.Cog):
                 f"**Boosts restants :** `{after.guild.premium_subscription_count}`",
                 discord.Color.from_rgb(108, 117, 125)
             )
-            await self.log(after.guild, "boosts", embed)
+            await self.log(after.guild, "boosts", embed, target=after.id)
     
     # ==================== RÉACTIONS ====================
     
+    def reaction_link(self, payload, channel):
+        # Lien construit à partir des IDs : aucun appel REST
+        return channel.get_partial_message(payload.message_id).jump_url
+    
+    def track_reaction(self, guild, channel, payload, added):
+        """Ajoute une réaction au résumé du message (envoyé après SUMMARY_WINDOW secondes)"""
+        burst = self.reaction_bursts.get(payload.message_id)
+        if burst is None:
+            burst = self.reaction_bursts[payload.message_id] = ReactionBurst(guild, channel, payload.message_id)
+            self._summary_tasks[payload.message_id] = asyncio.create_task(
+                self._summary_later(payload.message_id)
+            )
+        
+        if added:
+            burst.added += 1
+            burst.emojis[str(payload.emoji)] += 1
+            burst.reactors[payload.user_id] += 1
+        else:
+            burst.removed += 1
+    
+    async def _summary_later(self, message_id):
+        try:
+            await asyncio.sleep(SUMMARY_WINDOW)
+        finally:
+            if self._summary_tasks.get(message_id) is asyncio.current_task():
+                del self._summary_tasks[message_id]
+        await self.send_reaction_summary(message_id)
+    
+    async def send_reaction_summary(self, message_id):
+        burst = self.reaction_bursts.pop(message_id, None)
+        if burst is None:
+            return
+        
+        emojis = "\n".join(f"{emoji} × `{count}`" for emoji, count in burst.emojis.most_common(10))
+        reactors = "\n".join(f"<@{user_id}> × `{count}`" for user_id, count in burst.reactors.most_common(5))
+        
+        embed = self.create_embed(
+            "⭐ Résumé des Réactions",
+            f"**Salon :** {burst.channel.mention}\n"
+            f"**Ajoutées :** `{burst.added}` • **Retirées :** `{burst.removed}`\n"
+            f"**Membres :** `{len(burst.reactors)}`\n"
+            f"[Aller au message]({burst.channel.get_partial_message(message_id).jump_url})",
+            discord.Color.from_rgb(255, 193, 7)
+        )
+        if emojis:
+            embed.add_field(name="😀 Emojis", value=emojis, inline=True)
+        if reactors:
+            embed.add_field(name="👥 Top membres", value=reactors, inline=True)
+        await self.log(burst.guild, "reactions", embed, channel=burst.channel.id)
+    
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
         if payload.member and payload.member.bot:
             return
         
         guild = self.bot.get_guild(payload.guild_id)
-        if not guild:
+        if not guild or not self.get_config(guild.id)["reactions"]:
             return
         
-        channel = guild.get_channel(payload.channel_id)
+        channel = guild.get_channel_or_thread(payload.channel_id)
         if not channel:
             return
         
-        try:
-            message = await channel.fetch_message(payload.message_id)
-            member = payload.member
-            
-            embed = self.create_embed(
-                "➕ Réaction Ajoutée",
-                f"**Membre :** {member.mention}\n"
-                f"**Salon :** {channel.mention}\n"
-                f"**Emoji :** {payload.emoji}\n"
-                f"[Aller au message]({message.jump_url})",
-                discord.Color.from_rgb(40, 167, 69)
-            )
-            await self.log(guild, "reactions", embed)
-        except:
-            pass
+        if self.get_option(guild.id, "reactions") == "resume":
+            return self.track_reaction(guild, channel, payload, added=True)
+        
+        member = payload.member
+        embed = self.create_embed(
+            "➕ Réaction Ajoutée",
+            f"**Membre :** {member.mention}\n"
+            f"**Salon :** {channel.mention}\n"
+            f"**Emoji :** {payload.emoji}\n"
+            f"[Aller au message]({self.reaction_link(payload, channel)})",
+            discord.Color.from_rgb(40, 167, 69)
+        )
+        await self.log(guild, "reactions", embed, actor=payload.user_id, channel=channel.id)
     
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
         guild = self.bot.get_guild(payload.guild_id)
-        if not guild:
+        if not guild or not self.get_config(guild.id)["reactions"]:
             return
         
-        channel = guild.get_channel(payload.channel_id)
+        channel = guild.get_channel_or_thread(payload.channel_id)
         member = guild.get_member(payload.user_id)
         
         if not channel or not member or member.bot:
             return
         
-        try:
-            message = await channel.fetch_message(payload.message_id)
-            
-            embed = self.create_embed(
-                "➖ Réaction Retirée",
-                f"**Membre :** {member.mention}\n"
-                f"**Salon :** {channel.mention}\n"
-                f"**Emoji :** {payload.emoji}\n"
-                f"[Aller au message]({message.jump_url})",
-                discord.Color.from_rgb(220, 53, 69)
-            )
-            await self.log(guild, "reactions", embed)
-        except:
-            pass
+        if self.get_option(guild.id, "reactions") == "resume":
+            return self.track_reaction(guild, channel, payload, added=False)
+        
+        embed = self.create_embed(
+            "➖ Réaction Retirée",
+            f"**Membre :** {member.mention}\n"
+            f"**Salon :** {channel.mention}\n"
+            f"**Emoji :** {payload.emoji}\n"
+            f"[Aller au message]({self.reaction_link(payload, channel)})",
+            discord.Color.from_rgb(220, 53, 69)
+        )
+        await self.log(guild, "reactions", embed, actor=payload.user_id, channel=channel.id)
     
     # ==================== INVITATIONS ====================
     
@@ -513,7 +706,7 @@ class Logger(commands.Cog):
             f"**Utilisations max :** `{invite.max_uses or 'Illimité'}`",
             discord.Color.from_rgb(40, 167, 69)
         )
-        await self.log(invite.guild, "invites", embed)
+        await self.log(invite.guild, "invites", embed, actor=getattr(invite.inviter, "id", None), channel=getattr(invite.channel, "id", None))
     
     @commands.Cog.listener()
     async def on_invite_delete(self, invite):
@@ -523,7 +716,7 @@ class Logger(commands.Cog):
             f"**Salon :** {invite.channel.mention if invite.channel else 'Inconnu'}",
             discord.Color.from_rgb(220, 53, 69)
         )
-        await self.log(invite.guild, "invites", embed)
+        await self.log(invite.guild, "invites", embed, channel=getattr(invite.channel, "id", None))
     
     # ==================== COMMANDES ====================
     
@@ -563,7 +756,7 @@ class Logger(commands.Cog):
             "reactions": "⭐・réactions"
         }
         
-        config = self.get_config(ctx.guild.id)
+        config = self.ensure_config(ctx.guild.id)
         created = 0
         updated = 0
         
@@ -586,7 +779,7 @@ class Logger(commands.Cog):
                 except:
                     pass
         
-        self.save_config()
+        await self.save_config(ctx.guild.id)
         
         # Embed de confirmation
         embed = discord.Embed(
@@ -634,6 +827,8 @@ class Logger(commands.Cog):
                 "`logs set <type> <#salon>` • Définir un salon\n"
                 "`logs remove <type>` • Retirer un type\n"
                 "`logs view` • Voir la configuration\n"
+                "`logs reactions <detail|resume>` • Mode des logs de réactions\n"
+                "`logs search [@membre] [type] [7j]` • Rechercher dans l'archive\n"
                 "`logs test` • Tester les logs\n"
                 "`logs clear` • Tout réinitialiser"
             ),
@@ -664,14 +859,13 @@ class Logger(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def logs_set(self, ctx, log_type: str, channel: discord.TextChannel):
         """Configure un type de log"""
-        config = self.get_config(ctx.guild.id)
-        
-        if log_type not in config:
-            types = "`, `".join(config.keys())
+        if log_type not in LOG_TYPES:
+            types = "`, `".join(LOG_TYPES)
             return await ctx.send(f"❌ Type invalide ! Types : `{types}`")
         
+        config = self.ensure_config(ctx.guild.id)
         config[log_type] = channel.id
-        self.save_config()
+        await self.save_config(ctx.guild.id, [log_type])
         
         embed = discord.Embed(
             title="✅ Configuration Enregistrée",
@@ -684,13 +878,13 @@ class Logger(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def logs_remove(self, ctx, log_type: str):
         """Retire un type de log"""
-        config = self.get_config(ctx.guild.id)
-        
-        if log_type not in config:
+        if log_type not in LOG_TYPES:
             return await ctx.send("❌ Type invalide !")
         
-        config[log_type] = None
-        self.save_config()
+        config = self.get_config(ctx.guild.id)
+        if config[log_type]:
+            self.ensure_config(ctx.guild.id)[log_type] = None
+            await self.save_config(ctx.guild.id, [log_type])
         
         embed = discord.Embed(
             title="🗑️ Configuration Supprimée",
@@ -699,6 +893,81 @@ class Logger(commands.Cog):
         )
         await ctx.send(embed=embed)
     
+    @logs.command(name="reactions")
+    @commands.has_permissions(administrator=True)
+    async def logs_reactions(self, ctx, mode: str = None):
+        """Choisit le mode des logs de réactions (detail ou resume)"""
+        current = self.get_option(ctx.guild.id, "reactions", "detail")
+        if mode is None:
+            return await ctx.send(
+                f"⭐ Mode actuel : `{current}`\n"
+                f"`detail` • un log par réaction\n"
+                f"`resume` • un résumé par message toutes les {SUMMARY_WINDOW} secondes"
+            )
+        
+        mode = mode.lower()
+        if mode not in REACTION_MODES:
+            return await ctx.send("❌ Mode invalide ! Modes : `detail`, `resume`")
+        
+        await self.set_option(ctx.guild.id, "reactions", None if mode == "detail" else mode)
+        
+        embed = discord.Embed(
+            title="✅ Configuration Enregistrée",
+            description=f"**Logs de réactions :** `{mode}`",
+            color=discord.Color.from_rgb(40, 167, 69)
+        )
+        await ctx.send(embed=embed)
+    
+    @logs.command(name="search")
+    @commands.has_permissions(administrator=True)
+    async def logs_search(self, ctx, *filters: str):
+        """Recherche dans l'archive des logs (membre, type, période)"""
+        user_id = log_type = since = None
+        for value in filters:
+            value = value.lower()
+            raw_id = value[2:-1].lstrip("!") if value.startswith("<@") and value.endswith(">") else value
+            if raw_id.isdigit():
+                user_id = int(raw_id)
+            elif value in LOG_TYPES:
+                log_type = value
+            elif parse_duration(value) is not None:
+                # Les nombres seuls sont des IDs : la période a toujours une unité
+                try:
+                    since = time.time() - await SEARCH_PERIOD.convert(ctx, value)
+                except commands.BadArgument as e:
+                    return await ctx.send(f"❌ {e}")
+            else:
+                types = "`, `".join(LOG_TYPES)
+                return await ctx.send(f"❌ Filtre invalide : `{value}`\nFiltres : membre, type (`{types}`), période (`30m`, `12h`, `7j`)")
+        
+        start = time.perf_counter()
+        records = await self.archive.search(ctx.guild.id, user_id=user_id, log_type=log_type, since=since, limit=SEARCH_LIMIT)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        embed = discord.Embed(
+            title="🔎 Recherche dans les Logs",
+            color=discord.Color.from_rgb(0, 123, 255)
+        )
+        
+        criteria = []
+        if user_id:
+            criteria.append(f"**Membre :** <@{user_id}>")
+        if log_type:
+            criteria.append(f"**Type :** `{log_type}`")
+        if since:
+            criteria.append(f"**Depuis :** <t:{int(since)}:R>")
+        
+        lines = []
+        for record in records:
+            line = f"<t:{int(record['t'])}:R> `{record['type']}` {record['s']}"
+            lines.append(line if len(line) <= 250 else line[:247] + "...")
+        
+        description = "\n".join(criteria) + ("\n\n" if criteria else "")
+        description += "\n".join(lines) if lines else "*Aucun résultat*"
+        embed.description = description[:4096]
+        embed.set_footer(text=f"{len(records)} résultat(s) • {elapsed_ms:.1f} ms")
+        await ctx.send(embed=embed)
+    
     @logs.command(name="view")
     @commands.has_permissions(administrator=True)
     async def logs_view(self, ctx):
@@ -798,12 +1067,15 @@ class Logger(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def logs_clear(self, ctx):
         """Réinitialise toute la configuration"""
-        config = self.get_config(ctx.guild.id)
-        
-        for key in config:
-            config[key] = None
+        if str(ctx.guild.id) in self.config:
+            config = self.config[str(ctx.guild.id)]
+            for key in config:
+                config[key] = None
+            
+            await self.save_config(ctx.guild.id)
         
-        self.save_config()
+        for option in list(self.options.get(str(ctx.guild.id), {})):
+            await self.set_option(ctx.guild.id, option, None)
         
         embed = discord.Embed(
             title="🗑️ Configuration Réinitialisée",
@@ -0,0 +1,185 @@
+import discord
+from discord.ext import commands
+
+# Les requêtes plus courtes que NGRAM sont des clés de l'index (toutes les sous-chaînes de 1-2 caractères)
+NGRAM = 3
+
+
+def ngrams(text, size=NGRAM):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def short_grams(text):
+    keys = set()
+    for size in range(1, NGRAM):
+        keys |= ngrams(text, size)
+    return keys
+
+
+class GuildIndex:
+    """Index des noms d'un serveur (pseudo et nom affiché, en minuscules).
+
+    - correspondance exacte : dictionnaires nom -> IDs
+    - recherche par sous-chaîne : index de trigrammes (et des sous-chaînes de 1-2 caractères)
+    """
+
+    def __init__(self):
+        self.entries = {}   # member_id -> (pseudo, nom affiché)
+        self.exact = {}     # nom -> {member_id}
+        self.grams = {}     # sous-chaîne de 1 à 3 caractères -> {member_id}
+
+    def _link(self, index, keys, member_id):
+        for key in keys:
+            index.setdefault(key, set()).add(member_id)
+
+    def _unlink(self, index, keys, member_id):
+        for key in keys:
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(member_id)
+                if not ids:
+                    del index[key]
+
+    @staticmethod
+    def _keys(names):
+        keys = set()
+        for name in names:
+            keys |= ngrams(name)
+            keys |= short_grams(name)
+        return keys
+
+    def add(self, member):
+        names = (member.name.lower(), member.display_name.lower())
+        old = self.entries.get(member.id)
+        if old == names:
+            return
+        if old is not None:
+            self.remove(member.id)
+        self.entries[member.id] = names
+        self._link(self.exact, set(names), member.id)
+        self._link(self.grams, self._keys(names), member.id)
+
+    def remove(self, member_id):
+        names = self.entries.pop(member_id, None)
+        if names is None:
+            return
+        self._unlink(self.exact, set(names), member_id)
+        self._unlink(self.grams, self._keys(names), member_id)
+
+    def search(self, query):
+        """IDs des membres dont le pseudo ou le nom affiché contient `query`"""
+        if len(query) < NGRAM:
+            return set(self.grams.get(query, ()))
+
+        candidate_sets = []
+        for gram in ngrams(query):
+            ids = self.grams.get(gram)
+            if not ids:
+                return set()
+            candidate_sets.append(ids)
+        candidate_sets.sort(key=len)
+        candidates = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+
+        # Les trigrammes communs ne garantissent pas la sous-chaîne : vérification finale
+        return {
+            member_id for member_id in candidates
+            if any(query in name for name in self.entries[member_id])
+        }
+
+
+class MemberLookup(commands.Cog):
+    """Résolution de membres par mention, ID ou nom à partir d'index en mémoire"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.indexes = {}  # guild_id -> GuildIndex (construit à la première recherche)
+
+    def get_index(self, guild):
+        index = self.indexes.get(guild.id)
+        if index is None:
+            index = self.indexes[guild.id] = GuildIndex()
+            for member in guild.members:
+                index.add(member)
+        return index
+
+    # ==================== RÉSOLUTION ====================
+
+    async def resolve(self, guild, query):
+        """Trouve un membre : cache d'abord, appel REST / gateway seulement en cas d'échec"""
+        query = query.strip()
+
+        # Par mention ou par ID
+        raw_id = query[2:-1].lstrip("!") if query.startswith("<@") and query.endswith(">") else query
+        if raw_id.isdigit():
+            member_id = int(raw_id)
+            member = guild.get_member(member_id)
+            if member is not None:
+                return member
+            try:
+                return await guild.fetch_member(member_id)
+            except discord.HTTPException:
+                return None
+
+        # Par pseudo ou nom (insensible à la casse)
+        member = self.find_cached(guild, query)
+        if member is None and not guild.chunked:
+            # Cache incomplet : recherche côté Discord (par préfixe)
+            try:
+                found = await guild.query_members(query=query, limit=1)
+            except (discord.HTTPException, discord.ClientException, TimeoutError):
+                found = []
+            member = found[0] if found else None
+        return member
+
+    def find_cached(self, guild, query):
+        """Correspondance exacte en priorité, puis par sous-chaîne (nom le plus court)"""
+        query = query.lower()
+        if not query:
+            return None
+        index = self.get_index(guild)
+
+        ids = index.exact.get(query) or index.search(query)
+        members = [guild.get_member(member_id) for member_id in ids]
+        members = [member for member in members if member is not None]
+        if not members:
+            return None
+        return min(members, key=lambda m: (len(m.display_name), m.id))
+
+    # ==================== MAINTENANCE DE L'INDEX ====================
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        index = self.indexes.get(member.guild.id)
+        if index is not None:
+            index.add(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.nick != after.nick:
+            await self.on_member_join(after)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        index = self.indexes.get(member.guild.id)
+        if index is not None:
+            index.remove(member.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        # Pseudo ou nom global changé : à répercuter dans chaque serveur indexé
+        if before.name == after.name and before.global_name == after.global_name:
+            return
+        for guild_id, index in self.indexes.items():
+            if after.id in index.entries:
+                guild = self.bot.get_guild(guild_id)
+                member = guild.get_member(after.id) if guild else None
+                if member is not None:
+                    index.add(member)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.indexes.pop(guild.id, None)
+
+
+async def setup(bot):
+    await bot.add_cog(MemberLookup(bot))
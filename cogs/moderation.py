@@ -1,42 +1,161 @@
 import discord
 from discord.ext import commands
 from datetime import timedelta
+import re
+
+from core.auditlog import get_auditlog
+from core.banindex import get_ban_index
+from core.converters import Duration
+from core.errors import PermissionsUnavailable
+from core.massban import MAX_TARGETS, MassBan
+from core.purge import MAX_SCAN, PurgeJob, run_with_status
+from core.storage import get_storage
+
+MAX_TIMEOUT = 28 * 86400
+WARNS_PER_PAGE = 10
+BANS_PER_PAGE = 15
+WARN_ACTIONS = {"timeout": "⏳ timeout", "kick": "👢 expulsion", "ban": "🔨 bannissement"}
+
+class MassbanFlags(commands.FlagConverter):
+    ids: str = None
+    joined: Duration = None
+    match: str = None
+    days: int = 0
+    reason: str = "Raid"
+
+class MassbanConfirmView(discord.ui.View):
+    def __init__(self, author):
+        super().__init__(timeout=60)
+        self.author = author
+        self.confirmed = None
+    
+    async def interaction_check(self, interaction: discord.Interaction):
+        return interaction.user.id == self.author.id
+    
+    @discord.ui.button(label="Confirmer", style=discord.ButtonStyle.danger, emoji="🔨")
+    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.confirmed = True
+        await interaction.response.edit_message(view=None)
+        self.stop()
+    
+    @discord.ui.button(label="Annuler", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.confirmed = False
+        await interaction.response.edit_message(content="❌ Ban en masse annulé.", embed=None, view=None)
+        self.stop()
+
+class WarningsView(discord.ui.View):
+    """Pages de `warns` : chaque page est lue à partir de l'ID du dernier avertissement affiché"""
+    
+    def __init__(self, cog, author, guild_id, user_id, label, total, page):
+        super().__init__(timeout=120)
+        self.cog = cog
+        self.author = author
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.label = label
+        self.total = total
+        self.page = page
+        self.cursors = [None]  # `before_id` des pages déjà affichées
+        self.update_buttons()
+    
+    def update_buttons(self):
+        self.previous_page.disabled = len(self.cursors) == 1
+        self.next_page.disabled = len(self.cursors) * WARNS_PER_PAGE >= self.total or len(self.page) < WARNS_PER_PAGE
+    
+    def build_embed(self):
+        return self.cog.build_warnings_embed(self.label, self.page, len(self.cursors), self.total)
+    
+    async def interaction_check(self, interaction: discord.Interaction):
+        return interaction.user.id == self.author.id
+    
+    async def show(self, interaction):
+        self.page = await self.cog.storage.load_warnings(
+            self.guild_id, self.user_id, before_id=self.cursors[-1], limit=WARNS_PER_PAGE
+        )
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+    
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.pop()
+        await self.show(interaction)
+    
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.append(self.page[-1]["id"])
+        await self.show(interaction)
+
+class BanListView(discord.ui.View):
+    """Pages de `banlist`, parcourues sur une copie de l'index (aucun appel REST)"""
+    
+    def __init__(self, author, entries, search=None):
+        super().__init__(timeout=180)
+        self.author = author
+        self.entries = entries
+        self.search = search
+        self.page = 0
+        self.pages = (len(entries) + BANS_PER_PAGE - 1) // BANS_PER_PAGE
+        self.update_buttons()
+    
+    def update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.pages - 1
+    
+    def build_embed(self):
+        start = self.page * BANS_PER_PAGE
+        lines = [
+            f"**{name}** (`{user_id}`)\n└ *{(reason or 'Aucune raison')[:100]}*"
+            for user_id, name, reason in self.entries[start:start + BANS_PER_PAGE]
+        ]
+        title = f"🔨 Liste des bannis ({len(self.entries)})"
+        if self.search:
+            title = f"🔎 Bannis correspondant à « {self.search[:50]} » ({len(self.entries)})"
+        embed = discord.Embed(title=title, description="\n\n".join(lines), color=discord.Color.red())
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages}")
+        return embed
+    
+    async def interaction_check(self, interaction: discord.Interaction):
+        return interaction.user.id == self.author.id
+    
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+    
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.storage = None
+        self.warn_thresholds = {}  # guild_id -> {nombre d'avertissements: (action, durée)}
+    
+    async def cog_load(self):
+        self.storage = await get_storage(self.bot)
+        self.warn_thresholds = await self.storage.load_warning_thresholds()
     
     def get_perms_cog(self):
         """Récupère le cog de permissions"""
         return self.bot.get_cog("PermissionsSystem")
     
+    async def cog_check(self, ctx):
+        """Le niveau (ctx.user_level) est calculé par le check global de PermissionsSystem"""
+        if self.get_perms_cog() is None:
+            raise PermissionsUnavailable()
+        return True
+    
     async def find_member(self, ctx, user_input: str):
-        """Trouve un membre par mention, ID, pseudo ou nom"""
-        # Par mention
-        if user_input.startswith('<@') and user_input.endswith('>'):
-            user_id = user_input.strip('<@!>')
-            try:
-                return await ctx.guild.fetch_member(int(user_id))
-            except:
-                return None
-        
-        # Par ID
-        if user_input.isdigit():
-            try:
-                return await ctx.guild.fetch_member(int(user_input))
-            except:
-                return None
-        
-        # Par pseudo ou nom (insensible à la casse)
-        user_input_lower = user_input.lower()
-        for member in ctx.guild.members:
-            if (member.name.lower() == user_input_lower or 
-                member.display_name.lower() == user_input_lower or
-                user_input_lower in member.name.lower() or
-                user_input_lower in member.display_name.lower()):
-                return member
-        
-        return None
+        """Trouve un membre par mention, ID, pseudo ou nom (index de MemberLookup)"""
+        lookup = self.bot.get_cog("MemberLookup")
+        if lookup:
+            return await lookup.resolve(ctx.guild, user_input)
+        return ctx.guild.get_member_named(user_input)
     
     # ==================== BAN/UNBAN (GS - Niveau 3) ====================
     
@@ -44,11 +163,6 @@ class Moderation(commands.Cog):
     async def ban_member(self, ctx, user: str, *, reason: str = "Aucune raison fournie"):
         """Ban un membre - Nécessite niveau GS (3)"""
         perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
         
         # Trouve le membre
         member = await self.find_member(ctx, user)
@@ -56,7 +170,7 @@ class Moderation(commands.Cog):
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
         
         # Vérifie la hiérarchie
-        can_moderate, error_msg = perms_cog.can_moderate_target(ctx.author, member)
+        can_moderate, error_msg = perms_cog.can_moderate_target(ctx.author, member, mod_level=ctx.user_level)
         if not can_moderate:
             return await ctx.send(f"❌ {error_msg}")
         
@@ -80,13 +194,6 @@ class Moderation(commands.Cog):
     @commands.command(name="unban", aliases=["ub"])
     async def unban_member(self, ctx, user_id: str, *, reason: str = "Aucune raison"):
         """Unban un membre - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         try:
             user_id_int = int(user_id.strip('<@!>'))
             user = await self.bot.fetch_user(user_id_int)
@@ -112,42 +219,178 @@ class Moderation(commands.Cog):
             await ctx.send(f"❌ Erreur : {e}")
     
     @commands.command(name="banlist", aliases=["bans"])
-    async def ban_list(self, ctx):
-        """Liste des membres bannis - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
+    async def ban_list(self, ctx, *, search: str = None):
+        """Liste des membres bannis, recherche par ID ou nom - Nécessite niveau GS (3)"""
+        try:
+            bans = await get_ban_index(self.bot).get(ctx.guild)
+        except discord.Forbidden:
+            return await ctx.send("❌ Le bot n'a pas la permission de voir les bannis.")
+        except Exception as e:
+            return await ctx.send(f"❌ Erreur : {e}")
         
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
+        entries = bans.snapshot(search)
+        if not entries:
+            if search:
+                return await ctx.send(f"❌ Aucun banni ne correspond à `{search}`.")
+            return await ctx.send("✅ Aucun membre banni.")
         
+        view = BanListView(ctx.author, entries, search)
+        await ctx.send(embed=view.build_embed(), view=view if len(entries) > BANS_PER_PAGE else None)
+    
+    # ==================== INDEX DES BANS ====================
+    
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild, user):
+        index = get_ban_index(self.bot)
+        if guild.id not in index.guilds:
+            return  # serveur pas encore indexé
+        index.add(guild.id, user)
+        
+        # Raison lue dans le journal d'audit (recherche partagée avec les logs)
         try:
-            bans = [entry async for entry in ctx.guild.bans(limit=100)]
-            
-            if not bans:
-                return await ctx.send("✅ Aucun membre banni.")
-            
-            embed = discord.Embed(
-                title=f"🔨 Liste des bannis ({len(bans)})",
-                color=discord.Color.red()
-            )
-            
-            ban_list = []
-            for ban_entry in bans[:20]:  # Limite à 20 pour éviter le spam
-                user = ban_entry.user
-                reason = ban_entry.reason or "Aucune raison"
-                ban_list.append(f"**{user}** (`{user.id}`)\n└ *{reason}*")
-            
-            embed.description = "\n\n".join(ban_list)
-            if len(bans) > 20:
-                embed.set_footer(text=f"Affichage limité à 20/{len(bans)} bannis")
-            
-            await ctx.send(embed=embed)
-            
+            entry = await get_auditlog(self.bot).find(guild, discord.AuditLogAction.ban, user.id)
+        except Exception:
+            return
+        if entry and entry.reason:
+            index.set_reason(guild.id, user.id, entry.reason)
+    
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        get_ban_index(self.bot).remove(guild.id, user.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        get_ban_index(self.bot).drop(guild.id)
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Nouvelle session (pas une reprise) : les bans / unbans manqués imposent un rechargement
+        get_ban_index(self.bot).clear()
+    
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild):
+        # Serveur de retour après une panne : son index peut être périmé
+        get_ban_index(self.bot).drop(guild.id)
+    
+    @commands.command(name="massban")
+    async def mass_ban(self, ctx, *, flags: MassbanFlags):
+        """Ban en masse (raid) - Nécessite niveau GS (3)
+        Exemples: !massban ids: 123 456 789 reason: Raid
+                  !massban joined: 10m match: ^spam days: 1"""
+        if not ctx.guild.me.guild_permissions.ban_members:
+            return await ctx.send("❌ Le bot n'a pas la permission de bannir.")
+        if not (flags.ids or flags.joined or flags.match):
+            return await ctx.send("❌ Précisez au moins un critère : `ids:`, `joined:` ou `match:`.")
+        if not 0 <= flags.days <= 7:
+            return await ctx.send("❌ `days:` doit être entre 0 et 7.")
+        
+        try:
+            pattern = re.compile(flags.match, re.IGNORECASE) if flags.match else None
+        except re.error as e:
+            return await ctx.send(f"❌ Expression régulière invalide : {e}")
+        
+        targets, skipped = self.resolve_massban_targets(ctx, flags, pattern)
+        if not targets:
+            return await ctx.send(f"❌ Aucune cible à bannir ({skipped} ignorée(s) : hiérarchie ou protection).")
+        if len(targets) > MAX_TARGETS:
+            return await ctx.send(f"❌ Trop de cibles ({len(targets)}), maximum {MAX_TARGETS}.")
+        
+        # Confirmation avant l'action
+        preview = []
+        for user_id in targets[:10]:
+            member = ctx.guild.get_member(user_id)
+            preview.append(f"• {member} (`{user_id}`)" if member else f"• `{user_id}`")
+        if len(targets) > 10:
+            preview.append(f"... et {len(targets) - 10} autre(s)")
+        
+        embed = discord.Embed(
+            title=f"🔨 Bannir {len(targets)} utilisateur(s) ?",
+            description="\n".join(preview),
+            color=discord.Color.orange()
+        )
+        embed.add_field(name="Raison", value=flags.reason, inline=False)
+        if skipped:
+            embed.set_footer(text=f"{skipped} cible(s) ignorée(s) (hiérarchie ou protection)")
+        
+        view = MassbanConfirmView(ctx.author)
+        msg = await ctx.send(embed=embed, view=view)
+        await view.wait()
+        if not view.confirmed:
+            if view.confirmed is None:
+                await msg.edit(content="⌛ Ban en masse expiré.", embed=None, view=None)
+            return
+        
+        # Un seul log résumé remplace les logs de ban et de départ de chaque cible
+        logger = self.bot.get_cog("Logger")
+        if logger:
+            logger.suppress(ctx.guild.id, targets)
+        
+        async def progress(job):
+            await msg.edit(content=f"⏳ Ban en cours... `{len(job.banned)}/{len(job.user_ids)}`", embed=None)
+        
+        job = MassBan(ctx.guild, targets, reason=f"[{ctx.author}] {flags.reason}", delete_message_seconds=flags.days * 86400)
+        try:
+            await job.run(progress)
         except discord.Forbidden:
-            await ctx.send("❌ Le bot n'a pas la permission de voir les bannis.")
-        except Exception as e:
-            await ctx.send(f"❌ Erreur : {e}")
+            return await msg.edit(content="❌ Le bot n'a pas la permission de bannir.", embed=None)
+        
+        embed = discord.Embed(
+            title="🔨 Ban en masse",
+            description=f"**{len(job.banned)}** utilisateur(s) banni(s)" + (f", **{len(job.failed)}** échec(s)" if job.failed else ""),
+            color=discord.Color.red()
+        )
+        embed.add_field(name="Raison", value=flags.reason, inline=False)
+        embed.add_field(name="Modérateur", value=ctx.author.mention, inline=False)
+        await msg.edit(content=None, embed=embed)
+        
+        if logger:
+            ids = " ".join(str(user_id) for user_id in job.banned)
+            failed = f" • **Échecs :** `{len(job.failed)}`" if job.failed else ""
+            log_embed = logger.create_embed(
+                "🔨 Ban en Masse",
+                f"**Modérateur :** {ctx.author.mention}\n"
+                f"**Bannis :** `{len(job.banned)}`{failed}\n"
+                f"**Raison :** ```{flags.reason}```\n"
+                f"**IDs :** ```{ids[:900] or 'Aucun'}```",
+                discord.Color.from_rgb(220, 53, 69)
+            )
+            await logger.log(ctx.guild, "moderation", log_embed, actor=ctx.author.id, channel=ctx.channel.id)
+    
+    def resolve_massban_targets(self, ctx, flags, pattern):
+        """IDs à bannir d'après les critères (cache des membres), et nombre de cibles écartées"""
+        perms_cog = self.get_perms_cog()
+        
+        if flags.ids:
+            candidates = list(dict.fromkeys(int(user_id) for user_id in re.findall(r"\d{15,20}", flags.ids)))
+        else:
+            candidates = [member.id for member in ctx.guild.members]
+        
+        since = discord.utils.utcnow() - timedelta(seconds=flags.joined) if flags.joined else None
+        protected = {ctx.guild.me.id, ctx.author.id, ctx.guild.owner_id}
+        
+        targets, skipped = [], 0
+        for user_id in candidates:
+            member = ctx.guild.get_member(user_id)
+            if member is None:
+                # Utilisateur hors du serveur : banni par ID seulement sans filtre de membre
+                if since is None and pattern is None:
+                    targets.append(user_id)
+                continue
+            if since is not None and (member.joined_at is None or member.joined_at < since):
+                continue
+            if pattern is not None and not any(
+                name and pattern.search(name) for name in (member.name, member.global_name, member.nick)
+            ):
+                continue
+            if user_id in protected or member.top_role >= ctx.guild.me.top_role:
+                skipped += 1
+                continue
+            can_moderate, _ = perms_cog.can_moderate_target(ctx.author, member, mod_level=ctx.user_level)
+            if not can_moderate:
+                skipped += 1
+                continue
+            targets.append(user_id)
+        return targets, skipped
     
     # ==================== KICK (Modérateur - Niveau 2) ====================
     
@@ -155,17 +398,12 @@ class Moderation(commands.Cog):
     async def kick_member(self, ctx, user: str, *, reason: str = "Aucune raison fournie"):
         """Kick un membre - Nécessite niveau Modérateur (2)"""
         perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 2:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Modérateur** ou supérieur.")
         
         member = await self.find_member(ctx, user)
         if not member:
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
         
-        can_moderate, error_msg = perms_cog.can_moderate_target(ctx.author, member)
+        can_moderate, error_msg = perms_cog.can_moderate_target(ctx.author, member, mod_level=ctx.user_level)
         if not can_moderate:
             return await ctx.send(f"❌ {error_msg}")
         
@@ -192,17 +430,12 @@ class Moderation(commands.Cog):
     async def mute_member(self, ctx, user: str, duration: int = 10, *, reason: str = "Aucune raison"):
         """Mute un membre - Nécessite niveau Modérateur (2)"""
         perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 2:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Modérateur** ou supérieur.")
         
         member = await self.find_member(ctx, user)
         if not member:
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
         
-        can_moderate, error_msg = perms_cog.can_moderate_target(ctx.author, member)
+        can_moderate, error_msg = perms_cog.can_moderate_target(ctx.author, member, mod_level=ctx.user_level)
         if not can_moderate:
             return await ctx.send(f"❌ {error_msg}")
         
@@ -229,13 +462,6 @@ class Moderation(commands.Cog):
     @commands.command(name="unmute", aliases=["um"])
     async def unmute_member(self, ctx, user: str):
         """Unmute un membre - Nécessite niveau Modérateur (2)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 2:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Modérateur** ou supérieur.")
-        
         member = await self.find_member(ctx, user)
         if not member:
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
@@ -270,20 +496,12 @@ class Moderation(commands.Cog):
     @commands.command(name="clear", aliases=["purge", "clean"])
     async def clear_messages(self, ctx, amount: int):
         """Supprime des messages - Nécessite niveau Modérateur (2)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 2:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Modérateur** ou supérieur.")
-        
-        if amount < 1 or amount > 100:
-            return await ctx.send("❌ Vous devez spécifier un nombre entre 1 et 100.")
+        if amount < 1 or amount > MAX_SCAN:
+            return await ctx.send(f"❌ Vous devez spécifier un nombre entre 1 et {MAX_SCAN}.")
         
         try:
-            deleted = await ctx.channel.purge(limit=amount + 1)
-            msg = await ctx.send(f"✅ {len(deleted) - 1} message(s) supprimé(s).")
-            await msg.delete(delay=5)
+            job = PurgeJob(ctx.channel, amount, reason=f"Clear par {ctx.author}")
+            await run_with_status(ctx, job)
             
         except discord.Forbidden:
             await ctx.send("❌ Le bot n'a pas la permission de supprimer des messages.")
@@ -295,13 +513,6 @@ class Moderation(commands.Cog):
     @commands.command(name="lock", aliases=["lockdown"])
     async def lock_channel(self, ctx, channel: discord.TextChannel = None):
         """Verrouille un salon - Nécessite niveau Modérateur (2)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 2:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Modérateur** ou supérieur.")
-        
         channel = channel or ctx.channel
         
         try:
@@ -326,13 +537,6 @@ class Moderation(commands.Cog):
     @commands.command(name="unlock")
     async def unlock_channel(self, ctx, channel: discord.TextChannel = None):
         """Déverrouille un salon - Nécessite niveau Modérateur (2)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 2:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Modérateur** ou supérieur.")
-        
         channel = channel or ctx.channel
         
         try:
@@ -357,13 +561,6 @@ class Moderation(commands.Cog):
     @commands.command(name="slowmode", aliases=["slow"])
     async def set_slowmode(self, ctx, seconds: int, channel: discord.TextChannel = None):
         """Définit le slowmode - Nécessite niveau Modérateur (2)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 2:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Modérateur** ou supérieur.")
-        
         channel = channel or ctx.channel
         
         if seconds < 0 or seconds > 21600:
@@ -396,13 +593,6 @@ class Moderation(commands.Cog):
     @commands.command(name="addrole")
     async def add_role(self, ctx, user: str, role: discord.Role):
         """Ajoute un rôle - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         member = await self.find_member(ctx, user)
         if not member:
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
@@ -428,13 +618,6 @@ class Moderation(commands.Cog):
     @commands.command(name="removerole")
     async def remove_role(self, ctx, user: str, role: discord.Role):
         """Retire un rôle - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         member = await self.find_member(ctx, user)
         if not member:
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
@@ -460,13 +643,6 @@ class Moderation(commands.Cog):
     @commands.command(name="nick")
     async def change_nickname(self, ctx, user: str, *, nickname: str = None):
         """Change le pseudo - Nécessite niveau GS (3)"""
-        perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 3:
-            return await ctx.send("❌ Cette commande nécessite le niveau **GS (Gestion)** ou supérieur.")
-        
         member = await self.find_member(ctx, user)
         if not member:
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
@@ -495,20 +671,17 @@ class Moderation(commands.Cog):
     async def warn_member(self, ctx, user: str, *, reason: str = "Aucune raison"):
         """Avertit un membre - Nécessite niveau Support (1)"""
         perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 1:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Support** ou supérieur.")
         
         member = await self.find_member(ctx, user)
         if not member:
             return await ctx.send(f"❌ Membre `{user}` introuvable.")
         
-        can_moderate, error_msg = perms_cog.can_moderate_target(ctx.author, member)
+        can_moderate, error_msg = perms_cog.can_moderate_target(ctx.author, member, mod_level=ctx.user_level)
         if not can_moderate:
             return await ctx.send(f"❌ {error_msg}")
         
+        warn_id, count = await self.storage.add_warning(ctx.guild.id, member.id, ctx.author.id, reason)
+        
         embed = discord.Embed(
             title="⚠️ Avertissement",
             description=f"{member.mention} a reçu un avertissement.",
@@ -516,6 +689,7 @@ class Moderation(commands.Cog):
         )
         embed.add_field(name="Raison", value=reason, inline=False)
         embed.add_field(name="Modérateur", value=ctx.author.mention, inline=False)
+        embed.set_footer(text=f"Avertissement #{warn_id} • {count} actif(s)")
         await ctx.send(embed=embed)
         
         # Envoie un DM
@@ -530,6 +704,132 @@ class Moderation(commands.Cog):
             await member.send(embed=dm_embed)
         except:
             await ctx.send("⚠️ Impossible d'envoyer un message privé au membre.")
+        
+        await self.apply_warning_threshold(ctx, member, count)
+    
+    async def apply_warning_threshold(self, ctx, member, count):
+        """Sanction automatique si le nombre d'avertissements actifs atteint un palier"""
+        threshold = self.warn_thresholds.get(str(ctx.guild.id), {}).get(count)
+        if threshold is None:
+            return
+        
+        action, duration = threshold
+        reason = f"[Auto] {count} avertissement(s)"
+        try:
+            if action == "timeout":
+                await member.timeout(timedelta(seconds=duration), reason=reason)
+            elif action == "kick":
+                await member.kick(reason=reason)
+            elif action == "ban":
+                await member.ban(reason=reason)
+            await ctx.send(f"🚨 Palier de **{count}** avertissement(s) atteint : {WARN_ACTIONS[action]} pour {member.mention}.")
+        except discord.HTTPException:
+            await ctx.send(f"⚠️ Palier de **{count}** avertissement(s) atteint, mais la sanction automatique a échoué (permissions ou hiérarchie).")
+    
+    async def resolve_user_id(self, ctx, user):
+        """ID et libellé d'un membre, ou d'un ancien membre donné par ID / mention"""
+        member = await self.find_member(ctx, user)
+        if member:
+            return member.id, str(member)
+        user_id = user.strip("<@!>")
+        if user_id.isdigit():
+            return int(user_id), f"<@{user_id}>"
+        return None, None
+    
+    @commands.command(name="warns", aliases=["warnings"])
+    async def warns_list(self, ctx, user: str = None):
+        """Avertissements actifs d'un membre - Nécessite niveau Support (1)"""
+        if user:
+            user_id, label = await self.resolve_user_id(ctx, user)
+            if user_id is None:
+                return await ctx.send(f"❌ Membre `{user}` introuvable.")
+        else:
+            user_id, label = ctx.author.id, str(ctx.author)
+        
+        total = await self.storage.warning_count(ctx.guild.id, user_id)
+        if not total:
+            return await ctx.send(f"✅ Aucun avertissement actif pour **{label}**.")
+        
+        page = await self.storage.load_warnings(ctx.guild.id, user_id, limit=WARNS_PER_PAGE)
+        view = WarningsView(self, ctx.author, ctx.guild.id, user_id, label, total, page)
+        await ctx.send(embed=view.build_embed(), view=view if total > WARNS_PER_PAGE else None)
+    
+    def build_warnings_embed(self, label, warnings, page, total):
+        embed = discord.Embed(
+            title=f"⚠️ Avertissements de {label} ({total})",
+            color=discord.Color.gold()
+        )
+        for warning in warnings:
+            embed.add_field(
+                name=f"#{warning['id']}",
+                value=f"{warning['reason'][:200]}\n└ par <@{warning['moderator_id']}> <t:{int(warning['created_at'])}:R>",
+                inline=False
+            )
+        pages = (total + WARNS_PER_PAGE - 1) // WARNS_PER_PAGE
+        embed.set_footer(text=f"Page {page}/{pages}")
+        return embed
+    
+    @commands.command(name="removewarn", aliases=["delwarn"])
+    async def remove_warn(self, ctx, warn_id: int):
+        """Révoque un avertissement par son numéro - Nécessite niveau GS (3)"""
+        user_id = await self.storage.revoke_warning(ctx.guild.id, warn_id, ctx.author.id)
+        if user_id is None:
+            return await ctx.send(f"❌ Avertissement `#{warn_id}` introuvable ou déjà révoqué.")
+        await ctx.send(f"✅ Avertissement `#{warn_id}` de <@{user_id}> révoqué.")
+    
+    @commands.command(name="clearwarns")
+    async def clear_warns(self, ctx, user: str):
+        """Révoque tous les avertissements d'un membre - Nécessite niveau GS (3)"""
+        user_id, label = await self.resolve_user_id(ctx, user)
+        if user_id is None:
+            return await ctx.send(f"❌ Membre `{user}` introuvable.")
+        
+        revoked = await self.storage.clear_warnings(ctx.guild.id, user_id, ctx.author.id)
+        if not revoked:
+            return await ctx.send(f"✅ Aucun avertissement actif pour **{label}**.")
+        await ctx.send(f"✅ {revoked} avertissement(s) de **{label}** révoqué(s).")
+    
+    @commands.command(name="warnconfig")
+    async def warn_config(self, ctx, count: int = None, action: str = None, duration: Duration(maximum=MAX_TIMEOUT) = None):
+        """Paliers de sanction automatique - Nécessite niveau GS (3)
+        Exemples: !warnconfig 3 timeout 1h
+                  !warnconfig 5 kick
+                  !warnconfig 7 ban
+                  !warnconfig 3 off"""
+        guild_id = str(ctx.guild.id)
+        thresholds = self.warn_thresholds.get(guild_id, {})
+        
+        if count is None:
+            if not thresholds:
+                return await ctx.send("ℹ️ Aucun palier configuré. Exemple : `warnconfig 3 timeout 1h`")
+            lines = []
+            for value in sorted(thresholds):
+                name, seconds = thresholds[value]
+                lines.append(f"**{value}** avertissement(s) → {WARN_ACTIONS[name]}" + (f" ({seconds // 60} min)" if seconds else ""))
+            embed = discord.Embed(title="🚨 Paliers de sanction", description="\n".join(lines), color=discord.Color.gold())
+            return await ctx.send(embed=embed)
+        
+        if count < 1 or action is None:
+            return await ctx.send("❌ Usage : `warnconfig <nombre> <timeout|kick|ban|off> [durée]`")
+        
+        action = action.lower()
+        if action in ["off", "none", "aucun"]:
+            thresholds.pop(count, None)
+            if not thresholds:
+                self.warn_thresholds.pop(guild_id, None)
+            await self.storage.set_warning_threshold(guild_id, count, None)
+            return await ctx.send(f"✅ Palier de **{count}** avertissement(s) supprimé.")
+        
+        if action not in WARN_ACTIONS:
+            return await ctx.send("❌ Action invalide. Utilisez `timeout`, `kick`, `ban` ou `off`.")
+        if action == "timeout":
+            duration = duration or 3600
+        else:
+            duration = None
+        
+        self.warn_thresholds.setdefault(guild_id, {})[count] = (action, duration)
+        await self.storage.set_warning_threshold(guild_id, count, action, duration)
+        await ctx.send(f"✅ À **{count}** avertissement(s) : {WARN_ACTIONS[action]}" + (f" ({duration // 60} min)." if duration else "."))
     
     # ==================== MEMBERINFO (Support - Niveau 1) ====================
     
@@ -537,11 +837,6 @@ class Moderation(commands.Cog):
     async def member_info(self, ctx, user: str = None):
         """Affiche les infos d'un membre - Nécessite niveau Support (1)"""
         perms_cog = self.get_perms_cog()
-        if not perms_cog:
-            return await ctx.send("❌ Système de permissions non chargé.")
-        
-        if perms_cog.get_user_level(ctx.author) < 1:
-            return await ctx.send("❌ Cette commande nécessite le niveau **Support** ou supérieur.")
         
         if user:
             member = await self.find_member(ctx, user)
@@ -4,6 +4,10 @@ from datetime import datetime
 import aiohttp
 import asyncio
 
+from core.errors import PermissionsUnavailable
+from core.logqueue import get_logqueue
+from core.stats import get_stats
+
 class Owner(commands.Cog):
     """Commandes avancées pour les Owner Bot (niveau 5)"""
     
@@ -18,6 +22,12 @@ class Owner(commands.Cog):
         """Récupère le cog de permissions"""
         return self.bot.get_cog("PermissionsSystem")
     
+    async def cog_check(self, ctx):
+        """Le niveau (ctx.user_level) est calculé par le check global de PermissionsSystem"""
+        if self.get_perms_cog() is None:
+            raise PermissionsUnavailable()
+        return True
+    
     async def log_owner_action(self, ctx, action: str, details: dict = None, color: discord.Color = discord.Color.blue()):
         """Envoie un log dans le serveur support"""
         try:
@@ -59,7 +69,7 @@ class Owner(commands.Cog):
             embed.set_footer(text=f"User ID: {ctx.author.id}")
             embed.set_thumbnail(url=ctx.author.display_avatar.url)
             
-            await log_channel.send(embed=embed)
+            get_logqueue(self.bot).enqueue(log_channel, embed)
             
         except Exception as e:
             print(f"❌ Erreur lors du log: {e}")
@@ -73,10 +83,6 @@ class Owner(commands.Cog):
         """Change le statut du bot - Owner Bot (5)
         Types: playing, watching, listening, streaming, competing"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         activity_type = activity_type.lower()
         
         try:
@@ -111,10 +117,6 @@ class Owner(commands.Cog):
         """Change le type de statut - Owner Bot (5)
         Types: online, idle, dnd, invisible"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         status_map = {
             "online": discord.Status.online,
             "idle": discord.Status.idle,
@@ -140,10 +142,6 @@ class Owner(commands.Cog):
     async def set_bot_name(self, ctx, *, name: str):
         """Change le nom du bot - Owner Bot (5)"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         try:
             old_name = self.bot.user.name
             await self.bot.user.edit(username=name)
@@ -163,10 +161,6 @@ class Owner(commands.Cog):
     async def set_bot_avatar(self, ctx, url: str = None):
         """Change l'avatar du bot - Owner Bot (5)"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         if ctx.message.attachments:
             url = ctx.message.attachments[0].url
         elif not url:
@@ -195,10 +189,6 @@ class Owner(commands.Cog):
     async def blacklist_server(self, ctx, guild_id: int, *, reason: str = "Aucune raison"):
         """Blacklist un serveur - Owner Bot (5)"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         guild = self.bot.get_guild(guild_id)
         if not guild:
             return await ctx.send(f"❌ Serveur `{guild_id}` introuvable.")
@@ -231,10 +221,6 @@ class Owner(commands.Cog):
     async def unblacklist_server(self, ctx, guild_id: int):
         """Retire un serveur de la blacklist - Owner Bot (5)"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         if not hasattr(self.bot, 'blacklisted_servers'):
             self.bot.blacklisted_servers = []
         
@@ -249,10 +235,6 @@ class Owner(commands.Cog):
     async def blacklist_user(self, ctx, user_id: int, *, reason: str = "Aucune raison"):
         """Blacklist un utilisateur - Owner Bot (5)"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         if not hasattr(self.bot, 'blacklisted_users'):
             self.bot.blacklisted_users = []
         
@@ -278,10 +260,6 @@ class Owner(commands.Cog):
     async def unblacklist_user(self, ctx, user_id: int):
         """Retire un utilisateur de la blacklist - Owner Bot (5)"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         if not hasattr(self.bot, 'blacklisted_users'):
             self.bot.blacklisted_users = []
         
@@ -301,10 +279,6 @@ class Owner(commands.Cog):
     async def show_blacklist(self, ctx):
         """Affiche les blacklists - Owner Bot (5)"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
         if not hasattr(self.bot, 'blacklisted_servers'):
             self.bot.blacklisted_servers = []
         if not hasattr(self.bot, 'blacklisted_users'):
@@ -342,18 +316,15 @@ class Owner(commands.Cog):
     async def owner_info(self, ctx):
         """Stats complètes du bot - Owner Bot (5)"""
         
-        perms_cog = self.get_perms_cog()
-        if not perms_cog or perms_cog.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Nécessite le niveau **Owner Bot** (5).")
-        
-        total_members = sum(g.member_count for g in self.bot.guilds)
-        total_channels = sum(len(g.channels) for g in self.bot.guilds)
+        totals = get_stats(self.bot).totals()
+        total_members = totals["members"]
+        total_channels = totals["channels"]
         
         embed = discord.Embed(title="📊 Statistiques Bot", color=discord.Color.gold())
-        embed.add_field(name="🌐 Serveurs", value=f"```yaml\n{len(self.bot.guilds)}```", inline=True)
+        embed.add_field(name="🌐 Serveurs", value=f"```yaml\n{totals['guilds']}```", inline=True)
         embed.add_field(name="👥 Utilisateurs", value=f"```yaml\n{total_members:,}```", inline=True)
         embed.add_field(name="📝 Salons", value=f"```yaml\n{total_channels}```", inline=True)
-        embed.add_field(name="⚙️ Commandes", value=f"```yaml\n{len(list(self.bot.walk_commands()))}```", inline=True)
+        embed.add_field(name="⚙️ Commandes", value=f"```yaml\n{totals['commands']}```", inline=True)
         embed.add_field(name="🔗 Latence", value=f"```yaml\n{round(self.bot.latency * 1000)}ms```", inline=True)
         embed.add_field(name="📦 Cogs", value=f"```yaml\n{len(self.bot.cogs)}```", inline=True)
         
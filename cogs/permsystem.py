@@ -1,13 +1,35 @@
 import discord
 from discord.ext import commands
-import json
-import os
+from types import MappingProxyType
+
+from core.errors import InsufficientLevel
+from core.storage import PERMISSION_KINDS, get_storage, new_guild_perms
+
+# Permissions par défaut (lecture seule) des serveurs sans attribution
+DEFAULT_GUILD_PERMS = MappingProxyType({
+    **{kind: () for kind in PERMISSION_KINDS},
+    "roles": MappingProxyType({})
+})
+
+# Niveau accordé par chaque liste de membres
+KIND_LEVELS = {
+    "owners": 5,
+    "admins": 4,
+    "gs_users": 3,
+    "moderators": 2,
+    "supports": 1
+}
 
 class PermissionsSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.perms_file = "permissions.json"
-        self.permissions = self.load_permissions()
+        self.storage = None
+        self.permissions = {}
+        
+        # Index compilés à partir de self.permissions (clés : ID de serveur en int)
+        self.user_levels = {}   # guild_id -> {user_id: niveau le plus haut des listes}
+        self.role_levels = {}   # guild_id -> {role_id: niveau}
+        self.level_cache = {}   # guild_id -> {member_id: niveau calculé}
         
         # Hiérarchie des niveaux (plus le niveau est haut, plus il a de permissions)
         self.hierarchy = {
@@ -19,14 +41,13 @@ class PermissionsSystem(commands.Cog):
             5: "Owner Bot"
         }
         
-        # Permissions requises par commande
+        # Permissions requises par commande (nom complet de la commande, sans alias)
+        # Registre unique : vérifié par le check global avant chaque commande
         self.command_levels = {
             # Support (niveau 1) - Info uniquement
             "warn": 1,
             "warns": 1,
             "memberinfo": 1,
-            "mi": 1,
-            "whois": 1,
             
             # Modérateur (niveau 2) - Modération basique
             "kick": 2,
@@ -35,7 +56,6 @@ class PermissionsSystem(commands.Cog):
             "timeout": 2,
             "untimeout": 2,
             "clear": 2,
-            "purge": 2,
             "lock": 2,
             "unlock": 2,
             "slowmode": 2,
@@ -43,11 +63,27 @@ class PermissionsSystem(commands.Cog):
             # GS (niveau 3) - Gestion complète SAUF commandes admin
             "ban": 3,
             "unban": 3,
+            "massban": 3,
+            "banlist": 3,
             "addrole": 3,
             "removerole": 3,
             "nick": 3,
             "clearwarns": 3,
             "removewarn": 3,
+            "warnconfig": 3,
+            "createchannel": 3,
+            "deletechannel": 3,
+            "renamechannel": 3,
+            "createrole": 3,
+            "deleterole": 3,
+            "editrole": 3,
+            "massrole": 3,
+            "servinfo": 3,
+            "roleinfo": 3,
+            "purgebots": 3,
+            "purgeuser": 3,
+            "purgeembeds": 3,
+            "prune": 3,
             
             # Administrateur (niveau 4) - Gestion des permissions
             "addmod": 4,
@@ -62,75 +98,111 @@ class PermissionsSystem(commands.Cog):
             "removegs": 5,
             "addadmin": 5,
             "removeadmin": 5,
-            "addowner": 5,
-            "removeowner": 5,
+            "botstatus": 5,
+            "botstatustype": 5,
+            "botname": 5,
+            "botavatar": 5,
+            "bls": 5,
+            "unbls": 5,
+            "bl": 5,
+            "unbl": 5,
+            "blacklist": 5,
+            "ownerinfo": 5,
+            # addowner / removeowner : réservées au propriétaire de l'application (is_owner)
         }
     
-    def load_permissions(self):
-        if os.path.exists(self.perms_file):
-            with open(self.perms_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+    async def cog_load(self):
+        self.storage = await get_storage(self.bot)
+        self.permissions = await self.storage.load_permissions()
+        for guild_id in self.permissions:
+            self.build_index(guild_id)
+        self.bot.add_check(self.check_command_level)
     
-    def save_permissions(self):
-        with open(self.perms_file, 'w', encoding='utf-8') as f:
-            json.dump(self.permissions, indent=4, fp=f, ensure_ascii=False)
+    async def cog_unload(self):
+        self.bot.remove_check(self.check_command_level)
     
     def get_guild_perms(self, guild_id):
+        """Permissions du serveur en lecture (défaut partagé si aucune attribution)"""
+        return self.permissions.get(str(guild_id), DEFAULT_GUILD_PERMS)
+    
+    def ensure_guild_perms(self, guild_id):
+        """Permissions modifiables du serveur (créées à la première attribution)"""
         guild_id = str(guild_id)
         if guild_id not in self.permissions:
-            self.permissions[guild_id] = {
-                "owners": [],
-                "admins": [],
-                "gs_users": [],
-                "moderators": [],
-                "supports": [],
-                "roles": {}
-            }
-            self.save_permissions()
+            self.permissions[guild_id] = new_guild_perms()
         return self.permissions[guild_id]
     
-    def get_user_level(self, member):
-        """Détermine le niveau de permission d'un membre"""
-        guild_perms = self.get_guild_perms(member.guild.id)
-        
-        # Owner Bot (niveau 5)
-        if member.id in guild_perms.get("owners", []):
-            return 5
+    def prune_guild_perms(self, guild_id):
+        """Oublie un serveur qui n'a plus aucune attribution"""
+        guild_perms = self.permissions.get(str(guild_id))
+        if guild_perms is not None and not any(guild_perms.values()):
+            del self.permissions[str(guild_id)]
+    
+    # ==================== INDEX DES NIVEAUX ====================
+    
+    def build_index(self, guild_id):
+        """Compile les listes du serveur en dictionnaires (recherche en O(1))"""
+        guild_id = int(guild_id)
+        guild_perms = self.get_guild_perms(guild_id)
+        
+        user_levels = {}
+        for kind, level in KIND_LEVELS.items():
+            for user_id in guild_perms.get(kind, ()):
+                user_levels[user_id] = max(level, user_levels.get(user_id, 0))
+        role_levels = {int(role_id): level for role_id, level in guild_perms.get("roles", {}).items()}
+        
+        if user_levels or role_levels:
+            self.user_levels[guild_id] = user_levels
+            self.role_levels[guild_id] = role_levels
+        else:
+            self.user_levels.pop(guild_id, None)
+            self.role_levels.pop(guild_id, None)
+        self.level_cache.pop(guild_id, None)
+    
+    def refresh_guild(self, guild_id):
+        """À appeler après toute modification des attributions d'un serveur"""
+        self.prune_guild_perms(guild_id)
+        self.build_index(guild_id)
+    
+    def invalidate_member(self, guild_id, member_id):
+        cache = self.level_cache.get(guild_id)
+        if cache:
+            cache.pop(member_id, None)
+    
+    def compute_user_level(self, member):
+        """Calcule le niveau d'un membre (même ordre de priorité que les listes)"""
+        guild_id = member.guild.id
+        list_level = self.user_levels.get(guild_id, {}).get(member.id)
         
-        # Propriétaire du serveur = Owner Bot
-        if member.id == member.guild.owner_id:
+        # Owner Bot (liste) ou propriétaire du serveur
+        if list_level == 5 or member.id == member.guild.owner_id:
             return 5
         
-        # Administrateur (niveau 4)
-        if member.id in guild_perms.get("admins", []):
+        # Administrateur (liste)
+        if list_level == 4:
             return 4
         
         # Admin Discord = Admin bot
         if member.guild_permissions.administrator:
             return 4
         
-        # GS (niveau 3) - Gestion complète SAUF admin
-        if member.id in guild_perms.get("gs_users", []):
-            return 3
-        
-        # Modérateur (niveau 2)
-        if member.id in guild_perms.get("moderators", []):
-            return 2
-        
-        # Support (niveau 1)
-        if member.id in guild_perms.get("supports", []):
-            return 1
+        # GS (3), Modérateur (2), Support (1)
+        if list_level:
+            return list_level
         
         # Vérifie les rôles configurés
-        max_level = 0
-        for role in member.roles:
-            role_id = str(role.id)
-            if role_id in guild_perms.get("roles", {}):
-                level = guild_perms["roles"][role_id]
-                max_level = max(max_level, level)
-        
-        return max_level
+        role_levels = self.role_levels.get(guild_id)
+        if not role_levels:
+            return 0
+        return max((role_levels.get(role.id, 0) for role in member.roles), default=0)
+    
+    def get_user_level(self, member):
+        """Détermine le niveau de permission d'un membre (mis en cache)"""
+        cache = self.level_cache.setdefault(member.guild.id, {})
+        level = cache.get(member.id)
+        if level is None:
+            level = cache[member.id] = self.compute_user_level(member)
+        return level
     
     def can_use_command(self, member, command_name):
         """Vérifie si un membre peut utiliser une commande"""
@@ -138,15 +210,16 @@ class PermissionsSystem(commands.Cog):
         required_level = self.command_levels.get(command_name, 0)
         return user_level >= required_level
     
-    def can_moderate_target(self, moderator: discord.Member, target: discord.Member):
-        """Vérifie la hiérarchie pour les sanctions"""
+    def can_moderate_target(self, moderator: discord.Member, target: discord.Member, mod_level=None):
+        """Vérifie la hiérarchie pour les sanctions (`mod_level` : niveau déjà calculé, ex. ctx.user_level)"""
         if target == moderator:
             return False, "Tu ne peux pas te sanctionner toi-même !"
         
         if target.guild.owner == target:
             return False, "Tu ne peux pas sanctionner le propriétaire du serveur !"
         
-        mod_level = self.get_user_level(moderator)
+        if mod_level is None:
+            mod_level = self.get_user_level(moderator)
         target_level = self.get_user_level(target)
         
         if target_level >= mod_level:
@@ -168,13 +241,14 @@ class PermissionsSystem(commands.Cog):
     @commands.is_owner()
     async def add_owner(self, ctx, user: discord.User):
         """Ajoute un Owner Bot (niveau 5)"""
-        guild_perms = self.get_guild_perms(ctx.guild.id)
+        guild_perms = self.ensure_guild_perms(ctx.guild.id)
         
         if user.id in guild_perms["owners"]:
             return await ctx.send(f"❌ {user.mention} est déjà Owner Bot.")
         
         guild_perms["owners"].append(user.id)
-        self.save_permissions()
+        await self.storage.add_grant(ctx.guild.id, "owners", user.id)
+        self.refresh_guild(ctx.guild.id)
         
         embed = discord.Embed(
             title="👑 Owner Bot ajouté",
@@ -198,7 +272,8 @@ class PermissionsSystem(commands.Cog):
             return await ctx.send(f"❌ {user.mention} n'est pas Owner Bot.")
         
         guild_perms["owners"].remove(user.id)
-        self.save_permissions()
+        await self.storage.remove_grant(ctx.guild.id, "owners", user.id)
+        self.refresh_guild(ctx.guild.id)
         await ctx.send(f"✅ {user.mention} n'est plus **Owner Bot**.")
     
     # ==================== COMMANDES ADMINISTRATEUR ====================
@@ -206,16 +281,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="addadmin")
     async def add_admin(self, ctx, user: discord.User):
         """Ajoute un Administrateur (niveau 4)"""
-        if self.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Seuls les **Owner Bot** peuvent attribuer le niveau Administrateur.")
-        
-        guild_perms = self.get_guild_perms(ctx.guild.id)
+        guild_perms = self.ensure_guild_perms(ctx.guild.id)
         
         if user.id in guild_perms["admins"]:
             return await ctx.send(f"❌ {user.mention} est déjà Administrateur.")
         
         guild_perms["admins"].append(user.id)
-        self.save_permissions()
+        await self.storage.add_grant(ctx.guild.id, "admins", user.id)
+        self.refresh_guild(ctx.guild.id)
         
         embed = discord.Embed(
             title="🔴 Administrateur ajouté",
@@ -232,16 +305,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="removeadmin")
     async def remove_admin(self, ctx, user: discord.User):
         """Retire le niveau Administrateur"""
-        if self.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Seuls les **Owner Bot** peuvent retirer le niveau Administrateur.")
-        
         guild_perms = self.get_guild_perms(ctx.guild.id)
         
         if user.id not in guild_perms["admins"]:
             return await ctx.send(f"❌ {user.mention} n'est pas Administrateur.")
         
         guild_perms["admins"].remove(user.id)
-        self.save_permissions()
+        await self.storage.remove_grant(ctx.guild.id, "admins", user.id)
+        self.refresh_guild(ctx.guild.id)
         await ctx.send(f"✅ {user.mention} n'est plus **Administrateur**.")
     
     # ==================== COMMANDES GS ====================
@@ -249,16 +320,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="addgs")
     async def add_gs(self, ctx, user: discord.User):
         """Ajoute un GS (niveau 3)"""
-        if self.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Seuls les **Owner Bot** peuvent attribuer le niveau GS.")
-        
-        guild_perms = self.get_guild_perms(ctx.guild.id)
+        guild_perms = self.ensure_guild_perms(ctx.guild.id)
         
         if user.id in guild_perms["gs_users"]:
             return await ctx.send(f"❌ {user.mention} a déjà le niveau GS.")
         
         guild_perms["gs_users"].append(user.id)
-        self.save_permissions()
+        await self.storage.add_grant(ctx.guild.id, "gs_users", user.id)
+        self.refresh_guild(ctx.guild.id)
         
         embed = discord.Embed(
             title="🔵 GS (Gestion) ajouté",
@@ -275,16 +344,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="removegs")
     async def remove_gs(self, ctx, user: discord.User):
         """Retire le niveau GS"""
-        if self.get_user_level(ctx.author) < 5:
-            return await ctx.send("❌ Seuls les **Owner Bot** peuvent retirer le niveau GS.")
-        
         guild_perms = self.get_guild_perms(ctx.guild.id)
         
         if user.id not in guild_perms["gs_users"]:
             return await ctx.send(f"❌ {user.mention} n'a pas le niveau GS.")
         
         guild_perms["gs_users"].remove(user.id)
-        self.save_permissions()
+        await self.storage.remove_grant(ctx.guild.id, "gs_users", user.id)
+        self.refresh_guild(ctx.guild.id)
         await ctx.send(f"✅ {user.mention} n'a plus le niveau **GS**.")
     
     # ==================== COMMANDES MODÉRATEUR ====================
@@ -292,16 +359,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="addmod")
     async def add_mod(self, ctx, user: discord.User):
         """Ajoute un Modérateur (niveau 2)"""
-        if self.get_user_level(ctx.author) < 4:
-            return await ctx.send("❌ Seuls les **Administrateurs** peuvent attribuer le niveau Modérateur.")
-        
-        guild_perms = self.get_guild_perms(ctx.guild.id)
+        guild_perms = self.ensure_guild_perms(ctx.guild.id)
         
         if user.id in guild_perms["moderators"]:
             return await ctx.send(f"❌ {user.mention} est déjà Modérateur.")
         
         guild_perms["moderators"].append(user.id)
-        self.save_permissions()
+        await self.storage.add_grant(ctx.guild.id, "moderators", user.id)
+        self.refresh_guild(ctx.guild.id)
         
         embed = discord.Embed(
             title="🟠 Modérateur ajouté",
@@ -318,16 +383,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="removemod")
     async def remove_mod(self, ctx, user: discord.User):
         """Retire le niveau Modérateur"""
-        if self.get_user_level(ctx.author) < 4:
-            return await ctx.send("❌ Seuls les **Administrateurs** peuvent retirer le niveau Modérateur.")
-        
         guild_perms = self.get_guild_perms(ctx.guild.id)
         
         if user.id not in guild_perms["moderators"]:
             return await ctx.send(f"❌ {user.mention} n'est pas Modérateur.")
         
         guild_perms["moderators"].remove(user.id)
-        self.save_permissions()
+        await self.storage.remove_grant(ctx.guild.id, "moderators", user.id)
+        self.refresh_guild(ctx.guild.id)
         await ctx.send(f"✅ {user.mention} n'est plus **Modérateur**.")
     
     # ==================== COMMANDES SUPPORT ====================
@@ -335,16 +398,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="addsupport")
     async def add_support(self, ctx, user: discord.User):
         """Ajoute un Support (niveau 1)"""
-        if self.get_user_level(ctx.author) < 4:
-            return await ctx.send("❌ Seuls les **Administrateurs** peuvent attribuer le niveau Support.")
-        
-        guild_perms = self.get_guild_perms(ctx.guild.id)
+        guild_perms = self.ensure_guild_perms(ctx.guild.id)
         
         if user.id in guild_perms["supports"]:
             return await ctx.send(f"❌ {user.mention} est déjà Support.")
         
         guild_perms["supports"].append(user.id)
-        self.save_permissions()
+        await self.storage.add_grant(ctx.guild.id, "supports", user.id)
+        self.refresh_guild(ctx.guild.id)
         
         embed = discord.Embed(
             title="🟢 Support ajouté",
@@ -361,16 +422,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="removesupport")
     async def remove_support(self, ctx, user: discord.User):
         """Retire le niveau Support"""
-        if self.get_user_level(ctx.author) < 4:
-            return await ctx.send("❌ Seuls les **Administrateurs** peuvent retirer le niveau Support.")
-        
         guild_perms = self.get_guild_perms(ctx.guild.id)
         
         if user.id not in guild_perms["supports"]:
             return await ctx.send(f"❌ {user.mention} n'est pas Support.")
         
         guild_perms["supports"].remove(user.id)
-        self.save_permissions()
+        await self.storage.remove_grant(ctx.guild.id, "supports", user.id)
+        self.refresh_guild(ctx.guild.id)
         await ctx.send(f"✅ {user.mention} n'est plus **Support**.")
     
     # ==================== GESTION DES RÔLES ====================
@@ -378,16 +437,14 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="setrole")
     async def set_role(self, ctx, role: discord.Role, level: int):
         """Définit le niveau d'un rôle Discord (0-4)"""
-        if self.get_user_level(ctx.author) < 4:
-            return await ctx.send("❌ Seuls les **Administrateurs** peuvent configurer les rôles.")
-        
         if level not in self.hierarchy or level >= 5:
             levels_text = "\n".join([f"**{lvl}** - {name}" for lvl, name in self.hierarchy.items() if lvl < 5])
             return await ctx.send(f"❌ Niveau invalide. Niveaux disponibles:\n{levels_text}")
         
-        guild_perms = self.get_guild_perms(ctx.guild.id)
+        guild_perms = self.ensure_guild_perms(ctx.guild.id)
         guild_perms["roles"][str(role.id)] = level
-        self.save_permissions()
+        await self.storage.add_grant(ctx.guild.id, "roles", role.id, level)
+        self.refresh_guild(ctx.guild.id)
         
         embed = discord.Embed(
             title="✅ Rôle configuré",
@@ -399,9 +456,6 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="delrole")
     async def remove_role_perm(self, ctx, role: discord.Role):
         """Retire un rôle de la configuration"""
-        if self.get_user_level(ctx.author) < 4:
-            return await ctx.send("❌ Seuls les **Administrateurs** peuvent configurer les rôles.")
-        
         guild_perms = self.get_guild_perms(ctx.guild.id)
         role_id = str(role.id)
         
@@ -409,7 +463,8 @@ class PermissionsSystem(commands.Cog):
             return await ctx.send(f"❌ {role.mention} n'a pas de niveau configuré.")
         
         del guild_perms["roles"][role_id]
-        self.save_permissions()
+        await self.storage.remove_grant(ctx.guild.id, "roles", role.id)
+        self.refresh_guild(ctx.guild.id)
         await ctx.send(f"✅ {role.mention} n'a plus de niveau de permission.")
     
     # ==================== AFFICHAGE ====================
@@ -471,7 +526,7 @@ class PermissionsSystem(commands.Cog):
     @commands.command(name="mylevel")
     async def my_level(self, ctx):
         """Affiche votre niveau de permission"""
-        level = self.get_user_level(ctx.author)
+        level = ctx.user_level
         
         embed = discord.Embed(
             title="🔐 Votre niveau",
@@ -491,27 +546,47 @@ class PermissionsSystem(commands.Cog):
     
     # ==================== CHECK AUTOMATIQUE ====================
     
+    async def check_command_level(self, ctx):
+        """Check global : calcule le niveau une seule fois (ctx.user_level) avant la commande"""
+        level = getattr(ctx, "user_level", None)
+        if level is None:
+            # En MP, aucun niveau de serveur
+            level = self.get_user_level(ctx.author) if isinstance(ctx.author, discord.Member) else 0
+            ctx.user_level = level
+        
+        required = self.command_levels.get(ctx.command.qualified_name, 0)
+        if level < required:
+            raise InsufficientLevel(level, required, self.hierarchy[level], self.hierarchy[required])
+        return True
+    
+    # ==================== INVALIDATION DU CACHE ====================
+    
     @commands.Cog.listener()
-    async def on_command(self, ctx):
-        """Vérifie les permissions avant chaque commande"""
-        if ctx.command.cog == self:
-            return
-        
-        if not self.can_use_command(ctx.author, ctx.command.name):
-            user_level = self.get_user_level(ctx.author)
-            required_level = self.command_levels.get(ctx.command.name, 0)
-            
-            embed = discord.Embed(
-                title="❌ Permission refusée",
-                description=f"Cette commande nécessite le niveau **{self.hierarchy[required_level]}** minimum.",
-                color=discord.Color.red()
-            )
-            embed.add_field(
-                name="Votre niveau actuel",
-                value=f"**{self.hierarchy[user_level]}**"
-            )
-            await ctx.send(embed=embed, delete_after=10)
-            raise commands.CommandError("Permission insuffisante")
+    async def on_member_update(self, before, after):
+        if before.roles != after.roles:
+            self.invalidate_member(after.guild.id, after.id)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.invalidate_member(member.guild.id, member.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        # Les permissions (administrateur) d'un rôle peuvent avoir changé
+        self.level_cache.pop(after.guild.id, None)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.level_cache.pop(role.guild.id, None)
+    
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        if before.owner_id != after.owner_id:
+            self.level_cache.pop(after.id, None)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.level_cache.pop(guild.id, None)
 
 async def setup(bot):
     await bot.add_cog(PermissionsSystem(bot))
\ No newline at end of file
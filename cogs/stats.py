@@ -0,0 +1,53 @@
+from discord.ext import commands
+
+from core.stats import get_stats
+
+
+class StatsTracker(commands.Cog):
+    """Maintient les totaux globaux du bot à partir des événements"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.stats = None
+
+    async def cog_load(self):
+        self.stats = get_stats(self.bot)
+        self.stats.rebuild()
+        self.stats.tracking = True
+
+    async def cog_unload(self):
+        self.stats.tracking = False
+
+    # ==================== SERVEURS ====================
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.stats.update_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.stats.remove_guild(guild.id)
+
+    # ==================== MEMBRES ====================
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.stats.update_guild(member.guild)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.stats.update_guild(member.guild)
+
+    # ==================== SALONS ====================
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.stats.update_guild(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.stats.update_guild(channel.guild)
+
+
+async def setup(bot):
+    await bot.add_cog(StatsTracker(bot))
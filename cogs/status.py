@@ -3,6 +3,8 @@ from discord.ext import commands, tasks
 from datetime import datetime
 import asyncio
 
+from core.stats import get_stats
+
 class Status(commands.Cog):
     """Affiche et met à jour automatiquement le statut du bot dans un salon"""
     
@@ -79,8 +81,9 @@ class Status(commands.Cog):
             uptime_str.append("< 1m")
         
         # Statistiques
-        total_members = sum(g.member_count for g in self.bot.guilds)
-        total_channels = sum(len(g.channels) for g in self.bot.guilds)
+        totals = get_stats(self.bot).totals()
+        total_members = totals["members"]
+        total_channels = totals["channels"]
         
         # Crée l'embed
         embed = discord.Embed(
@@ -137,7 +140,7 @@ class Status(commands.Cog):
         # Commandes disponibles
         embed.add_field(
             name="⚙️ Commandes",
-            value=f"**{len(list(self.bot.walk_commands()))}** commande(s)",
+            value=f"**{totals['commands']}** commande(s)",
             inline=True
         )
         
@@ -1,47 +1,65 @@
 import discord
 from discord.ext import commands
 from datetime import datetime
-import json
-import os
 import asyncio
+from types import MappingProxyType
+
+from core.logqueue import get_logqueue
+from core.storage import get_storage
+
+
+def new_ticket_config():
+    return {
+        "category_id": None,
+        "panel_channel_id": None,
+        "panel_message_id": None,
+        "log_channel_id": None,
+        "support_role_id": None,
+        "ticket_count": 0,
+        "open_tickets": {},
+        "types": {
+            "support": {"emoji": "💬", "name": "Support Général", "enabled": True},
+            "report": {"emoji": "⚠️", "name": "Signalement", "enabled": True},
+            "partnership": {"emoji": "🤝", "name": "Partenariat", "enabled": True},
+            "other": {"emoji": "📝", "name": "Autre", "enabled": True}
+        }
+    }
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+# Configuration par défaut (lecture seule) des serveurs non configurés
+DEFAULT_CONFIG = _freeze(new_ticket_config())
 
 class Tickets(commands.Cog):
     """Système de tickets complet et optimisé"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.config_file = "tickets_config.json"
-        self.config = self.load_config()
+        self.storage = None
+        self.config = {}
     
-    def load_config(self):
-        if os.path.exists(self.config_file):
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        return {}
+    async def cog_load(self):
+        self.storage = await get_storage(self.bot)
+        self.config = await self.storage.load_tickets()
     
-    def save_config(self):
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+    async def save_config(self, guild_id):
+        """Enregistre les paramètres d'un serveur"""
+        await self.storage.save_ticket_config(guild_id, self.ensure_config(guild_id))
     
     def get_config(self, guild_id):
+        """Configuration du serveur en lecture (défaut partagé si non configuré)"""
+        return self.config.get(str(guild_id), DEFAULT_CONFIG)
+    
+    def ensure_config(self, guild_id):
+        """Configuration modifiable du serveur (créée au premier changement)"""
         guild_id = str(guild_id)
         if guild_id not in self.config:
-            self.config[guild_id] = {
-                "category_id": None,
-                "panel_channel_id": None,
-                "panel_message_id": None,
-                "log_channel_id": None,
-                "support_role_id": None,
-                "ticket_count": 0,
-                "open_tickets": {},
-                "types": {
-                    "support": {"emoji": "💬", "name": "Support Général", "enabled": True},
-                    "report": {"emoji": "⚠️", "name": "Signalement", "enabled": True},
-                    "partnership": {"emoji": "🤝", "name": "Partenariat", "enabled": True},
-                    "other": {"emoji": "📝", "name": "Autre", "enabled": True}
-                }
-            }
-            self.save_config()
+            self.config[guild_id] = new_ticket_config()
         return self.config[guild_id]
     
     def create_embed(self, title, description, color):
@@ -82,10 +100,7 @@ class Tickets(commands.Cog):
             colors.get(action, discord.Color.blue())
         )
         
-        try:
-            await log_channel.send(embed=embed)
-        except:
-            pass
+        get_logqueue(self.bot).enqueue(log_channel, embed)
     
     @commands.command(name="ticketsetup")
     @commands.has_permissions(administrator=True)
@@ -94,7 +109,7 @@ class Tickets(commands.Cog):
         
         await ctx.send("🔄 **Configuration du système de tickets...**")
         
-        config = self.get_config(ctx.guild.id)
+        config = self.ensure_config(ctx.guild.id)
         
         # 1. Créer la catégorie
         category = None
@@ -201,7 +216,7 @@ class Tickets(commands.Cog):
         except Exception as e:
             return await ctx.send(f"❌ Erreur lors de la création du panel : {e}")
         
-        self.save_config()
+        await self.save_config(ctx.guild.id)
         
         # Message de confirmation
         embed = discord.Embed(
@@ -234,10 +249,6 @@ class Tickets(commands.Cog):
                     ephemeral=True
                 )
         
-        # Incrémenter le compteur
-        config["ticket_count"] += 1
-        ticket_number = config["ticket_count"]
-        
         # Récupérer la catégorie
         category_id = config.get("category_id")
         if not category_id:
@@ -253,6 +264,11 @@ class Tickets(commands.Cog):
                 ephemeral=True
             )
         
+        # Incrémenter le compteur
+        config = self.ensure_config(interaction.guild.id)
+        config["ticket_count"] += 1
+        ticket_number = config["ticket_count"]
+        
         # Récupérer le rôle support
         support_role = None
         if config.get("support_role_id"):
@@ -299,7 +315,7 @@ class Tickets(commands.Cog):
         
         # Sauvegarder le ticket
         config["open_tickets"][user_id] = ticket_channel.id
-        self.save_config()
+        await self.storage.open_ticket(interaction.guild.id, user_id, ticket_channel.id, config)
         
         # Message de bienvenue dans le ticket
         ticket_info = config["types"].get(ticket_type, {})
@@ -354,10 +370,9 @@ class Tickets(commands.Cog):
             if ticket_channel_id == channel.id:
                 ticket_owner = interaction.guild.get_member(int(user_id))
                 del config["open_tickets"][user_id]
+                await self.storage.close_ticket(interaction.guild.id, user_id)
                 break
         
-        self.save_config()
-        
         # Message de fermeture
         close_embed = discord.Embed(
             title="🔒 Ticket Fermé",
@@ -488,9 +503,9 @@ class Tickets(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def ticket_setrole(self, ctx, role: discord.Role):
         """Définit le rôle support"""
-        config = self.get_config(ctx.guild.id)
+        config = self.ensure_config(ctx.guild.id)
         config["support_role_id"] = role.id
-        self.save_config()
+        await self.save_config(ctx.guild.id)
         
         embed = discord.Embed(
             title="✅ Rôle Support Défini",
@@ -1,6 +1,8 @@
 import discord
 from discord.ext import commands
 
+from core.prefixes import MAX_PREFIX_LENGTH
+
 class Utils(commands.Cog):
     """Commandes utilitaires."""
 
@@ -16,5 +18,23 @@ class Utils(commands.Cog):
         embed.add_field(name="Statut", value=member.status, inline=False)
         await ctx.send(embed=embed)
 
+    @commands.command(name="setprefix", help="Change le préfixe du bot sur ce serveur")
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def setprefix(self, ctx, prefix: str = None):
+        resolver = self.bot.prefixes
+        if prefix is None:
+            return await ctx.send(f"🔤 Préfixe actuel : `{resolver.get(ctx.guild.id)}`")
+        if len(prefix) > MAX_PREFIX_LENGTH or any(char.isspace() for char in prefix):
+            return await ctx.send(f"❌ Le préfixe doit faire au plus {MAX_PREFIX_LENGTH} caractères, sans espace.")
+
+        await resolver.set(ctx.guild.id, prefix)
+        embed = discord.Embed(
+            title="✅ Préfixe modifié",
+            description=f"Nouveau préfixe : `{prefix}`\nExemple : `{prefix}help`",
+            color=discord.Color.green()
+        )
+        await ctx.send(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(Utils(bot))
@@ -0,0 +1 @@
+"""Services partagés par les cogs (persistance, I/O, caches)."""
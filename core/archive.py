@@ -0,0 +1,371 @@
+import asyncio
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.fileio import atomic_write_text
+
+ARCHIVE_DIR = os.getenv("LOG_ARCHIVE_DIR", "log_archive")
+RETENTION_DAYS = float(os.getenv("LOG_ARCHIVE_RETENTION_DAYS", "30"))
+SEGMENT_BYTES = 8 * 1024 * 1024     # rotation par taille
+SEGMENT_SECONDS = 24 * 3600         # rotation par âge
+FLUSH_INTERVAL = 2.0                # secondes entre deux écritures groupées
+INDEX_INTERVAL = 60.0               # secondes entre deux sauvegardes de l'index actif
+COMPACT_INTERVAL = 3600.0           # secondes entre deux passes de rétention
+MAX_SUMMARY = 300
+
+
+class Segment:
+    """Un fichier d'archive (JSON lines) et son index.
+
+    L'index associe chaque serveur et chaque utilisateur (auteur ou cible)
+    aux positions de ses enregistrements dans le fichier.
+    """
+
+    def __init__(self, path, start):
+        self.path = path
+        self.start = start
+        self.end = start
+        self.size = 0
+        self.count = 0
+        self.guilds = {}  # guild_id -> [positions]
+        self.users = {}   # user_id -> [positions]
+        self.dirty = False
+
+    @property
+    def index_path(self):
+        return self.path[:-len(".jsonl")] + ".idx.json"
+
+    def add(self, offset, record):
+        self.guilds.setdefault(record["g"], []).append(offset)
+        for key in ("a", "u"):
+            user_id = record.get(key)
+            if user_id:
+                positions = self.users.setdefault(user_id, [])
+                if not positions or positions[-1] != offset:
+                    positions.append(offset)
+        self.end = max(self.end, record["t"])
+        self.count += 1
+        self.dirty = True
+
+    def positions(self, guild_id, user_id=None):
+        positions = self.guilds.get(guild_id, [])
+        if user_id is not None:
+            by_user = set(self.users.get(user_id, ()))
+            positions = [offset for offset in positions if offset in by_user]
+        return positions
+
+    def to_index(self):
+        return {
+            "start": self.start,
+            "end": self.end,
+            "size": self.size,
+            "count": self.count,
+            "guilds": self.guilds,
+            "users": self.users,
+        }
+
+    @classmethod
+    def from_index(cls, path, data):
+        segment = cls(path, data["start"])
+        segment.end = data["end"]
+        segment.size = data["size"]
+        segment.count = data["count"]
+        segment.guilds = data["guilds"]
+        segment.users = data["users"]
+        return segment
+
+
+def _segment_path(directory, start):
+    return os.path.join(directory, f"segment-{int(start * 1000):015d}.jsonl")
+
+
+def _scan(segment, from_offset=0):
+    """Indexe les enregistrements du fichier à partir de `from_offset`"""
+    with open(segment.path, "rb") as f:
+        f.seek(from_offset)
+        offset = from_offset
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # ligne incomplète (arrêt brutal) : ignorée
+            try:
+                segment.add(offset, json.loads(line))
+            except (ValueError, KeyError):
+                pass
+            offset += len(line)
+    segment.size = offset
+
+
+def _load_segment(path):
+    start = int(os.path.basename(path)[len("segment-"):-len(".jsonl")]) / 1000
+    segment = Segment(path, start)
+    try:
+        with open(segment.index_path, "r", encoding="utf-8") as f:
+            segment = Segment.from_index(path, json.load(f))
+    except (OSError, ValueError, KeyError):
+        pass
+    # Complète l'index avec ce qui a été ajouté après sa dernière sauvegarde
+    if os.path.getsize(path) != segment.size:
+        _scan(segment, segment.size)
+    return segment
+
+
+def _record_time(line):
+    """Horodatage d'une ligne d'archive (None si incomplète ou illisible)"""
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        return json.loads(line)["t"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _remove_segment(segment):
+    for path in (segment.path, segment.index_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _write_index(segment):
+    atomic_write_text(segment.index_path, json.dumps(segment.to_index(), separators=(",", ":")))
+    segment.dirty = False
+
+
+def _read_records(path, positions):
+    records = []
+    with open(path, "rb") as f:
+        for offset in positions:
+            f.seek(offset)
+            records.append(json.loads(f.readline()))
+    return records
+
+
+class LogArchive:
+    """Archive locale des logs, en ajout seul et découpée en segments.
+
+    Les enregistrements sont écrits par lots sur un thread dédié. Un
+    segment est fermé (et son index écrit) quand il dépasse sa taille ou
+    son âge maximum ; les segments sortis de la rétention sont supprimés,
+    ceux qui la chevauchent sont réécrits sans les anciens enregistrements.
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR, retention_days=RETENTION_DAYS):
+        self.directory = directory
+        self.retention = retention_days * 86400
+        self.segments = []   # du plus ancien au plus récent ; le dernier est actif
+        self._buffer = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+        self._task = None
+        self._last_index = time.monotonic()
+        self._last_compact = time.monotonic()
+
+        # Métriques
+        self.written = 0
+        self.searches = 0
+        self.removed = 0
+
+    async def run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def open(self):
+        def load():
+            os.makedirs(self.directory, exist_ok=True)
+            paths = sorted(glob.glob(os.path.join(self.directory, "segment-*.jsonl")))
+            return [_load_segment(path) for path in paths]
+        self.segments = await self.run(load)
+        await self.compact()
+        self._task = asyncio.create_task(self._flush_loop())
+        records = sum(segment.count for segment in self.segments)
+        print(f"🗄️ Archive des logs : {records} enregistrement(s), {len(self.segments)} segment(s)")
+
+    # ==================== ÉCRITURE ====================
+
+    def append(self, log_type, guild_id, summary, actor=None, target=None, channel=None, timestamp=None):
+        record = {"t": round(timestamp or time.time(), 3), "type": log_type, "g": str(guild_id)}
+        if actor:
+            record["a"] = str(actor)
+        if target:
+            record["u"] = str(target)
+        if channel:
+            record["c"] = str(channel)
+        record["s"] = summary[:MAX_SUMMARY]
+        self._buffer.append(record)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_compact >= COMPACT_INTERVAL:
+                    self._last_compact = time.monotonic()
+                    await self.compact()
+            except Exception as e:
+                print(f"❌ Erreur archive des logs : {e}")
+
+    async def flush(self, write_index=False):
+        records, self._buffer = self._buffer, []
+        if records:
+            try:
+                await self.run(self._write, records)
+            except BaseException:
+                # Écriture échouée : les enregistrements reviennent en tête du tampon
+                self._buffer[:0] = records
+                raise
+            self.written += len(records)
+
+        if write_index or time.monotonic() - self._last_index >= INDEX_INTERVAL:
+            self._last_index = time.monotonic()
+            dirty = [segment for segment in self.segments if segment.dirty]
+            for segment in dirty:
+                await self.run(_write_index, segment)
+
+    def _active_segment(self, now):
+        segment = self.segments[-1] if self.segments else None
+        if segment is None or segment.size >= SEGMENT_BYTES or now - segment.start >= SEGMENT_SECONDS:
+            if segment is not None:
+                _write_index(segment)
+            segment = Segment(_segment_path(self.directory, now), now)
+            self.segments.append(segment)
+        return segment
+
+    def _write(self, records):
+        segment = self._active_segment(records[0]["t"])
+        lines = [
+            (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+            for record in records
+        ]
+        with open(segment.path, "ab") as f:
+            try:
+                f.write(b"".join(lines))
+                f.flush()
+            except OSError:
+                # Écriture partielle : le fichier revient à sa taille indexée
+                f.truncate(segment.size)
+                raise
+        # L'index n'est mis à jour qu'une fois les lignes écrites
+        offset = segment.size
+        for record, line in zip(records, lines):
+            segment.add(offset, record)
+            offset += len(line)
+        segment.size = offset
+
+    # ==================== RECHERCHE ====================
+
+    async def search(self, guild_id, user_id=None, log_type=None, since=None, until=None, limit=20):
+        """Derniers enregistrements d'un serveur (du plus récent au plus ancien)"""
+        self.searches += 1
+        await self.flush()
+        guild_id = str(guild_id)
+        user_id = str(user_id) if user_id else None
+
+        def query():
+            results = []
+            for segment in reversed(self.segments):
+                if (since and segment.end < since) or (until and segment.start > until):
+                    continue
+                positions = segment.positions(guild_id, user_id)
+                if not positions:
+                    continue
+                # Lecture par blocs en partant de la fin du segment
+                for stop in range(len(positions), 0, -100):
+                    chunk = positions[max(0, stop - 100):stop]
+                    for record in reversed(_read_records(segment.path, chunk)):
+                        if log_type and record["type"] != log_type:
+                            continue
+                        if (since and record["t"] < since) or (until and record["t"] > until):
+                            continue
+                        results.append(record)
+                        if len(results) >= limit:
+                            return results
+            return results
+        return await self.run(query)
+
+    # ==================== RÉTENTION ====================
+
+    async def compact(self):
+        """Supprime les segments expirés et réécrit ceux qui chevauchent la limite de rétention"""
+        if not self.retention:
+            return
+
+        def run():
+            cutoff = time.time() - self.retention
+            removed = 0
+            kept = []
+            for i, segment in enumerate(self.segments):
+                is_active = i == len(self.segments) - 1
+                if segment.end < cutoff and not is_active:
+                    _remove_segment(segment)
+                    removed += segment.count
+                    continue
+                if segment.start < cutoff and not is_active:
+                    before = segment.count
+                    segment = self._rewrite(segment, cutoff)
+                    removed += before - (segment.count if segment else 0)
+                    if segment is None:
+                        continue
+                kept.append(segment)
+            self.segments = kept
+            return removed
+
+        removed = await self.run(run)
+        self.removed += removed
+        if removed:
+            print(f"🧹 Archive des logs : {removed} enregistrement(s) expiré(s) supprimé(s)")
+
+    def _rewrite(self, segment, cutoff):
+        """Copie les enregistrements encore valides dans un nouveau segment (None s'il n'en reste aucun)"""
+        with open(segment.path, "rb") as f:
+            lines = [line for line in f if (_record_time(line) or 0) >= cutoff]
+
+        if not lines:
+            _remove_segment(segment)
+            return None
+
+        first = _record_time(lines[0])
+        new = Segment(_segment_path(self.directory, first), first)
+        tmp_path = new.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(lines))
+        # Le nouveau fichier est en place avant la suppression de l'ancien
+        os.replace(tmp_path, new.path)
+        if segment.path != new.path:
+            _remove_segment(segment)
+        _scan(new)
+        _write_index(new)
+        return new
+
+    def stats(self):
+        return {
+            "segments": len(self.segments),
+            "records": sum(segment.count for segment in self.segments) + len(self._buffer),
+            "bytes": sum(segment.size for segment in self.segments),
+            "written": self.written,
+            "searches": self.searches,
+            "removed": self.removed,
+        }
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush(write_index=True)
+        self._executor.shutdown(wait=True)
+
+
+async def get_archive(bot):
+    """Retourne l'archive des logs partagée du bot (ouverte au premier appel)"""
+    archive = getattr(bot, "archive", None)
+    if archive is None:
+        archive = bot.archive = LogArchive()
+        await archive.open()
+    return archive
+
+
+async def close_archive(bot):
+    archive = getattr(bot, "archive", None)
+    if archive is not None:
+        await archive.close()
+        bot.archive = None
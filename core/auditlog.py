@@ -0,0 +1,103 @@
+import asyncio
+
+import discord
+
+WINDOW = 1.0        # délai de regroupement (les entrées du journal arrivent avec un léger retard)
+MIN_FETCH = 5       # entrées lues au minimum par requête
+MAX_FETCH = 500     # plafond (pagination automatique par 100)
+
+
+class _Batch:
+    __slots__ = ("waiters",)
+
+    def __init__(self):
+        self.waiters = []  # (target_id, max_age, future)
+
+
+class AuditLogCoalescer:
+    """Recherche partagée dans le journal d'audit.
+
+    Les demandes d'un même serveur et d'une même action reçues pendant
+    `window` secondes sont regroupées en une seule lecture paginée ; chaque
+    entrée est ensuite attribuée en mémoire à tous les écouteurs qui l'attendent.
+    """
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._batches = {}  # (guild_id, action) -> _Batch
+        self._tasks = set()
+
+        # Métriques
+        self.lookups = 0
+        self.fetches = 0
+        self.matched = 0
+        self.errors = 0
+
+    async def find(self, guild, action, target_id=None, max_age=None):
+        """Retourne l'entrée la plus récente pour `target_id` (la plus récente tout court si None).
+
+        `max_age` (secondes) écarte les entrées trop anciennes.
+        """
+        self.lookups += 1
+        key = (guild.id, action)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            task = asyncio.create_task(self._run(key, guild, action, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        future = asyncio.get_running_loop().create_future()
+        batch.waiters.append((target_id, max_age, future))
+        return await future
+
+    async def _run(self, key, guild, action, batch):
+        await asyncio.sleep(self.window)
+        # Les demandes suivantes ouvriront un nouveau lot
+        self._batches.pop(key, None)
+
+        targets = {target_id for target_id, _, _ in batch.waiters}
+        limit = min(MAX_FETCH, max(MIN_FETCH, len(targets) + MIN_FETCH))
+
+        latest = None
+        by_target = {}
+        try:
+            self.fetches += 1
+            async for entry in guild.audit_logs(limit=limit, action=action):
+                if latest is None:
+                    latest = entry
+                target = getattr(entry.target, "id", None)
+                if target in targets:
+                    by_target.setdefault(target, entry)
+                    if len(by_target) == len(targets - {None}):
+                        break
+        except Exception as e:
+            self.errors += 1
+            print(f"❌ Erreur journal d'audit ({action.name}) : {e}")
+
+        now = discord.utils.utcnow()
+        for target_id, max_age, future in batch.waiters:
+            entry = latest if target_id is None else by_target.get(target_id)
+            if entry is not None and max_age is not None and (now - entry.created_at).total_seconds() > max_age:
+                entry = None
+            if entry is not None:
+                self.matched += 1
+            if not future.done():
+                future.set_result(entry)
+
+    def stats(self):
+        return {
+            "lookups": self.lookups,
+            "fetches": self.fetches,
+            "matched": self.matched,
+            "errors": self.errors,
+            "pending": sum(len(batch.waiters) for batch in self._batches.values()),
+        }
+
+
+def get_auditlog(bot):
+    """Retourne le service de journal d'audit partagé du bot"""
+    auditlog = getattr(bot, "auditlog", None)
+    if auditlog is None:
+        auditlog = bot.auditlog = AuditLogCoalescer()
+    return auditlog
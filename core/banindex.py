@@ -0,0 +1,117 @@
+import asyncio
+
+
+class GuildBans:
+    """Bannissements d'un serveur : user_id -> (nom, raison), dans l'ordre d'ajout"""
+
+    def __init__(self):
+        self.entries = {}
+        self.ready = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def snapshot(self, query=None):
+        """Liste figée des entrées (filtrée par ID exact ou nom partiel), derniers ajouts en tête"""
+        items = [(user_id, name, reason) for user_id, (name, reason) in self.entries.items()]
+        items.reverse()
+        if query:
+            query = query.strip().lower()
+            if query.strip("<@!>").isdigit():
+                user_id = int(query.strip("<@!>"))
+                return [item for item in items if item[0] == user_id]
+            return [item for item in items if query in item[1].lower()]
+        return items
+
+
+class BanIndex:
+    """Index en mémoire des bannissements, par serveur.
+
+    Chargé une fois par serveur (lecture paginée de tous les bans, au
+    premier besoin), puis tenu à jour par les événements de ban / unban.
+    La consultation ne fait ensuite plus aucun appel REST. Après une
+    reconnexion sans reprise de session ou le retour d'un serveur
+    indisponible, l'index est oublié et rechargé à la demande suivante.
+    """
+
+    def __init__(self):
+        self.guilds = {}   # guild_id -> GuildBans
+        self._builds = {}  # guild_id -> tâche de chargement en cours
+
+        # Métriques
+        self.builds = 0
+        self.events = 0
+
+    async def get(self, guild):
+        """Bannissements du serveur (chargés au premier appel)"""
+        bans = self.guilds.get(guild.id)
+        if bans is not None and bans.ready:
+            return bans
+
+        task = self._builds.get(guild.id)
+        if task is None:
+            task = self._builds[guild.id] = asyncio.create_task(self._build(guild))
+            task.add_done_callback(lambda _: self._builds.pop(guild.id, None))
+        return await asyncio.shield(task)
+
+    async def _build(self, guild):
+        # Les événements reçus pendant le chargement s'appliquent au même dictionnaire
+        bans = self.guilds[guild.id] = GuildBans()
+        try:
+            async for entry in guild.bans(limit=None):
+                bans.entries.setdefault(entry.user.id, (str(entry.user), entry.reason))
+        except Exception:
+            self.guilds.pop(guild.id, None)
+            raise
+        bans.ready = True
+        self.builds += 1
+        return bans
+
+    def count(self, guild_id):
+        """Nombre de bans si le serveur est indexé, sinon None"""
+        bans = self.guilds.get(guild_id)
+        return len(bans) if bans is not None and bans.ready else None
+
+    # ==================== ÉVÉNEMENTS ====================
+
+    def add(self, guild_id, user, reason=None):
+        bans = self.guilds.get(guild_id)
+        if bans is not None:
+            self.events += 1
+            bans.entries.pop(user.id, None)
+            bans.entries[user.id] = (str(user), reason)
+
+    def set_reason(self, guild_id, user_id, reason):
+        bans = self.guilds.get(guild_id)
+        entry = bans.entries.get(user_id) if bans is not None else None
+        if entry is not None:
+            bans.entries[user_id] = (entry[0], reason)
+
+    def remove(self, guild_id, user_id):
+        bans = self.guilds.get(guild_id)
+        if bans is not None:
+            self.events += 1
+            bans.entries.pop(user_id, None)
+
+    def drop(self, guild_id):
+        self.guilds.pop(guild_id, None)
+
+    def clear(self):
+        """Oublie tous les serveurs (reconnexion : des événements ont pu être manqués)"""
+        self.guilds.clear()
+
+    def stats(self):
+        return {
+            "guilds": sum(1 for bans in self.guilds.values() if bans.ready),
+            "bans": sum(len(bans) for bans in self.guilds.values()),
+            "builds": self.builds,
+            "events": self.events,
+        }
+
+
+def get_ban_index(bot):
+    """Retourne l'index des bannissements partagé du bot"""
+    index = getattr(bot, "ban_index", None)
+    if index is None:
+        index = bot.ban_index = BanIndex()
+    return index
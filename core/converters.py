@@ -0,0 +1,42 @@
+from discord.ext import commands
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "j": 86400, "d": 86400}
+DURATION_NAMES = ((86400, "jour"), (3600, "heure"), (60, "minute"), (1, "seconde"))
+
+
+def describe_duration(seconds):
+    """Durée lisible dans la plus grande unité exacte : `60 jours`, `1 seconde`"""
+    for unit, name in DURATION_NAMES:
+        if seconds % unit == 0:
+            count = seconds // unit
+            return f"{count} {name}{'s' if count > 1 else ''}"
+
+
+def parse_duration(argument):
+    """Durée en secondes (`90`, `30s`, `10m`, `2h`, `1j`) ; None si le format est invalide"""
+    value = argument.lower()
+    unit = DURATION_UNITS.get(value[-1:])
+    number = value[:-1] if unit else value
+    if not number.isdigit():
+        return None
+    return int(number) * (unit or 1)
+
+
+class Duration(commands.Converter):
+    """Durée en secondes : `90`, `30s`, `10m`, `2h`, `1j` (bornes optionnelles)"""
+
+    def __init__(self, minimum=1, maximum=None):
+        self.minimum = minimum
+        self.maximum = maximum
+
+    async def convert(self, ctx, argument):
+        seconds = parse_duration(argument)
+        if seconds is None:
+            raise commands.BadArgument(f"Durée invalide : `{argument}` (ex : `30s`, `10m`, `2h`, `1j`)")
+        if seconds < self.minimum or (self.maximum is not None and seconds > self.maximum):
+            if self.maximum is None:
+                raise commands.BadArgument(f"La durée doit être d'au moins {describe_duration(self.minimum)}.")
+            raise commands.BadArgument(
+                f"La durée doit être comprise entre {describe_duration(self.minimum)} et {describe_duration(self.maximum)}."
+            )
+        return seconds
@@ -0,0 +1,58 @@
+import time
+from collections import deque
+
+DEFAULT_TTL = 10.0
+DEFAULT_MAX_SIZE = 10000
+
+
+class RecentKeys:
+    """Fenêtre glissante de clés déjà vues (anti-doublon).
+
+    Les clés sont gardées dans l'ordre d'arrivée (deque) avec leur heure
+    dans un dict : ajout, recherche et expiration en O(1) amorti. La taille
+    est bornée : au-delà de `max_size`, les plus anciennes sont oubliées.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._order = deque()
+        self._seen = {}
+
+        # Métriques
+        self.blocked = 0
+        self.evicted = 0
+
+    def _expire(self, now):
+        order = self._order
+        while order and now - order[0][0] >= self.ttl:
+            del self._seen[order.popleft()[1]]
+
+    def check(self, key):
+        """Retourne None si la clé est nouvelle (et l'enregistre),
+        sinon le temps écoulé depuis son premier passage."""
+        now = time.monotonic()
+        self._expire(now)
+
+        seen_at = self._seen.get(key)
+        if seen_at is not None:
+            self.blocked += 1
+            return now - seen_at
+
+        self._seen[key] = now
+        self._order.append((now, key))
+        if len(self._order) > self.max_size:
+            # Plafond atteint : on oublie la plus ancienne clé encore valide
+            del self._seen[self._order.popleft()[1]]
+            self.evicted += 1
+        return None
+
+    def __len__(self):
+        return len(self._seen)
+
+    def stats(self):
+        return {
+            "tracked": len(self._seen),
+            "blocked": self.blocked,
+            "evicted": self.evicted,
+        }
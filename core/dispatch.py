@@ -0,0 +1,130 @@
+import time
+from collections import deque, namedtuple
+
+# Flux disponibles :
+#   command : message humain avec préfixe, auteur non blacklisté
+#   chat    : message humain sur un serveur, sans préfixe
+#   dm      : message humain en MP, sans préfixe
+STREAMS = ("command", "chat", "dm")
+
+MessageInfo = namedtuple("MessageInfo", "is_bot is_dm is_command blacklisted stream")
+
+
+class Subscriber:
+    __slots__ = ("name", "callback", "last", "calls", "errors", "total_ms", "_durations")
+
+    def __init__(self, name, callback, last=False):
+        self.name = name
+        self.callback = callback
+        self.last = last
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self._durations = deque(maxlen=512)
+
+    def stats(self):
+        durations = sorted(self._durations)
+        p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))] if durations else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": self.total_ms,
+            "avg_ms": self.total_ms / self.calls if self.calls else 0.0,
+            "p99_ms": p99,
+        }
+
+
+class MessageDispatcher:
+    """Classe chaque message une seule fois puis le distribue aux abonnés du flux.
+
+    Les cogs s'abonnent à un flux (`subscribe("chat", callback)`) au lieu
+    d'écouter `on_message` et de refaire les mêmes vérifications.
+    Le temps passé dans chaque abonné est mesuré.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.streams = {stream: [] for stream in STREAMS}
+        self.counts = dict.fromkeys(STREAMS + ("bot", "blacklisted"), 0)
+
+    # ==================== ABONNEMENTS ====================
+
+    def subscribe(self, stream, callback, name=None, last=False):
+        """Abonne `callback` au flux ; `last` le place après les autres abonnés, quel que soit l'ordre d'abonnement"""
+        if stream not in self.streams:
+            raise ValueError(f"Flux inconnu : {stream}")
+        self.unsubscribe(name or callback.__qualname__, stream)
+        subscribers = self.streams[stream]
+        subscribers.append(Subscriber(name or callback.__qualname__, callback, last))
+        subscribers.sort(key=lambda sub: sub.last)
+
+    def unsubscribe(self, name, stream=None):
+        for key in ([stream] if stream else self.streams):
+            self.streams[key] = [sub for sub in self.streams[key] if sub.name != name]
+
+    # ==================== CLASSEMENT ====================
+
+    def get_prefixes(self, message):
+        prefix = self.bot.command_prefix
+        if callable(prefix):
+            prefix = prefix(self.bot, message)
+        return (prefix,) if isinstance(prefix, str) else tuple(prefix)
+
+    def classify(self, message):
+        author = message.author
+        if author.bot:
+            return MessageInfo(True, message.guild is None, False, False, None)
+
+        is_dm = message.guild is None
+        is_command = message.content.startswith(self.get_prefixes(message))
+        blacklisted = author.id in getattr(self.bot, "blacklisted_users", ())
+
+        if is_command:
+            stream = None if blacklisted else "command"
+        else:
+            stream = "dm" if is_dm else "chat"
+        return MessageInfo(False, is_dm, is_command, blacklisted, stream)
+
+    # ==================== DISTRIBUTION ====================
+
+    async def dispatch(self, message):
+        info = self.classify(message)
+        if info.is_bot:
+            self.counts["bot"] += 1
+            return info
+        if info.stream is None:
+            self.counts["blacklisted"] += 1
+            return info
+
+        self.counts[info.stream] += 1
+        for sub in self.streams[info.stream]:
+            start = time.perf_counter()
+            try:
+                await sub.callback(message)
+            except Exception as e:
+                sub.errors += 1
+                print(f"❌ Erreur abonné {sub.name} ({info.stream}) : {e}")
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                sub.calls += 1
+                sub.total_ms += elapsed_ms
+                sub._durations.append(elapsed_ms)
+        return info
+
+    def stats(self):
+        return {
+            "counts": dict(self.counts),
+            "subscribers": {
+                f"{stream}:{sub.name}": sub.stats()
+                for stream, subs in self.streams.items()
+                for sub in subs
+            },
+        }
+
+
+def get_dispatcher(bot):
+    """Retourne le distributeur de messages partagé du bot"""
+    dispatcher = getattr(bot, "dispatcher", None)
+    if dispatcher is None:
+        dispatcher = bot.dispatcher = MessageDispatcher(bot)
+    return dispatcher
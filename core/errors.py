@@ -0,0 +1,19 @@
+from discord.ext import commands
+
+
+class InsufficientLevel(commands.CheckFailure):
+    """Niveau de permission du bot insuffisant pour la commande"""
+
+    def __init__(self, level, required, level_name, required_name):
+        self.level = level
+        self.required = required
+        self.level_name = level_name
+        self.required_name = required_name
+        super().__init__(f"Niveau {required_name} requis (actuel : {level_name})")
+
+
+class PermissionsUnavailable(commands.CheckFailure):
+    """Le cog PermissionsSystem n'est pas chargé"""
+
+    def __init__(self):
+        super().__init__("Système de permissions non chargé.")
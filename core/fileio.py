@@ -0,0 +1,177 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 2
+MAX_QUEUED = 64
+
+
+def atomic_write_text(path, text):
+    """Écrit un fichier de façon atomique (fichier temporaire + rename)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _append_text(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+class AsyncFileIO:
+    """Lecture / écriture de fichiers sur un petit pool de threads borné.
+
+    Les écritures concurrentes d'un même fichier sont fusionnées : seul le
+    dernier état demandé est écrit, et tous les appelants sont notifiés.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, max_queued=MAX_QUEUED):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fileio")
+        self._slots = asyncio.Semaphore(max_queued)
+        self._pending = {}       # chemin -> [données, indent, future]
+        self._writing = {}       # chemin -> tâche d'écriture en cours
+        self._append_locks = {}  # chemin -> verrou (ordre des ajouts)
+        self._queued = 0
+
+        # Métriques
+        self.writes = 0
+        self.coalesced = 0
+        self.appends = 0
+        self.reads = 0
+        self._durations = deque(maxlen=512)
+
+    async def _submit(self, func, *args):
+        async with self._slots:
+            self._queued += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, func, *args)
+            finally:
+                self._queued -= 1
+
+    # ==================== LECTURE ====================
+
+    async def read_text(self, path, default=None):
+        if not os.path.exists(path):
+            return default
+        self.reads += 1
+        return await self._submit(_read_text, path)
+
+    async def read_bytes(self, path, default=None):
+        if not os.path.exists(path):
+            return default
+        self.reads += 1
+        return await self._submit(_read_bytes, path)
+
+    async def read_json(self, path, default=None):
+        text = await self.read_text(path)
+        if text is None:
+            return {} if default is None else default
+        return json.loads(text)
+
+    # ==================== ÉCRITURE ====================
+
+    async def write_json(self, path, data, indent=4):
+        """Écrit `data` en JSON de façon atomique (écritures fusionnées par fichier)"""
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(path)
+        if pending is None:
+            pending = self._pending[path] = [data, indent, loop.create_future()]
+        else:
+            pending[0], pending[1] = data, indent
+            self.coalesced += 1
+        future = pending[2]
+
+        if path not in self._writing:
+            self._writing[path] = asyncio.create_task(self._drain(path))
+        # Futur partagé par les appels fusionnés : l'annulation d'un appelant ne doit pas toucher les autres
+        await asyncio.shield(future)
+
+    async def _drain(self, path):
+        try:
+            while path in self._pending:
+                data, indent, future = self._pending.pop(path)
+                try:
+                    # Sérialisé au dernier moment : seul l'état le plus récent est écrit
+                    text = json.dumps(data, indent=indent, ensure_ascii=False)
+                    start = time.perf_counter()
+                    await self._submit(atomic_write_text, path, text)
+                    self._durations.append((time.perf_counter() - start) * 1000)
+                    self.writes += 1
+                    if not future.done():
+                        future.set_result(None)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+        finally:
+            self._writing.pop(path, None)
+
+    async def append_text(self, path, text):
+        lock = self._append_locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            await self._submit(_append_text, path, text)
+            self.appends += 1
+
+    # ==================== ÉTAT ====================
+
+    @property
+    def queue_depth(self):
+        return self._queued + len(self._pending)
+
+    def stats(self):
+        durations = sorted(self._durations)
+        p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))] if durations else 0.0
+        return {
+            "queue_depth": self.queue_depth,
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "appends": self.appends,
+            "reads": self.reads,
+            "p99_write_ms": p99,
+        }
+
+    async def close(self):
+        """Attend les écritures en cours puis arrête le pool"""
+        while self._writing:
+            await asyncio.gather(*self._writing.values(), return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+
+def get_fileio(bot):
+    """Retourne le service d'I/O fichiers partagé du bot"""
+    fileio = getattr(bot, "fileio", None)
+    if fileio is None:
+        fileio = bot.fileio = AsyncFileIO()
+    return fileio
+
+
+async def close_fileio(bot):
+    fileio = getattr(bot, "fileio", None)
+    if fileio is not None:
+        await fileio.close()
+        bot.fileio = None
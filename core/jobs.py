@@ -0,0 +1,235 @@
+import asyncio
+import time
+from collections import deque
+
+import discord
+
+from core.fileio import get_fileio
+
+JOBS_FILE = "member_jobs.json"
+WORKERS = 4                 # requêtes simultanées par tâche
+PROGRESS_INTERVAL = 5.0     # secondes entre deux mises à jour du message / du point de reprise
+MAX_RETRIES = 5
+
+TARGETS = {
+    "all": lambda member: True,
+    "bots": lambda member: member.bot,
+    "humans": lambda member: not member.bot,
+}
+
+
+def plan_role_job(guild, role, action, target):
+    """IDs des membres à modifier : ceux qui ont déjà (ou n'ont pas) le rôle sont écartés"""
+    wanted = TARGETS[target]
+    has_role = action == "remove"
+    return [
+        member.id for member in guild.members
+        if wanted(member) and (member.get_role(role.id) is not None) == has_role
+    ]
+
+
+class MemberJob:
+    """Ajout / retrait d'un rôle sur un ensemble de membres"""
+
+    def __init__(self, guild_id, channel_id, message_id, author_id, action, role_id, target,
+                 reason=None, done=0, failed=0, skipped=0, started=None):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.author_id = author_id
+        self.action = action
+        self.role_id = role_id
+        self.target = target
+        self.reason = reason
+        self.done = done
+        self.failed = failed
+        self.skipped = skipped
+        self.started = started or time.time()
+        self.queue = deque()
+        self.in_flight = 0
+        self.cancelled = False
+        self.finished = False
+        self.task = None
+
+    @property
+    def remaining(self):
+        return len(self.queue) + self.in_flight
+
+    @property
+    def total(self):
+        return self.done + self.failed + self.skipped + self.remaining
+
+    def to_dict(self):
+        return {
+            "channel_id": self.channel_id,
+            "message_id": self.message_id,
+            "author_id": self.author_id,
+            "action": self.action,
+            "role_id": self.role_id,
+            "target": self.target,
+            "reason": self.reason,
+            "done": self.done,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "started": self.started,
+        }
+
+
+class MemberJobEngine:
+    """Exécute les tâches de masse sur les membres (une par serveur).
+
+    Chaque tâche utilise un petit groupe de workers : discord.py suit les
+    buckets de limite de débit de chaque route et met les requêtes en attente,
+    les 429 restants sont réessayés avec un délai croissant. Le point de
+    reprise ne contient que les paramètres et les compteurs : au redémarrage
+    la liste est recalculée, les membres déjà traités étant écartés d'office.
+    """
+
+    def __init__(self, bot, workers=WORKERS, path=JOBS_FILE):
+        self.bot = bot
+        self.workers = workers
+        self.path = path
+        self.jobs = {}        # guild_id -> MemberJob
+        self.render = None    # callback(job, guild, role) -> Embed du message de suivi
+        self._stopping = False
+
+    # ==================== CYCLE DE VIE ====================
+
+    def start(self, job, member_ids=None):
+        """Lance la tâche ; sans `member_ids`, la liste est calculée une fois le bot prêt"""
+        if member_ids is not None:
+            job.queue.extend(member_ids)
+        self.jobs[job.guild_id] = job
+        job.task = asyncio.create_task(self._run(job, planned=member_ids is not None))
+        return job
+
+    def cancel(self, guild_id):
+        job = self.jobs.get(guild_id)
+        if job is None or job.finished:
+            return None
+        job.cancelled = True
+        return job
+
+    async def resume(self):
+        """Reprend les tâches interrompues par un redémarrage"""
+        saved = await get_fileio(self.bot).read_json(self.path, {})
+        for guild_id, data in saved.items():
+            if int(guild_id) not in self.jobs:
+                self.start(MemberJob(int(guild_id), **data))
+        if saved:
+            print(f"🔁 {len(saved)} tâche(s) de masse reprise(s)")
+
+    async def stop(self):
+        """Arrêt du bot : les tâches en cours gardent leur point de reprise"""
+        running = [job for job in self.jobs.values() if not job.finished]
+        self._stopping = True
+        try:
+            for job in running:
+                job.task.cancel()
+            await asyncio.gather(*(job.task for job in running), return_exceptions=True)
+            await self.checkpoint()
+        finally:
+            self._stopping = False
+        for job in running:
+            self.jobs.pop(job.guild_id, None)
+
+    async def checkpoint(self):
+        data = {
+            str(guild_id): job.to_dict()
+            for guild_id, job in self.jobs.items()
+            if not job.finished and not job.cancelled
+        }
+        await get_fileio(self.bot).write_json(self.path, data)
+
+    # ==================== EXÉCUTION ====================
+
+    async def _run(self, job, planned):
+        guild = role = None
+        try:
+            await self.bot.wait_until_ready()
+            guild = self.bot.get_guild(job.guild_id)
+            role = guild.get_role(job.role_id) if guild else None
+            if role is None:
+                return
+
+            if not planned:
+                job.queue.extend(plan_role_job(guild, role, job.action, job.target))
+
+            await self.checkpoint()
+            progress = asyncio.create_task(self._progress_loop(job, guild, role))
+            workers = [asyncio.create_task(self._worker(job, guild, role)) for _ in range(self.workers)]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                progress.cancel()
+                for worker in workers:
+                    worker.cancel()
+        finally:
+            # Arrêt du bot : la tâche reste dans le point de reprise écrit par stop()
+            if not self._stopping:
+                await self._finish(job, guild, role)
+
+    async def _finish(self, job, guild, role):
+        job.finished = True
+        if self.jobs.get(job.guild_id) is job:
+            del self.jobs[job.guild_id]
+        try:
+            await self.checkpoint()
+            if role is not None:
+                await self._update_message(job, guild, role)
+        except Exception as e:
+            print(f"❌ Erreur fin de tâche de masse : {e}")
+
+    async def _worker(self, job, guild, role):
+        while job.queue and not job.cancelled:
+            member = guild.get_member(job.queue.popleft())
+            if member is None:
+                job.skipped += 1
+                continue
+
+            job.in_flight += 1
+            try:
+                for attempt in range(MAX_RETRIES):
+                    try:
+                        if job.action == "add":
+                            await member.add_roles(role, reason=job.reason)
+                        else:
+                            await member.remove_roles(role, reason=job.reason)
+                        job.done += 1
+                        break
+                    except discord.HTTPException as e:
+                        if e.status != 429 and e.status < 500:
+                            job.failed += 1
+                            break
+                        await asyncio.sleep(min(60, 2 ** attempt))
+                else:
+                    job.failed += 1
+            finally:
+                job.in_flight -= 1
+
+    async def _progress_loop(self, job, guild, role):
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            # Une erreur ponctuelle (écriture, rendu) ne doit pas arrêter le suivi
+            try:
+                await self.checkpoint()
+                await self._update_message(job, guild, role)
+            except Exception as e:
+                print(f"❌ Erreur suivi de tâche de masse : {e}")
+
+    async def _update_message(self, job, guild, role):
+        channel = guild.get_channel(job.channel_id)
+        if channel is None or self.render is None:
+            return
+        try:
+            await channel.get_partial_message(job.message_id).edit(content=None, embed=self.render(job, guild, role))
+        except discord.HTTPException:
+            pass
+
+
+def get_member_jobs(bot):
+    """Retourne le moteur de tâches de masse partagé du bot"""
+    jobs = getattr(bot, "member_jobs", None)
+    if jobs is None:
+        jobs = bot.member_jobs = MemberJobEngine(bot)
+    return jobs
@@ -0,0 +1,121 @@
+import asyncio
+from collections import deque
+
+from core.logsink import get_logsink
+
+WINDOW = 1.5            # secondes d'accumulation avant envoi
+MAX_QUEUED = 250        # embeds en attente max par salon
+MAX_EMBEDS = 10         # limites Discord par message
+MAX_CHARS = 6000
+
+
+def pack_embeds(embeds, max_embeds=MAX_EMBEDS, max_chars=MAX_CHARS):
+    """Regroupe les embeds en messages (10 embeds / 6000 caractères max), dans l'ordre"""
+    batch, size = [], 0
+    for embed in embeds:
+        length = len(embed)
+        if batch and (len(batch) >= max_embeds or size + length > max_chars):
+            yield batch
+            batch, size = [], 0
+        batch.append(embed)
+        size += length
+    if batch:
+        yield batch
+
+
+async def send_to_channel(channel, embeds):
+    await channel.send(embeds=embeds)
+
+
+class LogBatcher:
+    """File d'envoi des logs par salon de destination.
+
+    Les embeds reçus pendant `window` secondes partent ensemble, jusqu'à
+    10 par message. La file de chaque salon est bornée : au-delà, les
+    nouveaux logs sont comptés comme débordement et ignorés.
+    """
+
+    def __init__(self, window=WINDOW, max_queued=MAX_QUEUED, sender=send_to_channel):
+        self.window = window
+        self.max_queued = max_queued
+        self.sender = sender
+        self._queues = {}   # channel_id -> [salon, deque d'embeds]
+        self._timers = {}   # channel_id -> tâche d'envoi différé
+        self._locks = {}    # channel_id -> verrou (ordre des envois)
+
+        # Métriques
+        self.queued = 0
+        self.sent_messages = 0
+        self.sent_embeds = 0
+        self.overflow = 0
+        self.dropped = 0
+
+    def enqueue(self, channel, embed):
+        """Ajoute un embed à la file du salon ; False si la file est pleine"""
+        entry = self._queues.get(channel.id)
+        if entry is None:
+            entry = self._queues[channel.id] = [channel, deque()]
+        queue = entry[1]
+        if len(queue) >= self.max_queued:
+            self.overflow += 1
+            return False
+
+        queue.append(embed)
+        self.queued += 1
+        if channel.id not in self._timers:
+            self._timers[channel.id] = asyncio.create_task(self._flush_later(channel.id))
+        return True
+
+    async def _flush_later(self, channel_id):
+        try:
+            await asyncio.sleep(self.window)
+        finally:
+            if self._timers.get(channel_id) is asyncio.current_task():
+                del self._timers[channel_id]
+        await self._flush_channel(channel_id)
+
+    async def _flush_channel(self, channel_id):
+        lock = self._locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            entry = self._queues.pop(channel_id, None)
+            if entry is None:
+                return
+            channel, queue = entry
+            for embeds in pack_embeds(queue):
+                try:
+                    await self.sender(channel, embeds)
+                    self.sent_messages += 1
+                    self.sent_embeds += len(embeds)
+                except Exception as e:
+                    self.dropped += len(embeds)
+                    print(f"❌ Erreur envoi logs ({getattr(channel, 'name', channel_id)}) : {e}")
+
+    async def flush(self):
+        """Envoie immédiatement tout ce qui est en attente (salons dans l'ordre d'arrivée)"""
+        for task in list(self._timers.values()):
+            task.cancel()
+        self._timers.clear()
+        for channel_id in list(self._queues):
+            await self._flush_channel(channel_id)
+
+    @property
+    def pending(self):
+        return sum(len(queue) for _, queue in self._queues.values())
+
+    def stats(self):
+        return {
+            "pending": self.pending,
+            "queued": self.queued,
+            "messages": self.sent_messages,
+            "embeds": self.sent_embeds,
+            "overflow": self.overflow,
+            "dropped": self.dropped,
+        }
+
+
+def get_logqueue(bot):
+    """Retourne la file d'envoi des logs partagée du bot"""
+    logqueue = getattr(bot, "logqueue", None)
+    if logqueue is None:
+        logqueue = bot.logqueue = LogBatcher(sender=get_logsink(bot).send)
+    return logqueue
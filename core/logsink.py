@@ -0,0 +1,115 @@
+import asyncio
+import os
+
+import aiohttp
+import discord
+
+# Envoi des logs par webhook (désactivé par défaut) : LOG_WEBHOOKS=1
+ENABLED = os.getenv("LOG_WEBHOOKS", "0").lower() in ("1", "true", "yes", "on")
+WEBHOOK_NAME = "Kaizoku Logs"
+MAX_CONNECTIONS = 20
+
+
+class LogSink:
+    """Destination finale des logs.
+
+    Si les webhooks sont activés, chaque salon de logs reçoit un webhook
+    (créé une fois puis mis en cache) utilisé via une session aiohttp
+    partagée : les logs ont leurs propres limites de débit et ne
+    ralentissent plus les réponses aux commandes. Sans permission
+    « Gérer les webhooks », retour à `channel.send`.
+    """
+
+    def __init__(self, bot, enabled=ENABLED):
+        self.bot = bot
+        self.enabled = enabled
+        self._session = None
+        self._webhooks = {}  # channel_id -> Webhook, ou None si indisponible
+        self._locks = {}     # channel_id -> verrou (une seule création par salon)
+
+        # Métriques
+        self.webhook_sends = 0
+        self.channel_sends = 0
+        self.created = 0
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS))
+        return self._session
+
+    async def get_webhook(self, channel):
+        if channel.id in self._webhooks:
+            return self._webhooks[channel.id]
+
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:
+            if channel.id in self._webhooks:
+                return self._webhooks[channel.id]
+
+            webhook = None
+            if isinstance(channel, discord.TextChannel) and channel.permissions_for(channel.guild.me).manage_webhooks:
+                try:
+                    existing = [
+                        hook for hook in await channel.webhooks()
+                        if hook.token and hook.user and hook.user.id == self.bot.user.id
+                    ]
+                    if existing:
+                        hook = existing[0]
+                    else:
+                        hook = await channel.create_webhook(name=WEBHOOK_NAME, reason="Envoi des logs")
+                        self.created += 1
+                    webhook = discord.Webhook.from_url(hook.url, session=self._get_session())
+                except discord.HTTPException as e:
+                    print(f"⚠️ Webhook indisponible pour #{channel.name} : {e}")
+            self._webhooks[channel.id] = webhook
+            return webhook
+
+    def forget(self, channel_id):
+        self._webhooks.pop(channel_id, None)
+
+    async def send(self, channel, embeds):
+        if self.enabled:
+            webhook = await self.get_webhook(channel)
+            if webhook is not None:
+                try:
+                    await webhook.send(
+                        embeds=embeds,
+                        username=self.bot.user.display_name,
+                        avatar_url=self.bot.user.display_avatar.url
+                    )
+                    self.webhook_sends += 1
+                    return
+                except (discord.NotFound, discord.Forbidden):
+                    # Webhook supprimé ou permissions retirées : on le recréera au prochain envoi
+                    self.forget(channel.id)
+
+        await channel.send(embeds=embeds)
+        self.channel_sends += 1
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "webhooks": sum(1 for hook in self._webhooks.values() if hook is not None),
+            "created": self.created,
+            "webhook_sends": self.webhook_sends,
+            "channel_sends": self.channel_sends,
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+def get_logsink(bot):
+    """Retourne la destination des logs partagée du bot"""
+    logsink = getattr(bot, "logsink", None)
+    if logsink is None:
+        logsink = bot.logsink = LogSink(bot)
+    return logsink
+
+
+async def close_logsink(bot):
+    logsink = getattr(bot, "logsink", None)
+    if logsink is not None:
+        await logsink.close()
+        bot.logsink = None
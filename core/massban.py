@@ -0,0 +1,97 @@
+import asyncio
+from collections import deque
+
+import discord
+
+BULK_SIZE = 200             # limite Discord d'un ban groupé
+WORKERS = 4                 # requêtes simultanées sans ban groupé
+MAX_TARGETS = 5000
+PROGRESS_INTERVAL = 3.0
+
+
+class MassBan:
+    """Bannissement d'une liste d'utilisateurs (IDs).
+
+    Les bans partent par lots de 200 via l'endpoint de ban groupé quand le
+    bot a aussi la permission Gérer le serveur ; sinon un par un, avec
+    quelques requêtes simultanées dont le débit est réglé par discord.py.
+    """
+
+    def __init__(self, guild, user_ids, reason=None, delete_message_seconds=0):
+        self.guild = guild
+        self.user_ids = list(user_ids)
+        self.reason = reason
+        self.delete_message_seconds = delete_message_seconds
+        self.banned = []
+        self.failed = []
+        self.finished = False
+
+    @property
+    def remaining(self):
+        return len(self.user_ids) - len(self.banned) - len(self.failed)
+
+    @property
+    def bulk(self):
+        return self.guild.me.guild_permissions.manage_guild
+
+    async def run(self, progress=None):
+        """Exécute les bans ; `progress(job)` est appelé régulièrement pendant l'opération"""
+        reporter = asyncio.create_task(self._progress_loop(progress)) if progress else None
+        try:
+            if self.bulk:
+                await self._run_bulk()
+            else:
+                await self._run_pipeline()
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+            self.finished = True
+        return self
+
+    async def _run_bulk(self):
+        for i in range(0, len(self.user_ids), BULK_SIZE):
+            chunk = self.user_ids[i:i + BULK_SIZE]
+            try:
+                result = await self.guild.bulk_ban(
+                    [discord.Object(id=user_id) for user_id in chunk],
+                    reason=self.reason,
+                    delete_message_seconds=self.delete_message_seconds
+                )
+            except discord.Forbidden:
+                raise
+            except discord.HTTPException:
+                # Discord rejette le lot entier quand aucun utilisateur n'a pu être banni
+                self.failed.extend(chunk)
+                continue
+            self.banned.extend(user.id for user in result.banned)
+            self.failed.extend(user.id for user in result.failed)
+
+    async def _run_pipeline(self):
+        queue = deque(self.user_ids)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(WORKERS)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _worker(self, queue):
+        while queue:
+            user_id = queue.popleft()
+            try:
+                await self.guild.ban(
+                    discord.Object(id=user_id),
+                    reason=self.reason,
+                    delete_message_seconds=self.delete_message_seconds
+                )
+                self.banned.append(user_id)
+            except discord.HTTPException:
+                self.failed.append(user_id)
+
+    async def _progress_loop(self, progress):
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            try:
+                await progress(self)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,113 @@
+"""Import unique des anciens fichiers JSON dans la base SQLite.
+
+Exécuté automatiquement à la première ouverture de la base, ou à la main :
+    python -m core.migrate
+"""
+import json
+import os
+
+MIGRATION_KEY = "json_migrated"
+
+ECONOMY_FILE = "economy.json"
+PERMISSIONS_FILE = "permissions.json"
+LOGS_FILE = "logs_config.json"
+TICKETS_FILE = "tickets_config.json"
+
+USER_KINDS = ("owners", "admins", "gs_users", "moderators", "supports")
+
+
+def read_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def migrate_json_files(conn, base_dir="."):
+    """Importe les fichiers JSON existants ; ne fait rien si déjà migré.
+
+    Retourne un résumé `{table: lignes importées}` (vide si rien à faire).
+    """
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (MIGRATION_KEY,)).fetchone()
+    if row:
+        return {}
+
+    summary = {}
+    with conn:
+        # Économie
+        economy = read_json(os.path.join(base_dir, ECONOMY_FILE))
+        conn.executemany(
+            "INSERT OR IGNORE INTO economy_accounts (user_id, xp, coins, last_daily) VALUES (?, ?, ?, ?)",
+            [
+                (user_id, stats.get("xp", 0), stats.get("coins", 0), stats.get("last_daily"))
+                for user_id, stats in economy.items()
+            ]
+        )
+        summary["economy_accounts"] = len(economy)
+
+        # Permissions
+        grants = []
+        for guild_id, guild_perms in read_json(os.path.join(base_dir, PERMISSIONS_FILE)).items():
+            for kind in USER_KINDS:
+                grants.extend((guild_id, kind, int(user_id), None) for user_id in guild_perms.get(kind, []))
+            grants.extend(
+                (guild_id, "roles", int(role_id), level)
+                for role_id, level in guild_perms.get("roles", {}).items()
+            )
+        conn.executemany(
+            "INSERT OR IGNORE INTO permission_grants (guild_id, kind, target_id, level) VALUES (?, ?, ?, ?)",
+            grants
+        )
+        summary["permission_grants"] = len(grants)
+
+        # Salons de logs (les types non configurés ne sont pas importés)
+        channels = [
+            (guild_id, log_type, channel_id)
+            for guild_id, config in read_json(os.path.join(base_dir, LOGS_FILE)).items()
+            for log_type, channel_id in config.items()
+            if channel_id
+        ]
+        conn.executemany(
+            "INSERT OR IGNORE INTO log_channels (guild_id, log_type, channel_id) VALUES (?, ?, ?)",
+            channels
+        )
+        summary["log_channels"] = len(channels)
+
+        # Tickets
+        tickets = read_json(os.path.join(base_dir, TICKETS_FILE))
+        for guild_id, config in tickets.items():
+            conn.execute(
+                "INSERT OR IGNORE INTO ticket_configs (guild_id, category_id, panel_channel_id, panel_message_id, "
+                "log_channel_id, support_role_id, ticket_count, types) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    guild_id,
+                    config.get("category_id"),
+                    config.get("panel_channel_id"),
+                    config.get("panel_message_id"),
+                    config.get("log_channel_id"),
+                    config.get("support_role_id"),
+                    config.get("ticket_count", 0),
+                    json.dumps(config.get("types", {}), ensure_ascii=False)
+                )
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO open_tickets (guild_id, user_id, channel_id) VALUES (?, ?, ?)",
+                [(guild_id, user_id, channel_id) for user_id, channel_id in config.get("open_tickets", {}).items()]
+            )
+        summary["ticket_configs"] = len(tickets)
+
+        conn.execute("INSERT INTO meta (key, value) VALUES (?, '1')", (MIGRATION_KEY,))
+
+    return summary
+
+
+if __name__ == "__main__":
+    import asyncio
+    from core.storage import Storage
+
+    async def main():
+        storage = Storage()
+        await storage.open()
+        await storage.close()
+
+    asyncio.run(main())
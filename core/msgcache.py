@@ -0,0 +1,116 @@
+import os
+from collections import OrderedDict, namedtuple
+
+# Budget mémoire approximatif (octets) et nombre de messages gardés par salon
+BUDGET = int(os.getenv("MESSAGE_CACHE_BUDGET", str(4 * 1024 * 1024)))
+PER_CHANNEL = int(os.getenv("MESSAGE_CACHE_PER_CHANNEL", "200"))
+MAX_CONTENT = 800       # longueur affichée dans les logs
+MAX_ATTACHMENTS = 5
+ENTRY_OVERHEAD = 160    # tuple, entiers et entrée de dictionnaire
+
+CachedMessage = namedtuple("CachedMessage", "author_id content attachments embeds")
+
+
+def _entry_size(entry):
+    return ENTRY_OVERHEAD + len(entry.content) + sum(len(name) for name in entry.attachments)
+
+
+class MessageContentCache:
+    """Contenu récent des messages (auteur, texte tronqué, pièces jointes), par salon.
+
+    Chaque salon garde ses `per_channel` derniers messages ; au-delà du
+    budget global, les salons les moins actifs perdent leurs plus anciens
+    messages en premier.
+    """
+
+    def __init__(self, budget=BUDGET, per_channel=PER_CHANNEL):
+        self.budget = budget
+        self.per_channel = per_channel
+        self.channels = OrderedDict()  # channel_id -> OrderedDict(message_id -> CachedMessage), du moins actif au plus actif
+        self.size = 0
+
+        # Métriques
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def add(self, message):
+        entry = CachedMessage(
+            message.author.id,
+            (message.content or "")[:MAX_CONTENT],
+            tuple(a.filename for a in message.attachments[:MAX_ATTACHMENTS]),
+            len(message.embeds)
+        )
+        self.put(message.channel.id, message.id, entry)
+
+    def put(self, channel_id, message_id, entry):
+        messages = self.channels.get(channel_id)
+        if messages is None:
+            messages = self.channels[channel_id] = OrderedDict()
+        else:
+            self.channels.move_to_end(channel_id)
+
+        old = messages.pop(message_id, None)
+        if old is not None:
+            self.size -= _entry_size(old)
+        messages[message_id] = entry
+        self.size += _entry_size(entry)
+
+        while len(messages) > self.per_channel:
+            self._evict_oldest(channel_id)
+        while self.size > self.budget and self.channels:
+            self._evict_oldest(next(iter(self.channels)))
+
+    def _evict_oldest(self, channel_id):
+        messages = self.channels[channel_id]
+        _, entry = messages.popitem(last=False)
+        self.size -= _entry_size(entry)
+        self.evicted += 1
+        if not messages:
+            del self.channels[channel_id]
+
+    def get(self, channel_id, message_id):
+        entry = self.channels.get(channel_id, {}).get(message_id)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def edit(self, channel_id, message_id, content):
+        """Met à jour le texte et retourne l'ancienne entrée (None si absente)"""
+        entry = self.get(channel_id, message_id)
+        if entry is not None:
+            self.put(channel_id, message_id, entry._replace(content=(content or "")[:MAX_CONTENT]))
+        return entry
+
+    def pop(self, channel_id, message_id):
+        messages = self.channels.get(channel_id)
+        entry = messages.pop(message_id, None) if messages else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.size -= _entry_size(entry)
+        if not messages:
+            del self.channels[channel_id]
+        return entry
+
+    def drop_channel(self, channel_id):
+        messages = self.channels.pop(channel_id, None)
+        if messages:
+            self.size -= sum(_entry_size(entry) for entry in messages.values())
+
+    def __len__(self):
+        return sum(len(messages) for messages in self.channels.values())
+
+    def stats(self):
+        return {
+            "messages": len(self),
+            "channels": len(self.channels),
+            "size": self.size,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+        }
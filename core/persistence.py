@@ -0,0 +1,102 @@
+import asyncio
+import time
+from collections import deque
+
+
+class WriteBehindStore:
+    """Stockage write-behind : les enregistrements modifiés sont marqués en mémoire
+    puis écrits par lots (intervalle, seuil de saturation ou arrêt du bot).
+
+    `flush_callback(batch, data)` reçoit une copie des enregistrements modifiés
+    (`{clé: enregistrement}`) et le dictionnaire complet.
+    """
+
+    def __init__(self, data, flush_callback, interval=30.0, high_water=500, name="store"):
+        self.data = data
+        self.flush_callback = flush_callback
+        self.interval = interval
+        self.high_water = high_water
+        self.name = name
+
+        self._dirty = set()
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._pending_flush = None
+
+        # Métriques
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.last_batch_size = 0
+        self._latencies = deque(maxlen=256)
+        self._batch_sizes = deque(maxlen=256)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Arrête la boucle et écrit les dernières modifications"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def mark_dirty(self, key):
+        self._dirty.add(key)
+        if len(self._dirty) >= self.high_water and (self._pending_flush is None or self._pending_flush.done()):
+            self._pending_flush = asyncio.create_task(self.flush())
+
+    @property
+    def dirty_count(self):
+        return len(self._dirty)
+
+    async def flush(self):
+        async with self._lock:
+            if not self._dirty:
+                return 0
+
+            keys = self._dirty
+            self._dirty = set()
+            batch = {key: dict(self.data[key]) for key in keys if key in self.data}
+
+            start = time.perf_counter()
+            try:
+                await self.flush_callback(batch, self.data)
+            except Exception as e:
+                # On remet les clés en attente pour le prochain passage
+                self._dirty |= keys
+                self.failed_flushes += 1
+                print(f"❌ Erreur flush {self.name}: {e}")
+                return 0
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.flush_count += 1
+            self.last_flush_ms = elapsed_ms
+            self.last_batch_size = len(batch)
+            self._latencies.append(elapsed_ms)
+            self._batch_sizes.append(len(batch))
+            return len(batch)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def stats(self):
+        latencies = sorted(self._latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+        return {
+            "dirty": len(self._dirty),
+            "flushes": self.flush_count,
+            "failed": self.failed_flushes,
+            "last_ms": self.last_flush_ms,
+            "p99_ms": p99,
+            "last_batch": self.last_batch_size,
+            "avg_batch": sum(self._batch_sizes) / len(self._batch_sizes) if self._batch_sizes else 0,
+            "max_batch": max(self._batch_sizes, default=0),
+        }
@@ -0,0 +1,43 @@
+PREFIXES_FILE = "prefixes.json"
+DEFAULT_PREFIX = "+"
+MAX_PREFIX_LENGTH = 5
+
+
+class PrefixResolver:
+    """Préfixes par serveur, gardés en mémoire (chargés une fois au démarrage).
+
+    S'utilise directement comme `command_prefix` : la résolution d'un message
+    coûte un seul accès au dictionnaire, sans lecture de fichier.
+    """
+
+    def __init__(self, default=DEFAULT_PREFIX, path=PREFIXES_FILE):
+        self.default = default
+        self.path = path
+        self.fileio = None
+        self._prefixes = {}  # guild_id (int) -> préfixe
+
+    def __call__(self, bot, message):
+        guild = message.guild
+        if guild is None:
+            return self.default
+        return self._prefixes.get(guild.id, self.default)
+
+    def get(self, guild_id):
+        return self._prefixes.get(int(guild_id), self.default)
+
+    async def load(self, fileio):
+        self.fileio = fileio
+        data = await fileio.read_json(self.path, {})
+        self._prefixes = {int(guild_id): prefix for guild_id, prefix in data.items() if prefix}
+        return len(self._prefixes)
+
+    async def set(self, guild_id, prefix):
+        """Change le préfixe d'un serveur (le préfixe par défaut supprime l'entrée)"""
+        if prefix == self.default:
+            self._prefixes.pop(int(guild_id), None)
+        else:
+            self._prefixes[int(guild_id)] = prefix
+        await self.fileio.write_json(
+            self.path,
+            {str(guild_id): prefix for guild_id, prefix in self._prefixes.items()}
+        )
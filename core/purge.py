@@ -0,0 +1,179 @@
+import asyncio
+import datetime
+import re
+
+import discord
+
+MAX_SCAN = 10000            # messages parcourus au maximum par commande
+BULK_SIZE = 100             # limite Discord d'une suppression groupée
+BULK_MAX_AGE = datetime.timedelta(days=14, minutes=-5)  # marge avant la limite des 14 jours
+PROGRESS_INTERVAL = 3.0     # secondes entre deux mises à jour du message de suivi
+
+
+def build_check(author=None, bots=False, embeds=False, pattern=None):
+    """Filtre combiné (tous les critères doivent correspondre) ; None sans critère"""
+    checks = []
+    if author is not None:
+        checks.append(lambda m: m.author.id == author.id)
+    if bots:
+        checks.append(lambda m: m.author.bot)
+    if embeds:
+        checks.append(lambda m: len(m.embeds) > 0)
+    if pattern is not None:
+        regex = re.compile(pattern, re.IGNORECASE)
+        checks.append(lambda m: regex.search(m.content or "") is not None)
+    if not checks:
+        return None
+    return lambda m: all(check(m) for check in checks)
+
+
+class PurgeJob:
+    """Suppression de messages en flux continu.
+
+    L'historique est lu page par page pendant que les suppressions
+    avancent : les messages de moins de 14 jours partent par lots de 100
+    (suppression groupée), les plus anciens un par un sur une file
+    séparée. Les limites de débit de chaque route sont gérées par
+    discord.py, les trois flux avancent donc chacun à leur vitesse maximale.
+    """
+
+    def __init__(self, channel, limit, check=None, before=None, after=None, reason=None):
+        self.channel = channel
+        self.limit = limit
+        self.check = check
+        self.before = before
+        self.after = after
+        self.reason = reason
+        self.scanned = 0
+        self.matched = 0
+        self.deleted = 0
+        self.failed = 0
+        self.finished = False
+
+    @property
+    def pending(self):
+        return self.matched - self.deleted - self.failed
+
+    async def run(self, progress=None):
+        """Exécute la purge ; `progress(job)` est appelé régulièrement pendant l'opération"""
+        bulk = asyncio.Queue(maxsize=4)   # lots de messages récents
+        single = asyncio.Queue()          # messages trop anciens pour la suppression groupée
+        tasks = [
+            asyncio.create_task(self._scan(bulk, single)),
+            asyncio.create_task(self._bulk_lane(bulk)),
+            asyncio.create_task(self._single_lane(single)),
+        ]
+        reporter = asyncio.create_task(self._progress_loop(progress)) if progress else None
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if reporter is not None:
+                reporter.cancel()
+            self.finished = True
+        return self
+
+    async def _scan(self, bulk, single):
+        cutoff = discord.utils.time_snowflake(discord.utils.utcnow() - BULK_MAX_AGE)
+        chunk = []
+        async for message in self.channel.history(limit=self.limit, before=self.before, after=self.after):
+            self.scanned += 1
+            if self.check is not None and not self.check(message):
+                continue
+            self.matched += 1
+            if message.id < cutoff:
+                await single.put(message)
+                continue
+            chunk.append(message)
+            if len(chunk) >= BULK_SIZE:
+                await bulk.put(chunk)
+                chunk = []
+        if chunk:
+            await bulk.put(chunk)
+        for queue in (bulk, single):
+            await queue.put(None)
+
+    async def _bulk_lane(self, queue):
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                return
+            if len(chunk) == 1:
+                await self._delete_one(chunk[0])
+                continue
+            try:
+                await self.channel.delete_messages(chunk, reason=self.reason)
+                self.deleted += len(chunk)
+            except discord.Forbidden:
+                raise
+            except discord.HTTPException:
+                # Lot refusé (message déjà disparu, trop ancien...) : le reste passe un par un
+                for message in chunk:
+                    await self._delete_one(message)
+
+    async def _single_lane(self, queue):
+        while True:
+            message = await queue.get()
+            if message is None:
+                return
+            await self._delete_one(message)
+
+    async def _delete_one(self, message):
+        try:
+            await message.delete()
+            self.deleted += 1
+        except discord.NotFound:
+            self.deleted += 1  # déjà supprimé
+        except discord.Forbidden:
+            raise
+        except discord.HTTPException:
+            self.failed += 1
+
+    async def _progress_loop(self, progress):
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            try:
+                await progress(self)
+            except discord.HTTPException:
+                pass
+
+
+async def run_with_status(ctx, job, label="message(s)"):
+    """Exécute une purge lancée par une commande, avec un message de suivi dans le salon"""
+    status = None
+
+    async def progress(job):
+        nonlocal status
+        text = f"⏳ Suppression en cours... `{job.deleted}` {label} supprimé(s) • `{job.scanned}` parcouru(s)"
+        if status is None:
+            status = await ctx.send(text)
+        else:
+            await status.edit(content=text)
+
+    # Le message de commande est supprimé à part, l'historique est lu à partir de lui
+    if job.before is None:
+        job.before = ctx.message
+    try:
+        await ctx.message.delete()
+    except discord.HTTPException:
+        pass
+
+    completed = False
+    try:
+        await job.run(progress)
+        completed = True
+    finally:
+        # Le message de suivi ne reste jamais bloqué sur "en cours", même si la purge échoue
+        text = f"✅ {job.deleted} {label} supprimé(s)." if completed else f"⚠️ Purge interrompue : {job.deleted} {label} supprimé(s)."
+        if job.failed:
+            text += f" ({job.failed} échec(s))"
+        try:
+            if status is None:
+                status = await ctx.send(text)
+            else:
+                await status.edit(content=text)
+            await status.delete(delay=5)
+        except discord.HTTPException:
+            pass
+    return job
@@ -0,0 +1,109 @@
+import heapq
+
+
+class StatsRegistry:
+    """Totaux globaux du bot (serveurs, membres, salons, commandes).
+
+    Tenus à jour par le cog StatsTracker à partir des événements ; les
+    plus gros serveurs sont suivis dans un tas dont les entrées périmées
+    sont ignorées à la lecture. Sans le cog, les totaux sont recalculés
+    à chaque appel.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.tracking = False
+        self.member_counts = {}  # guild_id -> membres
+        self.channel_counts = {}  # guild_id -> salons
+        self.members = 0
+        self.channels = 0
+        self._heap = []           # (-membres, guild_id), entrées périmées comprises
+        self._commands = None     # (clé, total) : recalculé après chargement / déchargement
+
+    # ==================== MISE À JOUR ====================
+
+    def rebuild(self):
+        self.member_counts = {guild.id: guild.member_count or 0 for guild in self.bot.guilds}
+        self.channel_counts = {guild.id: len(guild.channels) for guild in self.bot.guilds}
+        self.members = sum(self.member_counts.values())
+        self.channels = sum(self.channel_counts.values())
+        self._heap = [(-count, guild_id) for guild_id, count in self.member_counts.items()]
+        heapq.heapify(self._heap)
+
+    def update_guild(self, guild):
+        """Reprend les compteurs d'un serveur (arrivée, départ ou modification de membres / salons)"""
+        members = guild.member_count or 0
+        channels = len(guild.channels)
+        self.members += members - self.member_counts.get(guild.id, 0)
+        self.channels += channels - self.channel_counts.get(guild.id, 0)
+        if self.member_counts.get(guild.id) != members:
+            self.member_counts[guild.id] = members
+            heapq.heappush(self._heap, (-members, guild.id))
+        self.channel_counts[guild.id] = channels
+
+        # Le tas est reconstruit quand les entrées périmées dominent
+        if len(self._heap) > 2 * len(self.member_counts) + 64:
+            self._heap = [(-count, guild_id) for guild_id, count in self.member_counts.items()]
+            heapq.heapify(self._heap)
+
+    def remove_guild(self, guild_id):
+        self.members -= self.member_counts.pop(guild_id, 0)
+        self.channels -= self.channel_counts.pop(guild_id, 0)
+
+    def invalidate_commands(self):
+        self._commands = None
+
+    # ==================== LECTURE ====================
+
+    def _refresh(self):
+        if not self.tracking:
+            self.rebuild()
+
+    @property
+    def guilds(self):
+        return len(self.bot.guilds)
+
+    def totals(self):
+        self._refresh()
+        return {
+            "guilds": self.guilds,
+            "members": self.members,
+            "channels": self.channels,
+            "commands": self.commands,
+        }
+
+    @property
+    def commands(self):
+        # Les extensions chargées / déchargées changent cette clé même sans invalidation explicite
+        key = (len(self.bot.cogs), len(self.bot.all_commands))
+        if self._commands is None or self._commands[0] != key:
+            self._commands = (key, sum(1 for _ in self.bot.walk_commands()))
+        return self._commands[1]
+
+    def top_guilds(self, n=5):
+        """Les `n` serveurs les plus peuplés, du plus grand au plus petit"""
+        self._refresh()
+        found, kept = [], []
+        seen = set()
+        while self._heap and len(found) < n:
+            entry = heapq.heappop(self._heap)
+            members, guild_id = -entry[0], entry[1]
+            if guild_id in seen or self.member_counts.get(guild_id) != members:
+                continue  # entrée périmée : abandonnée
+            seen.add(guild_id)
+            kept.append(entry)
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None:
+                found.append(guild)
+        for entry in kept:
+            heapq.heappush(self._heap, entry)
+        return found
+
+
+def get_stats(bot):
+    """Retourne le registre de statistiques partagé du bot"""
+    stats = getattr(bot, "stats", None)
+    if stats is None:
+        stats = bot.stats = StatsRegistry(bot)
+        stats.rebuild()
+    return stats
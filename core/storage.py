@@ -0,0 +1,604 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.migrate import migrate_json_files
+
+DB_FILE = os.getenv("DATABASE_FILE", "kaizoku.db")
+
+# Listes de membres de PermissionsSystem (les rôles sont stockés avec le type "roles")
+PERMISSION_KINDS = ("owners", "admins", "gs_users", "moderators", "supports")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS economy_accounts (
+    user_id TEXT PRIMARY KEY,
+    xp INTEGER NOT NULL DEFAULT 0,
+    coins INTEGER NOT NULL DEFAULT 0,
+    last_daily TEXT
+);
+
+CREATE TABLE IF NOT EXISTS permission_grants (
+    guild_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target_id INTEGER NOT NULL,
+    level INTEGER,
+    PRIMARY KEY (guild_id, kind, target_id)
+);
+
+CREATE TABLE IF NOT EXISTS log_channels (
+    guild_id TEXT NOT NULL,
+    log_type TEXT NOT NULL,
+    channel_id INTEGER,
+    PRIMARY KEY (guild_id, log_type)
+);
+
+CREATE TABLE IF NOT EXISTS log_options (
+    guild_id TEXT NOT NULL,
+    option TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (guild_id, option)
+);
+
+CREATE TABLE IF NOT EXISTS giveaways (
+    message_id INTEGER PRIMARY KEY,
+    guild_id TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    host_id INTEGER NOT NULL,
+    prize TEXT NOT NULL,
+    winners INTEGER NOT NULL DEFAULT 1,
+    ends_at REAL NOT NULL,
+    ended INTEGER NOT NULL DEFAULT 0,
+    winner_ids TEXT,
+    mode TEXT NOT NULL DEFAULT 'reaction'
+);
+
+CREATE TABLE IF NOT EXISTS giveaway_entries (
+    message_id INTEGER NOT NULL REFERENCES giveaways (message_id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (message_id, user_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ticket_configs (
+    guild_id TEXT PRIMARY KEY,
+    category_id INTEGER,
+    panel_channel_id INTEGER,
+    panel_message_id INTEGER,
+    log_channel_id INTEGER,
+    support_role_id INTEGER,
+    ticket_count INTEGER NOT NULL DEFAULT 0,
+    types TEXT
+);
+
+CREATE TABLE IF NOT EXISTS open_tickets (
+    guild_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS warnings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    revoked_at REAL,
+    revoked_by INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS warnings_by_member ON warnings (guild_id, user_id, id);
+
+CREATE TABLE IF NOT EXISTS warning_counts (
+    guild_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    active INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS warning_thresholds (
+    guild_id TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    duration INTEGER,
+    PRIMARY KEY (guild_id, count)
+);
+"""
+
+GIVEAWAY_FIELDS = (
+    "message_id",
+    "guild_id",
+    "channel_id",
+    "host_id",
+    "prize",
+    "winners",
+    "ends_at",
+    "ended",
+    "winner_ids",
+    "mode",
+)
+
+# Colonnes ajoutées après la création des tables (bases existantes)
+ADDED_COLUMNS = (
+    ("giveaways", "mode", "TEXT NOT NULL DEFAULT 'reaction'"),
+)
+
+GIVEAWAY_RETENTION = 30 * 86400  # giveaways terminés gardés pour les relances
+
+WARNING_FIELDS = ("id", "user_id", "moderator_id", "reason", "created_at", "revoked_at", "revoked_by")
+
+TICKET_FIELDS = (
+    "category_id",
+    "panel_channel_id",
+    "panel_message_id",
+    "log_channel_id",
+    "support_role_id",
+    "ticket_count",
+)
+
+
+class Storage:
+    """Base SQLite (mode WAL) partagée par les cogs.
+
+    Toutes les requêtes passent par un thread dédié : la connexion n'est
+    jamais utilisée depuis la boucle d'événements.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage")
+        self._conn = None
+        self._open_lock = asyncio.Lock()
+
+    # ==================== CONNEXION ====================
+
+    async def run(self, func, *args):
+        """Exécute `func(conn, *args)` sur le thread de la base"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(self._conn, *args))
+
+    async def open(self):
+        async with self._open_lock:
+            if self._conn is not None:
+                return
+            loop = asyncio.get_running_loop()
+            self._conn = await loop.run_in_executor(self._executor, self._connect)
+            migrated = await self.run(migrate_json_files)
+            if migrated:
+                print(f"📦 Migration JSON → SQLite : {migrated}")
+            compacted = await self.run(_compact)
+            if compacted:
+                print(f"🧹 Compactage de la base : {compacted} entrée(s) obsolète(s) supprimée(s)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        for table, column, definition in ADDED_COLUMNS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        conn.commit()
+        return conn
+
+    async def close(self):
+        if self._conn is not None:
+            await self.run(lambda conn: conn.close())
+            self._conn = None
+        self._executor.shutdown(wait=True)
+
+    # ==================== ÉCONOMIE ====================
+
+    async def load_accounts(self):
+        def query(conn):
+            rows = conn.execute("SELECT user_id, xp, coins, last_daily FROM economy_accounts")
+            return {
+                user_id: {"xp": xp, "coins": coins, "last_daily": last_daily}
+                for user_id, xp, coins, last_daily in rows
+            }
+        return await self.run(query)
+
+    async def upsert_accounts(self, batch):
+        rows = [
+            (user_id, stats.get("xp", 0), stats.get("coins", 0), stats.get("last_daily"))
+            for user_id, stats in batch.items()
+        ]
+
+        def write(conn):
+            with conn:
+                conn.executemany(
+                    "INSERT INTO economy_accounts (user_id, xp, coins, last_daily) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET xp = excluded.xp, coins = excluded.coins, "
+                    "last_daily = excluded.last_daily",
+                    rows
+                )
+        await self.run(write)
+
+    # ==================== PERMISSIONS ====================
+
+    async def load_permissions(self):
+        def query(conn):
+            permissions = {}
+            for guild_id, kind, target_id, level in conn.execute(
+                "SELECT guild_id, kind, target_id, level FROM permission_grants ORDER BY rowid"
+            ):
+                guild_perms = permissions.setdefault(guild_id, new_guild_perms())
+                if kind == "roles":
+                    guild_perms["roles"][str(target_id)] = level
+                elif kind in PERMISSION_KINDS:
+                    guild_perms[kind].append(target_id)
+            return permissions
+        return await self.run(query)
+
+    async def add_grant(self, guild_id, kind, target_id, level=None):
+        def write(conn):
+            with conn:
+                conn.execute(
+                    "INSERT INTO permission_grants (guild_id, kind, target_id, level) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(guild_id, kind, target_id) DO UPDATE SET level = excluded.level",
+                    (str(guild_id), kind, int(target_id), level)
+                )
+        await self.run(write)
+
+    async def remove_grant(self, guild_id, kind, target_id):
+        def write(conn):
+            with conn:
+                conn.execute(
+                    "DELETE FROM permission_grants WHERE guild_id = ? AND kind = ? AND target_id = ?",
+                    (str(guild_id), kind, int(target_id))
+                )
+        await self.run(write)
+
+    # ==================== LOGS ====================
+
+    async def load_log_channels(self):
+        def query(conn):
+            config = {}
+            for guild_id, log_type, channel_id in conn.execute(
+                "SELECT guild_id, log_type, channel_id FROM log_channels"
+            ):
+                config.setdefault(guild_id, {})[log_type] = channel_id
+            return config
+        return await self.run(query)
+
+    async def set_log_channels(self, guild_id, channels):
+        """Enregistre uniquement les types passés dans `channels` ({type: salon}).
+
+        Un salon à None supprime la ligne : seuls les types configurés sont stockés.
+        """
+        guild_id = str(guild_id)
+        rows = [(guild_id, log_type, channel_id) for log_type, channel_id in channels.items() if channel_id]
+        removed = [(guild_id, log_type) for log_type, channel_id in channels.items() if not channel_id]
+
+        def write(conn):
+            with conn:
+                conn.executemany(
+                    "INSERT INTO log_channels (guild_id, log_type, channel_id) VALUES (?, ?, ?) "
+                    "ON CONFLICT(guild_id, log_type) DO UPDATE SET channel_id = excluded.channel_id",
+                    rows
+                )
+                conn.executemany(
+                    "DELETE FROM log_channels WHERE guild_id = ? AND log_type = ?",
+                    removed
+                )
+        await self.run(write)
+
+    async def load_log_options(self):
+        def query(conn):
+            options = {}
+            for guild_id, option, value in conn.execute(
+                "SELECT guild_id, option, value FROM log_options"
+            ):
+                options.setdefault(guild_id, {})[option] = value
+            return options
+        return await self.run(query)
+
+    async def set_log_option(self, guild_id, option, value):
+        """Enregistre une option de logs (None revient à la valeur par défaut)"""
+        def write(conn):
+            with conn:
+                if value is None:
+                    conn.execute(
+                        "DELETE FROM log_options WHERE guild_id = ? AND option = ?",
+                        (str(guild_id), option)
+                    )
+                else:
+                    conn.execute(
+                        "INSERT INTO log_options (guild_id, option, value) VALUES (?, ?, ?) "
+                        "ON CONFLICT(guild_id, option) DO UPDATE SET value = excluded.value",
+                        (str(guild_id), option, value)
+                    )
+        await self.run(write)
+
+    # ==================== GIVEAWAYS ====================
+
+    async def load_giveaways(self):
+        """Giveaways en cours et terminés (gardés pour les relances)"""
+        def query(conn):
+            giveaways = {}
+            for row in conn.execute(
+                "SELECT message_id, guild_id, channel_id, host_id, prize, winners, ends_at, ended, winner_ids, "
+                "mode FROM giveaways"
+            ):
+                giveaway = dict(zip(GIVEAWAY_FIELDS, row))
+                giveaway["ended"] = bool(giveaway["ended"])
+                giveaway["winner_ids"] = json.loads(giveaway["winner_ids"]) if giveaway["winner_ids"] else []
+                giveaways[giveaway["message_id"]] = giveaway
+            return giveaways
+        return await self.run(query)
+
+    async def save_giveaway(self, giveaway):
+        values = [giveaway[field] for field in GIVEAWAY_FIELDS]
+        values[7] = int(values[7])
+        values[8] = json.dumps(values[8])
+
+        def write(conn):
+            with conn:
+                # Pas de REPLACE : il supprimerait les participants (ON DELETE CASCADE)
+                conn.execute(
+                    "INSERT INTO giveaways (message_id, guild_id, channel_id, host_id, prize, winners, "
+                    "ends_at, ended, winner_ids, mode) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(message_id) DO UPDATE SET winners = excluded.winners, "
+                    "ends_at = excluded.ends_at, ended = excluded.ended, winner_ids = excluded.winner_ids",
+                    values
+                )
+        await self.run(write)
+
+    async def load_giveaway_entries(self, message_ids):
+        """Participants (mode bouton) des giveaways demandés : {message_id: {user_id}}"""
+        message_ids = list(message_ids)
+
+        def query(conn):
+            entries = {message_id: set() for message_id in message_ids}
+            for start in range(0, len(message_ids), 500):
+                chunk = message_ids[start:start + 500]
+                for message_id, user_id in conn.execute(
+                    f"SELECT message_id, user_id FROM giveaway_entries "
+                    f"WHERE message_id IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                ):
+                    entries[message_id].add(user_id)
+            return entries
+        return await self.run(query)
+
+    async def set_giveaway_entry(self, message_id, user_id, entered):
+        def write(conn):
+            with conn:
+                if entered:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO giveaway_entries (message_id, user_id) VALUES (?, ?)",
+                        (message_id, user_id)
+                    )
+                else:
+                    conn.execute(
+                        "DELETE FROM giveaway_entries WHERE message_id = ? AND user_id = ?",
+                        (message_id, user_id)
+                    )
+        await self.run(write)
+
+    async def delete_giveaway(self, message_id):
+        def write(conn):
+            with conn:
+                conn.execute("DELETE FROM giveaways WHERE message_id = ?", (message_id,))
+        await self.run(write)
+
+    # ==================== AVERTISSEMENTS ====================
+
+    async def add_warning(self, guild_id, user_id, moderator_id, reason):
+        """Enregistre un avertissement ; retourne (id, nombre d'avertissements actifs du membre)"""
+        def write(conn):
+            with conn:
+                warn_id = conn.execute(
+                    "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (str(guild_id), user_id, moderator_id, reason, time.time())
+                ).lastrowid
+                return warn_id, _bump_warning_count(conn, str(guild_id), user_id, 1)
+        return await self.run(write)
+
+    async def revoke_warning(self, guild_id, warn_id, moderator_id):
+        """Révoque un avertissement actif ; retourne l'ID du membre (None si introuvable ou déjà révoqué)"""
+        def write(conn):
+            with conn:
+                row = conn.execute(
+                    "SELECT user_id FROM warnings WHERE id = ? AND guild_id = ? AND revoked_at IS NULL",
+                    (warn_id, str(guild_id))
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE warnings SET revoked_at = ?, revoked_by = ? WHERE id = ?",
+                    (time.time(), moderator_id, warn_id)
+                )
+                _bump_warning_count(conn, str(guild_id), row[0], -1)
+                return row[0]
+        return await self.run(write)
+
+    async def clear_warnings(self, guild_id, user_id, moderator_id):
+        """Révoque tous les avertissements actifs d'un membre ; retourne leur nombre"""
+        def write(conn):
+            with conn:
+                revoked = conn.execute(
+                    "UPDATE warnings SET revoked_at = ?, revoked_by = ? "
+                    "WHERE guild_id = ? AND user_id = ? AND revoked_at IS NULL",
+                    (time.time(), moderator_id, str(guild_id), user_id)
+                ).rowcount
+                conn.execute(
+                    "DELETE FROM warning_counts WHERE guild_id = ? AND user_id = ?",
+                    (str(guild_id), user_id)
+                )
+                return revoked
+        return await self.run(write)
+
+    async def load_warnings(self, guild_id, user_id, before_id=None, limit=10):
+        """Avertissements actifs d'un membre, du plus récent au plus ancien (pagination par `before_id`)"""
+        def query(conn):
+            rows = conn.execute(
+                "SELECT id, user_id, moderator_id, reason, created_at, revoked_at, revoked_by FROM warnings "
+                "WHERE guild_id = ? AND user_id = ? AND id < ? AND revoked_at IS NULL "
+                "ORDER BY id DESC LIMIT ?",
+                (str(guild_id), user_id, before_id or 2 ** 63 - 1, limit)
+            )
+            return [dict(zip(WARNING_FIELDS, row)) for row in rows]
+        return await self.run(query)
+
+    async def warning_count(self, guild_id, user_id):
+        def query(conn):
+            row = conn.execute(
+                "SELECT active FROM warning_counts WHERE guild_id = ? AND user_id = ?",
+                (str(guild_id), user_id)
+            ).fetchone()
+            return row[0] if row else 0
+        return await self.run(query)
+
+    async def load_warning_thresholds(self):
+        """Paliers de sanction : {guild_id: {nombre d'avertissements: (action, durée)}}"""
+        def query(conn):
+            thresholds = {}
+            for guild_id, count, action, duration in conn.execute(
+                "SELECT guild_id, count, action, duration FROM warning_thresholds"
+            ):
+                thresholds.setdefault(guild_id, {})[count] = (action, duration)
+            return thresholds
+        return await self.run(query)
+
+    async def set_warning_threshold(self, guild_id, count, action, duration=None):
+        """Définit le palier `count` (action None = suppression)"""
+        def write(conn):
+            with conn:
+                if action is None:
+                    conn.execute(
+                        "DELETE FROM warning_thresholds WHERE guild_id = ? AND count = ?",
+                        (str(guild_id), count)
+                    )
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO warning_thresholds (guild_id, count, action, duration) "
+                        "VALUES (?, ?, ?, ?)",
+                        (str(guild_id), count, action, duration)
+                    )
+        await self.run(write)
+
+    # ==================== TICKETS ====================
+
+    async def load_tickets(self):
+        def query(conn):
+            tickets = {}
+            for row in conn.execute(
+                "SELECT guild_id, category_id, panel_channel_id, panel_message_id, log_channel_id, "
+                "support_role_id, ticket_count, types FROM ticket_configs"
+            ):
+                guild_id, values, types = row[0], row[1:7], row[7]
+                config = dict(zip(TICKET_FIELDS, values))
+                config["open_tickets"] = {}
+                config["types"] = json.loads(types) if types else {}
+                tickets[guild_id] = config
+
+            for guild_id, user_id, channel_id in conn.execute(
+                "SELECT guild_id, user_id, channel_id FROM open_tickets"
+            ):
+                if guild_id in tickets:
+                    tickets[guild_id]["open_tickets"][user_id] = channel_id
+            return tickets
+        return await self.run(query)
+
+    async def save_ticket_config(self, guild_id, config):
+        """Enregistre les paramètres d'un serveur (sans les tickets ouverts)"""
+        def write(conn):
+            with conn:
+                _upsert_ticket_config(conn, str(guild_id), config)
+        await self.run(write)
+
+    async def open_ticket(self, guild_id, user_id, channel_id, config):
+        def write(conn):
+            with conn:
+                _upsert_ticket_config(conn, str(guild_id), config)
+                conn.execute(
+                    "INSERT OR REPLACE INTO open_tickets (guild_id, user_id, channel_id) VALUES (?, ?, ?)",
+                    (str(guild_id), str(user_id), channel_id)
+                )
+        await self.run(write)
+
+    async def close_ticket(self, guild_id, user_id):
+        def write(conn):
+            with conn:
+                conn.execute(
+                    "DELETE FROM open_tickets WHERE guild_id = ? AND user_id = ?",
+                    (str(guild_id), str(user_id))
+                )
+        await self.run(write)
+
+
+def _compact(conn):
+    """Supprime les entrées qui ne contiennent que des valeurs par défaut et les vieux giveaways terminés"""
+    with conn:
+        removed = conn.execute("DELETE FROM log_channels WHERE channel_id IS NULL").rowcount
+        removed += conn.execute(
+            "DELETE FROM ticket_configs WHERE category_id IS NULL AND panel_channel_id IS NULL "
+            "AND panel_message_id IS NULL AND log_channel_id IS NULL AND support_role_id IS NULL "
+            "AND ticket_count = 0 "
+            "AND guild_id NOT IN (SELECT guild_id FROM open_tickets)"
+        ).rowcount
+        removed += conn.execute(
+            "DELETE FROM giveaways WHERE ended = 1 AND ends_at < ?",
+            (time.time() - GIVEAWAY_RETENTION,)
+        ).rowcount
+    return removed
+
+
+def _bump_warning_count(conn, guild_id, user_id, delta):
+    """Met à jour le compteur d'avertissements actifs d'un membre et retourne sa nouvelle valeur"""
+    conn.execute(
+        "INSERT INTO warning_counts (guild_id, user_id, active) VALUES (?, ?, MAX(?, 0)) "
+        "ON CONFLICT(guild_id, user_id) DO UPDATE SET active = MAX(active + ?, 0)",
+        (guild_id, user_id, delta, delta)
+    )
+    return conn.execute(
+        "SELECT active FROM warning_counts WHERE guild_id = ? AND user_id = ?",
+        (guild_id, user_id)
+    ).fetchone()[0]
+
+
+def new_guild_perms():
+    perms = {kind: [] for kind in PERMISSION_KINDS}
+    perms["roles"] = {}
+    return perms
+
+
+def _upsert_ticket_config(conn, guild_id, config):
+    values = [config.get(field) for field in TICKET_FIELDS]
+    values[-1] = values[-1] or 0
+    conn.execute(
+        "INSERT INTO ticket_configs (guild_id, category_id, panel_channel_id, panel_message_id, "
+        "log_channel_id, support_role_id, ticket_count, types) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(guild_id) DO UPDATE SET category_id = excluded.category_id, "
+        "panel_channel_id = excluded.panel_channel_id, panel_message_id = excluded.panel_message_id, "
+        "log_channel_id = excluded.log_channel_id, support_role_id = excluded.support_role_id, "
+        "ticket_count = excluded.ticket_count, types = excluded.types",
+        (guild_id, *values, json.dumps(config.get("types", {}), ensure_ascii=False))
+    )
+
+
+async def get_storage(bot):
+    """Retourne la base partagée du bot (ouverte et migrée au premier appel)"""
+    storage = getattr(bot, "storage", None)
+    if storage is None:
+        storage = bot.storage = Storage()
+    await storage.open()
+    return storage
+
+
+async def close_storage(bot):
+    storage = getattr(bot, "storage", None)
+    if storage is not None:
+        await storage.close()
+        bot.storage = None